@@ -0,0 +1,311 @@
+import asyncio
+import base64
+import hashlib
+import importlib
+import logging
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from pymongo.errors import PyMongoError
+
+from media import media_store
+
+logger = logging.getLogger(__name__)
+
+EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
+AI_PROVIDER = os.environ.get('AI_PROVIDER', 'emergent')  # emergent, fake
+AI_TEXT_MODEL = os.environ.get('AI_TEXT_MODEL', 'gpt-5.1')
+AI_IMAGE_MODEL = os.environ.get('AI_IMAGE_MODEL', 'gpt-image-1')
+
+AI_MAX_CONCURRENCY = int(os.environ.get('AI_MAX_CONCURRENCY', '4'))
+AI_MAX_CONCURRENCY_PER_ADMIN = int(os.environ.get('AI_MAX_CONCURRENCY_PER_ADMIN', '2'))
+AI_QUEUE_TIMEOUT = float(os.environ.get('AI_QUEUE_TIMEOUT_SECONDS', '30'))
+AI_TEXT_TIMEOUT = float(os.environ.get('AI_TEXT_TIMEOUT_SECONDS', '60'))
+AI_IMAGE_TIMEOUT = float(os.environ.get('AI_IMAGE_TIMEOUT_SECONDS', '180'))
+# Cancel the provider call once every request waiting on it has disconnected
+AI_CANCEL_ON_DISCONNECT = os.environ.get('AI_CANCEL_ON_DISCONNECT', 'true').lower() == 'true'
+AI_RESULT_CACHE_HOURS = float(os.environ.get('AI_RESULT_CACHE_HOURS', '168'))
+AI_FAKE_LATENCY = int(os.environ.get('AI_FAKE_LATENCY_MS', '200')) / 1000
+
+RESULTS_COLLECTION = "ai_results"
+
+# 1x1 transparent PNG returned by the fake provider
+FAKE_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+
+def copywriter_prompt(content_type: str) -> str:
+    return f"You are a professional cosmetic product copywriter. Generate {content_type} content that is elegant, premium, and compelling."
+
+
+class AIError(Exception):
+    """Generation failed at the provider"""
+
+
+class AIBusyError(AIError):
+    """No generation slot freed up within AI_QUEUE_TIMEOUT_SECONDS"""
+
+
+class AITimeoutError(AIError):
+    """The provider did not answer within the configured timeout"""
+
+
+# ============= PROVIDER REGISTRY =============
+# Provider classes by AI_PROVIDER name. Providers import their SDKs on first
+# use, so workers that never generate anything never load them.
+PROVIDERS: Dict[str, Callable[[], Any]] = {}
+
+
+def register_provider(name: str):
+    def decorator(factory):
+        PROVIDERS[name] = factory
+        return factory
+    return decorator
+
+
+async def import_lazily(module: str):
+    """Import in a worker thread: first imports of large SDKs would otherwise stall the event loop"""
+    return await asyncio.to_thread(importlib.import_module, module)
+
+
+@register_provider("emergent")
+class EmergentProvider:
+    name = "emergent"
+
+    def __init__(self, api_key: Optional[str] = EMERGENT_LLM_KEY):
+        self.api_key = api_key
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    async def stream_text(self, system_message: str, prompt: str) -> AsyncIterator[str]:
+        chat_sdk = await import_lazily("emergentintegrations.llm.chat")
+        # LlmChat only returns whole replies, so this "stream" is a single chunk
+        chat = chat_sdk.LlmChat(
+            api_key=self.api_key,
+            session_id=str(uuid.uuid4()),
+            system_message=system_message
+        ).with_model("openai", AI_TEXT_MODEL)
+        yield await chat.send_message(chat_sdk.UserMessage(text=prompt))
+
+    async def generate_image(self, prompt: str) -> bytes:
+        image_sdk = await import_lazily("emergentintegrations.llm.openai.image_generation")
+        image_gen = image_sdk.OpenAIImageGeneration(api_key=self.api_key)
+        images = await image_gen.generate_images(prompt=prompt, model=AI_IMAGE_MODEL, number_of_images=1)
+        if not images:
+            raise AIError("No image was generated")
+        return images[0]
+
+
+@register_provider("fake")
+class FakeProvider:
+    """Deterministic local provider for development and load tests"""
+    name = "fake"
+    configured = True
+
+    def __init__(self, latency: float = AI_FAKE_LATENCY):
+        self.latency = latency
+        self.calls = 0
+
+    async def stream_text(self, system_message: str, prompt: str) -> AsyncIterator[str]:
+        self.calls += 1
+        words = f"[fake] {prompt}".split(" ")
+        for i, word in enumerate(words):
+            await asyncio.sleep(self.latency / len(words))
+            yield word if i == 0 else " " + word
+
+    async def generate_image(self, prompt: str) -> bytes:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return FAKE_PNG
+
+
+def result_key(kind: str, model: str, *parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in (kind, model) + parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def text_key(content_type: str, prompt: str) -> str:
+    return result_key("text", AI_TEXT_MODEL, content_type, prompt)
+
+
+def image_key(prompt: str) -> str:
+    return result_key("media", AI_IMAGE_MODEL, prompt)
+
+
+class AIExecutor:
+    """Bounded runner for AI generations.
+
+    Identical requests in flight share one provider call, finished results
+    are kept in Mongo keyed by a hash of the prompt, and provider calls are
+    capped globally and per admin.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.db = None
+        self._global = asyncio.Semaphore(AI_MAX_CONCURRENCY)
+        self._per_admin: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(AI_MAX_CONCURRENCY_PER_ADMIN))
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = defaultdict(int)
+
+    def set_owner_limit(self, owner: str, limit: int) -> None:
+        """Give a non-admin owner, such as a batch, its own slot count instead of the per-admin cap"""
+        self._per_admin[owner] = asyncio.Semaphore(limit)
+
+    def clear_owner_limit(self, owner: str) -> None:
+        self._per_admin.pop(owner, None)
+
+    async def start(self, db) -> None:
+        self.db = db
+        try:
+            await db[RESULTS_COLLECTION].create_index("key", unique=True)
+        except PyMongoError as e:
+            logger.warning("Could not create AI result index: %s", e)
+
+    async def generate_text(
+        self,
+        admin_id: str,
+        content_type: str,
+        prompt: str,
+        regenerate: bool = False,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        queue_timeout: Optional[float] = AI_QUEUE_TIMEOUT
+    ) -> str:
+        """Generated text; on_chunk sees it as it streams in unless another request already started it"""
+        system_message = copywriter_prompt(content_type)
+        key = text_key(content_type, prompt)
+
+        async def generate():
+            chunks = []
+            async for chunk in self.provider.stream_text(system_message, prompt):
+                chunks.append(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+            return "".join(chunks)
+
+        return await self._run(key, "text", admin_id, regenerate, AI_TEXT_TIMEOUT, queue_timeout, generate)
+
+    async def generate_image(
+        self,
+        admin_id: str,
+        prompt: str,
+        regenerate: bool = False,
+        queue_timeout: Optional[float] = AI_QUEUE_TIMEOUT
+    ) -> dict:
+        """Generated image saved to the media store, as {media_id, url}"""
+        key = image_key(prompt)
+
+        async def generate():
+            image = await self.provider.generate_image(prompt)
+            media = await media_store.save(image, "image/png", source="ai")
+            return {"media_id": media["id"], "url": media["url"]}
+
+        return await self._run(key, "image", admin_id, regenerate, AI_IMAGE_TIMEOUT, queue_timeout, generate)
+
+    async def _run(
+        self,
+        key: str,
+        kind: str,
+        admin_id: str,
+        regenerate: bool,
+        timeout: float,
+        queue_timeout: Optional[float],
+        generate: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        if not regenerate:
+            cached = await self._cached_result(key)
+            if cached is not None:
+                return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate(key, kind, admin_id, timeout, queue_timeout, generate))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key) if self._inflight.get(key) is done else None)
+
+        self._waiters[key] += 1
+        try:
+            # Shielded so one caller going away does not fail the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if AI_CANCEL_ON_DISCONNECT and self._waiters[key] == 1:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                self._waiters.pop(key, None)
+
+    async def _generate(self, key: str, kind: str, admin_id: str, timeout: float, queue_timeout: Optional[float], generate) -> Any:
+        admin_slot = self._per_admin[admin_id]
+        try:
+            await asyncio.wait_for(admin_slot.acquire(), queue_timeout)
+        except asyncio.TimeoutError:
+            raise AIBusyError("Too many AI generations in progress for this account")
+        try:
+            try:
+                await asyncio.wait_for(self._global.acquire(), queue_timeout)
+            except asyncio.TimeoutError:
+                raise AIBusyError("AI service is busy, try again shortly")
+            try:
+                result = await asyncio.wait_for(generate(), timeout)
+            except asyncio.TimeoutError:
+                raise AITimeoutError(f"AI generation timed out after {timeout:.0f}s")
+            finally:
+                self._global.release()
+        finally:
+            admin_slot.release()
+
+        await self._store_result(key, kind, result)
+        return result
+
+    async def _cached_result(self, key: str) -> Optional[Any]:
+        if self.db is None:
+            return None
+        try:
+            doc = await self.db[RESULTS_COLLECTION].find_one({"key": key}, {"_id": 0})
+        except PyMongoError as e:
+            logger.warning("AI result cache read failed: %s", e)
+            return None
+        if not doc:
+            return None
+        if datetime.fromisoformat(doc['created_at']) < datetime.now(timezone.utc) - timedelta(hours=AI_RESULT_CACHE_HOURS):
+            return None
+        return doc['result']
+
+    async def _store_result(self, key: str, kind: str, result: Any) -> None:
+        if self.db is None:
+            return
+        try:
+            await self.db[RESULTS_COLLECTION].update_one(
+                {"key": key},
+                {"$set": {
+                    "key": key,
+                    "kind": kind,
+                    "provider": self.provider.name,
+                    "result": result,
+                    "created_at": datetime.now(timezone.utc).isoformat()
+                }},
+                upsert=True
+            )
+        except PyMongoError as e:
+            logger.warning("AI result cache write failed: %s", e)
+
+
+def create_provider(name: str = AI_PROVIDER):
+    factory = PROVIDERS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown AI_PROVIDER {name!r}, expected one of {', '.join(sorted(PROVIDERS))}")
+    return factory()
+
+
+ai_executor = AIExecutor(create_provider())
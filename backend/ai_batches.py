@@ -0,0 +1,463 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import PyMongoError
+
+from ai import AI_MAX_CONCURRENCY, AIExecutor, ai_executor
+from cache import invalidation_bus
+from ids import from_document, id_filter, ids_filter
+
+logger = logging.getLogger(__name__)
+
+BATCHES_COLLECTION = "ai_batches"
+ITEMS_COLLECTION = "ai_batch_items"
+
+# One global slot is always left for interactive generations
+AI_BATCH_CONCURRENCY = int(os.environ.get('AI_BATCH_CONCURRENCY', str(max(1, AI_MAX_CONCURRENCY - 1))))
+AI_BATCH_MAX_ATTEMPTS = int(os.environ.get('AI_BATCH_MAX_ATTEMPTS', '4'))
+AI_BATCH_RETRY_BASE = float(os.environ.get('AI_BATCH_RETRY_BASE_SECONDS', '2'))
+AI_BATCH_RETRY_MAX = float(os.environ.get('AI_BATCH_RETRY_MAX_SECONDS', '60'))
+AI_BATCH_FLUSH_SIZE = int(os.environ.get('AI_BATCH_FLUSH_SIZE', '50'))
+AI_BATCH_FLUSH_SECONDS = float(os.environ.get('AI_BATCH_FLUSH_SECONDS', '5'))
+AI_BATCH_LEASE_SECONDS = float(os.environ.get('AI_BATCH_LEASE_SECONDS', '60'))
+AI_BATCH_RESUME_INTERVAL = float(os.environ.get('AI_BATCH_RESUME_INTERVAL_SECONDS', '30'))
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _excerpt(text: Optional[str], length: int = 600) -> str:
+    return (text or "")[:length]
+
+
+# Generated fields per target: content_type sent to the model and prompt builder
+BATCH_FIELDS = {
+    "products": {
+        "description": ("product_description", lambda d: (
+            f'Write a premium, elegant product description for a cosmetic product named "{d["name"]}". '
+            f'Make it compelling and professional.'
+        )),
+        "benefits": ("benefits", lambda d: (
+            f'List the key benefits of the cosmetic product "{d["name"]}" in a short paragraph. '
+            f'Product description: {_excerpt(d.get("description"))}'
+        )),
+        "meta_description": ("meta_description", lambda d: (
+            f'Write an SEO meta description of at most 155 characters for the cosmetic product "{d["name"]}". '
+            f'Product description: {_excerpt(d.get("description"))}'
+        )),
+    },
+    "articles": {
+        "excerpt": ("excerpt", lambda d: (
+            f'Write a two sentence excerpt for the article "{d["title"]}". Article: {_excerpt(d.get("content"), 2000)}'
+        )),
+        "meta_description": ("meta_description", lambda d: (
+            f'Write an SEO meta description of at most 155 characters for the article "{d["title"]}". '
+            f'Article: {_excerpt(d.get("content"), 2000)}'
+        )),
+    },
+}
+
+# Source fields the prompts read, and the field a category selector matches
+SOURCE_FIELDS = {"products": ["name", "description"], "articles": ["title", "content"]}
+CATEGORY_FIELDS = {"products": "category_id", "articles": "category"}
+
+
+# Fields filled in automatically until someone writes them, and the flag that says so
+GENERATED_FLAGS = {"excerpt": "excerpt_generated"}
+
+
+def _missing(field: str) -> List[dict]:
+    clauses = [{field: {"$exists": False}}, {field: None}, {field: ""}]
+    if field in GENERATED_FLAGS:
+        clauses.append({GENERATED_FLAGS[field]: True})
+    return clauses
+
+
+def _projection(fields: List[str]) -> dict:
+    return {name: 1 for field in fields for name in (field, GENERATED_FLAGS.get(field)) if name}
+
+
+def _filled(doc: dict, field: str) -> bool:
+    return bool(doc.get(field)) and not doc.get(GENERATED_FLAGS.get(field, ""), False)
+
+
+class BatchCancelled(Exception):
+    """The batch was cancelled, possibly from another worker"""
+
+
+class AdaptiveLimit:
+    """Additive-increase, multiplicative-decrease cap on concurrent generations.
+
+    Every failed attempt halves the cap, a run of successes as long as the
+    cap raises it by one, so a backfill settles just under the rate the
+    provider accepts.
+    """
+
+    def __init__(self, maximum: int):
+        self.maximum = max(1, maximum)
+        self.limit = max(1, self.maximum // 2)
+        self.active = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self, success: bool) -> None:
+        async with self._condition:
+            self.active -= 1
+            if success:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self.limit = min(self.maximum, self.limit + 1)
+                    self._successes = 0
+            else:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+            self._condition.notify_all()
+
+
+class AIBatchRunner:
+    """Backfills AI-written copy across products or articles.
+
+    A batch snapshots its work into ai_batch_items when created. Workers
+    claim running batches through a lease, generate with bounded, adaptive
+    parallelism and retries, and write results back with bulk_write. A batch
+    whose worker died is picked up again once its lease lapses.
+    """
+
+    def __init__(self, executor: AIExecutor):
+        self.executor = executor
+        self.db = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._resume_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def start(self, db) -> None:
+        self.db = db
+        try:
+            await db[BATCHES_COLLECTION].create_index("id", unique=True)
+            await db[ITEMS_COLLECTION].create_index([("batch_id", 1), ("status", 1), ("seq", 1)])
+        except PyMongoError as e:
+            logger.warning("Could not create AI batch indexes: %s", e)
+        self._resume_task = asyncio.create_task(self._resume_loop())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        tasks = list(self._tasks.values())
+        if self._resume_task:
+            tasks.append(self._resume_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def create(self, admin_id: str, target: str, fields: List[str], category: Optional[str] = None, only_missing: bool = True) -> dict:
+        query = {}
+        if category:
+            query[CATEGORY_FIELDS[target]] = category
+        if only_missing:
+            query["$or"] = [clause for field in fields for clause in _missing(field)]
+
+        documents = [from_document(doc) for doc in await self.db[target].find(query, _projection(fields)).to_list(None)]
+
+        batch_id = str(uuid.uuid4())
+        items = []
+        for doc in documents:
+            for field in fields:
+                if only_missing and _filled(doc, field):
+                    continue
+                items.append({"batch_id": batch_id, "seq": len(items), "doc_id": doc["id"], "field": field,
+                              "status": "pending", "attempts": 0, "error": None})
+
+        now = datetime.now(timezone.utc)
+        batch = {
+            "id": batch_id,
+            "target": target,
+            "fields": fields,
+            "category": category,
+            "only_missing": only_missing,
+            "admin_id": admin_id,
+            "status": "running" if items else "completed",
+            "total": len(items),
+            "succeeded": 0,
+            "failed": 0,
+            "skipped": 0,
+            "error": None,
+            "created_at": now.isoformat(),
+            "updated_at": now.isoformat(),
+            "finished_at": None if items else now.isoformat(),
+            "lease_until": None,
+            "owner": None
+        }
+        for start in range(0, len(items), 1000):
+            await self.db[ITEMS_COLLECTION].insert_many(items[start:start + 1000])
+        await self.db[BATCHES_COLLECTION].insert_one(dict(batch))
+
+        if items:
+            claimed = await self._claim({"id": batch_id})
+            if claimed:
+                self._launch(claimed)
+        return self._public(batch)
+
+    async def get(self, batch_id: str) -> Optional[dict]:
+        batch = await self.db[BATCHES_COLLECTION].find_one({"id": batch_id}, {"_id": 0})
+        return self._public(batch) if batch else None
+
+    async def list(self, limit: int = 50) -> List[dict]:
+        batches = await self.db[BATCHES_COLLECTION].find({}, {"_id": 0}).sort("created_at", -1).to_list(limit)
+        return [self._public(batch) for batch in batches]
+
+    async def cancel(self, batch_id: str) -> Optional[dict]:
+        # The owning worker sees the status on its next flush and stops
+        await self.db[BATCHES_COLLECTION].update_one(
+            {"id": batch_id, "status": "running"},
+            {"$set": {"status": "cancelled", "finished_at": datetime.now(timezone.utc).isoformat(), "lease_until": None}}
+        )
+        task = self._tasks.get(batch_id)
+        if task:
+            task.cancel()
+        return await self.get(batch_id)
+
+    async def resume(self, batch_id: str) -> Optional[dict]:
+        """Requeue failed items and run the batch again"""
+        batch = await self.db[BATCHES_COLLECTION].find_one({"id": batch_id}, {"_id": 0})
+        if not batch:
+            return None
+        result = await self.db[ITEMS_COLLECTION].update_many(
+            {"batch_id": batch_id, "status": {"$in": ["failed", "pending"]}},
+            {"$set": {"status": "pending", "attempts": 0, "error": None}}
+        )
+        if result.modified_count or batch["status"] != "completed":
+            failed = await self.db[ITEMS_COLLECTION].count_documents({"batch_id": batch_id, "status": "failed"})
+            await self.db[BATCHES_COLLECTION].update_one(
+                {"id": batch_id},
+                {"$set": {"status": "running", "failed": failed, "finished_at": None, "error": None}}
+            )
+            if batch_id not in self._tasks:
+                claimed = await self._claim({"id": batch_id})
+                if claimed:
+                    self._launch(claimed)
+        return await self.get(batch_id)
+
+    def _public(self, batch: dict) -> dict:
+        return {k: v for k, v in batch.items() if k not in ("_id", "lease_until")}
+
+    async def _claim(self, query: dict) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        return await self.db[BATCHES_COLLECTION].find_one_and_update(
+            {**query, "status": "running", "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}]},
+            {"$set": {"lease_until": now + timedelta(seconds=AI_BATCH_LEASE_SECONDS), "owner": WORKER_ID}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _launch(self, batch: dict) -> None:
+        task = asyncio.create_task(self._run(batch))
+        self._tasks[batch["id"]] = task
+        task.add_done_callback(lambda _: self._tasks.pop(batch["id"], None))
+
+    async def _resume_loop(self) -> None:
+        while True:
+            try:
+                while True:
+                    batch = await self._claim({"id": {"$nin": list(self._tasks)}})
+                    if not batch:
+                        break
+                    logger.info("Resuming AI batch %s", batch["id"])
+                    self._launch(batch)
+            except PyMongoError as e:
+                logger.warning("Could not claim AI batches: %s", e)
+            await asyncio.sleep(AI_BATCH_RESUME_INTERVAL)
+
+    async def _heartbeat(self, batch_id: str) -> None:
+        while True:
+            await asyncio.sleep(AI_BATCH_LEASE_SECONDS / 3)
+            try:
+                await self.db[BATCHES_COLLECTION].update_one(
+                    {"id": batch_id, "owner": WORKER_ID},
+                    {"$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=AI_BATCH_LEASE_SECONDS)}}
+                )
+            except PyMongoError as e:
+                logger.warning("Could not renew lease on AI batch %s: %s", batch_id, e)
+
+    async def _run(self, batch: dict) -> None:
+        owner = f"batch:{batch['id']}"
+        self.executor.set_owner_limit(owner, AI_BATCH_CONCURRENCY)
+        heartbeat = asyncio.create_task(self._heartbeat(batch["id"]))
+        try:
+            await self._process(batch, owner)
+            await self.db[BATCHES_COLLECTION].update_one(
+                {"id": batch["id"], "status": "running"},
+                {"$set": {"status": "completed", "finished_at": datetime.now(timezone.utc).isoformat(), "lease_until": None}}
+            )
+        except BatchCancelled:
+            pass
+        except asyncio.CancelledError:
+            if self._stopping:
+                # Let another worker pick the batch up straight away
+                await self._release(batch["id"])
+        except Exception as e:
+            logger.exception("AI batch %s failed", batch["id"])
+            await self._release(batch["id"], error=str(e))
+        finally:
+            heartbeat.cancel()
+            self.executor.clear_owner_limit(owner)
+
+    async def _release(self, batch_id: str, error: Optional[str] = None) -> None:
+        try:
+            await self.db[BATCHES_COLLECTION].update_one(
+                {"id": batch_id, "owner": WORKER_ID},
+                {"$set": {"lease_until": None, "error": error}}
+            )
+        except PyMongoError as e:
+            logger.warning("Could not release AI batch %s: %s", batch_id, e)
+
+    async def _process(self, batch: dict, owner: str) -> None:
+        target = batch["target"]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=AI_BATCH_CONCURRENCY * 4)
+        limiter = AdaptiveLimit(AI_BATCH_CONCURRENCY)
+        results: List[dict] = []
+        flush_lock = asyncio.Lock()
+        last_flush = [time.monotonic()]
+
+        async def produce():
+            last_seq = -1
+            while True:
+                items = await self.db[ITEMS_COLLECTION].find(
+                    {"batch_id": batch["id"], "status": "pending", "seq": {"$gt": last_seq}}, {"_id": 0}
+                ).sort("seq", 1).to_list(200)
+                if not items:
+                    break
+                ids = list({item["doc_id"] for item in items})
+                found = await self.db[target].find(ids_filter(ids), _projection(SOURCE_FIELDS[target] + batch["fields"])).to_list(len(ids))
+                docs = {doc["id"]: doc for doc in map(from_document, found)}
+                for item in items:
+                    await queue.put((item, docs.get(item["doc_id"])))
+                last_seq = items[-1]["seq"]
+            for _ in range(AI_BATCH_CONCURRENCY):
+                await queue.put(None)
+
+        async def flush(force: bool = False):
+            async with flush_lock:
+                if not results or (not force and len(results) < AI_BATCH_FLUSH_SIZE
+                                   and time.monotonic() - last_flush[0] < AI_BATCH_FLUSH_SECONDS):
+                    return
+                pending = results[:]
+                results.clear()
+                last_flush[0] = time.monotonic()
+                await self._flush(batch, pending)
+
+        async def work():
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    return
+                item, doc = entry
+                results.append(await self._generate_item(batch, owner, limiter, item, doc))
+                await flush()
+
+        tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work()) for _ in range(AI_BATCH_CONCURRENCY)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Keep whatever finished, even when stopping early
+            await asyncio.shield(flush(force=True))
+
+    async def _generate_item(self, batch: dict, owner: str, limiter: AdaptiveLimit, item: dict, doc: Optional[dict]) -> dict:
+        if doc is None:
+            return {**item, "status": "skipped", "error": "Document no longer exists"}
+        if batch["only_missing"] and _filled(doc, item["field"]):
+            return {**item, "status": "skipped", "error": "Field was filled in meanwhile"}
+
+        content_type, prompt = BATCH_FIELDS[batch["target"]][item["field"]]
+        attempts = item["attempts"]
+        while True:
+            attempts += 1
+            await limiter.acquire()
+            try:
+                text = await self.executor.generate_text(owner, content_type, prompt(doc), queue_timeout=None)
+            except asyncio.CancelledError:
+                await limiter.release(success=True)
+                raise
+            except Exception as e:
+                await limiter.release(success=False)
+                if attempts >= AI_BATCH_MAX_ATTEMPTS:
+                    return {**item, "status": "failed", "attempts": attempts, "error": str(e)}
+                delay = min(AI_BATCH_RETRY_MAX, AI_BATCH_RETRY_BASE * 2 ** (attempts - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+                continue
+            await limiter.release(success=True)
+            return {**item, "status": "done", "attempts": attempts, "error": None, "text": text.strip()}
+
+    async def _flush(self, batch: dict, results: List[dict]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        target_ops = []
+        for result in results:
+            if result["status"] != "done":
+                continue
+            query = id_filter(result["doc_id"])
+            if batch["only_missing"]:
+                # Never overwrite copy an admin wrote while the batch ran
+                query["$or"] = _missing(result["field"])
+            update = {result["field"]: result["text"], "updated_at": now}
+            if result["field"] in GENERATED_FLAGS:
+                update[GENERATED_FLAGS[result["field"]]] = False
+            target_ops.append(UpdateOne(query, {"$set": update}))
+        if target_ops:
+            await self.db[batch["target"]].bulk_write(target_ops, ordered=False)
+            await invalidation_bus.publish(batch["target"])
+            if batch["only_missing"]:
+                results = await self._overtaken(batch, results)
+
+        item_ops = [
+            UpdateOne(
+                {"batch_id": batch["id"], "seq": result["seq"]},
+                {"$set": {"status": result["status"], "attempts": result.get("attempts", 0), "error": result["error"]}}
+            )
+            for result in results
+        ]
+
+        await self.db[ITEMS_COLLECTION].bulk_write(item_ops, ordered=False)
+
+        counts = {"succeeded": 0, "failed": 0, "skipped": 0}
+        for result in results:
+            counts[{"done": "succeeded", "failed": "failed", "skipped": "skipped"}[result["status"]]] += 1
+        state = await self.db[BATCHES_COLLECTION].find_one_and_update(
+            {"id": batch["id"]},
+            {"$inc": counts, "$set": {"updated_at": now}},
+            projection={"_id": 0, "status": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if not state or state["status"] != "running":
+            raise BatchCancelled()
+
+    async def _overtaken(self, batch: dict, results: List[dict]) -> List[dict]:
+        """Marks as skipped the done results whose guarded write matched nothing, because the field was filled meanwhile"""
+        done = [result for result in results if result["status"] == "done"]
+        found = await self.db[batch["target"]].find(
+            ids_filter([result["doc_id"] for result in done]), _projection(list({result["field"] for result in done}))
+        ).to_list(None)
+        docs = {doc["id"]: doc for doc in map(from_document, found)}
+        checked = []
+        for result in results:
+            doc = docs.get(result["doc_id"])
+            if result["status"] == "done" and doc is None:
+                result = {**result, "status": "skipped", "error": "Document no longer exists"}
+            elif result["status"] == "done" and doc.get(result["field"]) != result["text"]:
+                result = {**result, "status": "skipped", "error": "Field was filled in meanwhile"}
+            checked.append(result)
+        return checked
+
+
+ai_batch_runner = AIBatchRunner(ai_executor)
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import AsyncIterator, Dict, Optional
+
+from pymongo.errors import PyMongoError
+
+from ai import AIExecutor, ai_executor, image_key, text_key
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = "ai_jobs"
+# How often running jobs save partial text and look for cancellation from other workers
+AI_JOB_SYNC_INTERVAL = float(os.environ.get('AI_JOB_SYNC_INTERVAL_SECONDS', '1'))
+AI_JOB_RETENTION_HOURS = float(os.environ.get('AI_JOB_RETENTION_HOURS', '24'))
+SSE_KEEPALIVE_SECONDS = 15
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def public_job(job: dict) -> dict:
+    return {k: v for k, v in job.items() if k not in ("_id", "expire_at", "cancel_requested")}
+
+
+class LocalJob:
+    """A job running on this worker; event streams wait on it directly"""
+
+    def __init__(self, job: dict, key: str):
+        self.job = job
+        self.key = key
+        self.text = ""
+        self.task: Optional[asyncio.Task] = None
+        self.cancel_reason = "Cancelled"
+        self._changed = asyncio.Event()
+
+    def changed(self) -> asyncio.Event:
+        return self._changed
+
+    def notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class AIJobRunner:
+    """Runs AI generations in the background and tracks them in ai_jobs.
+
+    Jobs run on the worker that accepted them. Other workers answer polls
+    and event streams from the job document, which running jobs keep in
+    sync every AI_JOB_SYNC_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, executor: AIExecutor):
+        self.executor = executor
+        self.db = None
+        self._local: Dict[str, LocalJob] = {}
+        self._by_key: Dict[str, str] = {}
+
+    async def start(self, db) -> None:
+        self.db = db
+        try:
+            await db[JOBS_COLLECTION].create_index("id", unique=True)
+            # expire_at is a real date so the TTL monitor can drop old jobs
+            await db[JOBS_COLLECTION].create_index("expire_at", expireAfterSeconds=0)
+        except PyMongoError as e:
+            logger.warning("Could not create AI job indexes: %s", e)
+
+    async def stop(self) -> None:
+        local_jobs = list(self._local.values())
+        for local in local_jobs:
+            local.cancel_reason = "Server shut down before the job finished"
+            local.task.cancel()
+        await asyncio.gather(*(local.task for local in local_jobs), return_exceptions=True)
+
+    async def submit(self, admin_id: str, kind: str, prompt: str, content_type: Optional[str] = None, regenerate: bool = False) -> dict:
+        key = text_key(content_type, prompt) if kind == "content" else image_key(prompt)
+        # A double-click gets the job already running for the same prompt
+        existing = self._local.get(self._by_key.get(key)) if not regenerate else None
+        if existing is not None:
+            return await self.get(existing.job["id"])
+
+        now = datetime.now(timezone.utc)
+        job = {
+            "id": str(uuid.uuid4()),
+            "kind": kind,
+            "status": "queued",
+            "prompt": prompt,
+            "content_type": content_type,
+            "regenerate": regenerate,
+            "admin_id": admin_id,
+            "partial": "",
+            "result": None,
+            "error": None,
+            "created_at": now.isoformat(),
+            "updated_at": now.isoformat(),
+            "expire_at": now + timedelta(hours=AI_JOB_RETENTION_HOURS)
+        }
+        await self.db[JOBS_COLLECTION].insert_one(dict(job))
+
+        local = LocalJob(job, key)
+        self._local[job["id"]] = local
+        self._by_key[key] = job["id"]
+        local.task = asyncio.create_task(self._run(local))
+        return public_job(job)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        local = self._local.get(job_id)
+        if local is not None:
+            return public_job({**local.job, "partial": local.text})
+        job = await self.db[JOBS_COLLECTION].find_one({"id": job_id}, {"_id": 0})
+        return public_job(job) if job else None
+
+    async def cancel(self, job_id: str) -> Optional[dict]:
+        local = self._local.get(job_id)
+        if local is not None:
+            local.task.cancel()
+            await asyncio.gather(local.task, return_exceptions=True)
+        else:
+            # Running elsewhere: its worker notices the flag on its next sync
+            await self.db[JOBS_COLLECTION].update_one(
+                {"id": job_id, "status": {"$nin": list(TERMINAL_STATUSES)}},
+                {"$set": {"cancel_requested": True}}
+            )
+        return await self.get(job_id)
+
+    async def events(self, job_id: str) -> AsyncIterator[str]:
+        """Server-sent events: status changes, text deltas and a final done event"""
+        sent = 0
+        status = None
+        idle = 0.0
+        while True:
+            local = self._local.get(job_id)
+            changed = local.changed() if local is not None else None
+            job = await self.get(job_id)
+            if job is None:
+                yield sse_event("error", {"detail": "Job not found"})
+                return
+            if job["status"] != status:
+                status = job["status"]
+                yield sse_event("status", {"status": status})
+            text = job.get("partial") or ""
+            if len(text) > sent:
+                yield sse_event("delta", {"text": text[sent:]})
+                sent = len(text)
+            if status in TERMINAL_STATUSES:
+                yield sse_event("done", job)
+                return
+
+            if changed is not None:
+                try:
+                    await asyncio.wait_for(changed.wait(), SSE_KEEPALIVE_SECONDS)
+                    continue
+                except asyncio.TimeoutError:
+                    idle = SSE_KEEPALIVE_SECONDS
+            else:
+                await asyncio.sleep(AI_JOB_SYNC_INTERVAL)
+                idle += AI_JOB_SYNC_INTERVAL
+            if idle >= SSE_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keepalive\n\n"
+
+    async def _run(self, local: LocalJob) -> None:
+        job = local.job
+        sync = asyncio.create_task(self._sync(local))
+        try:
+            await self._update(local, status="running", started_at=datetime.now(timezone.utc).isoformat())
+            if job["kind"] == "content":
+                def on_chunk(chunk: str) -> None:
+                    local.text += chunk
+                    local.notify()
+
+                content = await self.executor.generate_text(
+                    job["admin_id"], job["content_type"], job["prompt"], job["regenerate"],
+                    on_chunk=on_chunk, queue_timeout=None
+                )
+                # Cached or coalesced results arrive whole
+                local.text = content
+                result = {"content": content}
+            else:
+                media = await self.executor.generate_image(job["admin_id"], job["prompt"], job["regenerate"], queue_timeout=None)
+                result = {"image_url": media["url"], "media_id": media["media_id"]}
+            await self._finish(local, status="succeeded", result=result)
+        except asyncio.CancelledError:
+            await self._finish(local, status="cancelled", error=local.cancel_reason)
+        except Exception as e:
+            logger.warning("AI job %s failed: %s", job["id"], e)
+            await self._finish(local, status="failed", error=str(e))
+        finally:
+            sync.cancel()
+            self._local.pop(job["id"], None)
+            if self._by_key.get(local.key) == job["id"]:
+                self._by_key.pop(local.key, None)
+            local.notify()
+
+    async def _finish(self, local: LocalJob, **fields) -> None:
+        await self._update(local, partial=local.text, finished_at=datetime.now(timezone.utc).isoformat(), **fields)
+
+    async def _update(self, local: LocalJob, **fields) -> None:
+        fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+        local.job.update(fields)
+        local.notify()
+        try:
+            await self.db[JOBS_COLLECTION].update_one({"id": local.job["id"]}, {"$set": fields})
+        except PyMongoError as e:
+            logger.warning("Could not update AI job %s: %s", local.job["id"], e)
+
+    async def _sync(self, local: LocalJob) -> None:
+        saved = ""
+        while True:
+            await asyncio.sleep(AI_JOB_SYNC_INTERVAL)
+            try:
+                if local.text != saved:
+                    saved = local.text
+                    await self.db[JOBS_COLLECTION].update_one({"id": local.job["id"]}, {"$set": {"partial": saved}})
+                job = await self.db[JOBS_COLLECTION].find_one({"id": local.job["id"]}, {"_id": 0, "cancel_requested": 1})
+            except PyMongoError as e:
+                logger.warning("Could not sync AI job %s: %s", local.job["id"], e)
+                continue
+            if job and job.get("cancel_requested"):
+                local.task.cancel()
+                return
+
+
+ai_job_runner = AIJobRunner(ai_executor)
@@ -0,0 +1,54 @@
+"""JWT tokens, password hashing and the current-user dependencies"""
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from passlib.context import CryptContext
+
+from models import User
+from repositories import UserRepository
+
+# JWT Configuration - Require JWT_SECRET in production, use secure default only for development
+JWT_SECRET = os.environ.get('JWT_SECRET')
+if not JWT_SECRET:
+    import secrets
+    JWT_SECRET = secrets.token_hex(32)  # Generate secure random secret if not set
+    logging.warning("JWT_SECRET not set in environment, using generated secret. Set JWT_SECRET in production!")
+JWT_ALGORITHM = os.environ.get('JWT_ALGORITHM', 'HS256')
+JWT_EXPIRATION = int(os.environ.get('JWT_EXPIRATION_HOURS', '24'))
+
+# Password hashing
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+security = HTTPBearer()
+
+def create_access_token(data: dict) -> str:
+    to_encode = data.copy()
+    expire = datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION)
+    to_encode.update({"exp": expire})
+    return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    try:
+        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        return payload
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token has expired")
+    except jwt.JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+async def get_current_user(
+    token_data: dict = Depends(verify_token),
+    users: UserRepository = Depends(UserRepository)
+) -> User:
+    user = await users.get(token_data.get("sub"))
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user
+
+async def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
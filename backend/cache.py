@@ -0,0 +1,345 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure, PyMongoError
+
+from ids import decode_id
+from metrics import cache_entries, cache_evictions, stale_responses
+from resilience import MongoUnavailable
+
+logger = logging.getLogger(__name__)
+
+# Collections whose writes invalidate a cache namespace
+COLLECTION_NAMESPACES = {
+    "site_settings": "settings",
+    "theme_settings": "theme",
+    "categories": "categories",
+    "page_sections": "pages",
+    "products": "products",
+    "articles": "articles",
+    "services": "services",
+    "gallery": "gallery",
+    "clients": "clients",
+    "reviews": "reviews",
+    "profiling_settings": "profiling",
+}
+
+VERSIONS_COLLECTION = "cache_versions"
+VERSIONS_DOC_ID = "cache_versions"
+
+STALE_WARNING = '110 - "Response is Stale"'
+REVALIDATION_FAILED_WARNING = '111 - "Revalidation Failed"'
+
+CACHE_TTL_SECONDS = float(os.environ.get('CACHE_TTL_SECONDS', '300'))
+# How long past its TTL, or after an invalidation, a response may still be served when Mongo is unavailable
+CACHE_STALE_SECONDS = float(os.environ.get('CACHE_STALE_SECONDS', '86400'))
+# Keys come from request paths and filters, so the number of entries is capped, least recently used out first
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', '5000'))
+# Entries past their fallback window are swept out as others are stored, at most this often
+CACHE_SWEEP_SECONDS = 60
+CACHE_INVALIDATION_MODE = os.environ.get('CACHE_INVALIDATION_MODE', 'auto')  # auto, change_stream, poll
+CACHE_POLL_INTERVAL = int(os.environ.get('CACHE_POLL_INTERVAL_MS', '250')) / 1000
+
+# Whether a loaded value is worth caching
+Keep = Callable[[Any], bool]
+
+
+class LocalCache:
+    """Per-worker cache of public read results, grouped by namespace.
+
+    Entries outlive their TTL by CACHE_STALE_SECONDS, and invalidated
+    entries are kept for as long, as the last good response to fall back on
+    when Mongo is unavailable. At most max_entries are held, evicting the
+    least recently used. Concurrent loads of one key share a single loader
+    call.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL_SECONDS, stale_ttl: float = CACHE_STALE_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        # (namespace, key) -> (fresh until, usable as a fallback until, generation, value), least recently used first
+        self._entries: OrderedDict[Tuple[str, str], Tuple[float, float, int, Any]] = OrderedDict()
+        self._next_sweep = time.monotonic() + CACHE_SWEEP_SECONDS
+        self._generations: Dict[str, int] = {}
+        self._pending: Dict[Tuple[str, str, int], asyncio.Future] = {}
+        self._refreshes: Set[asyncio.Task] = set()
+
+    def _entry(self, namespace: str, key: str) -> Optional[Tuple[float, float, int, Any]]:
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            self._drop(namespace, key, "expired")
+            return None
+        self._entries.move_to_end((namespace, key))
+        return entry
+
+    def _drop(self, namespace: str, key: str, reason: str) -> None:
+        if self._entries.pop((namespace, key), None) is not None:
+            cache_evictions.inc(namespace, reason)
+            cache_entries.set(value=len(self._entries))
+
+    def get(self, namespace: str, key: str = "") -> Optional[Any]:
+        entry = self._entry(namespace, key)
+        if entry is None or entry[0] < time.monotonic() or entry[2] != self.generation(namespace):
+            return None
+        return entry[3]
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self.sweep(now)
+        fresh_until = now + (self.ttl if ttl is None else ttl)
+        self._entries[(namespace, key)] = (fresh_until, fresh_until + self.stale_ttl, self.generation(namespace), value)
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self.max_entries:
+            (old_namespace, _), _ = self._entries.popitem(last=False)
+            cache_evictions.inc(old_namespace, "capacity")
+        cache_entries.set(value=len(self._entries))
+
+    def sweep(self, now: Optional[float] = None) -> None:
+        """Drops every entry past its fallback window"""
+        now = time.monotonic() if now is None else now
+        self._next_sweep = now + CACHE_SWEEP_SECONDS
+        for namespace, key in [k for k, entry in self._entries.items() if entry[1] < now]:
+            self._drop(namespace, key, "expired")
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def invalidate(self, namespace: str) -> None:
+        # Entries of older generations are no longer served, except as a fallback
+        self._generations[namespace] = self.generation(namespace) + 1
+
+    def clear(self) -> None:
+        for namespace in {k[0] for k in self._entries} | set(self._generations):
+            self.invalidate(namespace)
+
+    async def _load(self, namespace: str, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float], keep: Optional[Keep]) -> Any:
+        generation = self.generation(namespace)
+        value = await loader()
+        # Drop results loaded across an invalidation, they may predate the write
+        if value is None or self.generation(namespace) != generation:
+            return value
+        if keep is None or keep(value):
+            self.set(namespace, key, value, ttl)
+        else:
+            # Not worth a slot, and an older value would no longer be the last good one
+            self._drop(namespace, key, "not_kept")
+        return value
+
+    async def _load_once(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float],
+        keep: Optional[Keep] = None
+    ) -> Any:
+        # Keyed by generation: a request arriving after a write never joins a load that started before it
+        pending_key = (namespace, key, self.generation(namespace))
+        pending = self._pending.get(pending_key)
+        if pending is None:
+            pending = self._pending[pending_key] = asyncio.ensure_future(self._load(namespace, key, loader, ttl, keep))
+
+            def done(future: asyncio.Future) -> None:
+                self._pending.pop(pending_key, None)
+                if not future.cancelled():
+                    future.exception()  # retrieved here in case every waiter was cancelled
+
+            pending.add_done_callback(done)
+        return await asyncio.shield(pending)
+
+    async def get_or_load(self, namespace: str, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        value = self.get(namespace, key)
+        if value is not None:
+            return value
+        return await self._load_once(namespace, key, loader, ttl)
+
+    async def get_or_revalidate(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        keep: Optional[Keep] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """The cached value and, when it is served stale, the Warning header to send with it.
+
+        Past its TTL a value is returned at once and refreshed in the background.
+        After an invalidation it is reloaded first, and returned only when the
+        loader raises MongoUnavailable. Loaded values for which keep returns
+        False are served but not cached.
+        """
+        entry = self._entry(namespace, key)
+        now = time.monotonic()
+        if entry is not None and entry[2] == self.generation(namespace):
+            if entry[0] >= now:
+                return entry[3], None
+            self._refresh(namespace, key, loader, ttl, keep)
+            stale_responses.inc(namespace, "expired")
+            return entry[3], STALE_WARNING
+        try:
+            return await self._load_once(namespace, key, loader, ttl, keep), None
+        except MongoUnavailable:
+            if entry is None:
+                raise
+            stale_responses.inc(namespace, "unavailable")
+            return entry[3], REVALIDATION_FAILED_WARNING
+
+    def _refresh(self, namespace: str, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float], keep: Optional[Keep]) -> None:
+        if (namespace, key, self.generation(namespace)) in self._pending:
+            return
+
+        async def refresh():
+            try:
+                await self._load_once(namespace, key, loader, ttl, keep)
+            except MongoUnavailable as e:
+                logger.warning("Background refresh of %s/%s failed: %s", namespace, key, e)
+            except Exception:
+                logger.exception("Background refresh of %s/%s failed", namespace, key)
+
+        task = asyncio.create_task(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+
+class InvalidationBus:
+    """Evicts cache namespaces on every worker when their collections change.
+
+    Uses a MongoDB change stream when the deployment supports it (replica sets
+    and sharded clusters) and falls back to polling a version document on
+    standalone servers.
+
+    Listeners, such as the catalogue replica, are refreshed before the
+    namespace is evicted, with the changed document's id when it is known
+    (local writes and change streams) or None when the whole namespace may
+    have changed.
+    """
+
+    def __init__(self, cache: LocalCache):
+        self.cache = cache
+        self.db = None
+        self.mode: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._versions: Dict[str, int] = {}
+        self._listeners: List[Callable[[str, Optional[str]], Awaitable[None]]] = []
+
+    def add_listener(self, listener: Callable[[str, Optional[str]], Awaitable[None]]) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, Optional[str]], Awaitable[None]]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def start(self, db) -> None:
+        self.db = db
+        if CACHE_INVALIDATION_MODE in ("auto", "change_stream") and await self._change_streams_supported():
+            self.mode = "change_stream"
+            self._task = asyncio.create_task(self._watch_changes())
+        else:
+            self.mode = "poll"
+            self._versions = await self._read_versions()
+            self._task = asyncio.create_task(self._poll_versions())
+        logger.info("Cache invalidation bus started in %s mode", self.mode)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def publish(self, namespace: str, doc_id: Optional[str] = None) -> None:
+        """Invalidate locally and announce the change to the other workers"""
+        await self._apply(namespace, doc_id)
+        if self.db is None:
+            return
+        try:
+            result = await self.db[VERSIONS_COLLECTION].find_one_and_update(
+                {"_id": VERSIONS_DOC_ID},
+                {"$inc": {namespace: 1}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            # Our own bump does not need to evict again on the next poll, unless
+            # another worker bumped in between and we have not seen it yet
+            if result and result.get(namespace) == self._versions.get(namespace, 0) + 1:
+                self._versions[namespace] = result[namespace]
+        except PyMongoError as e:
+            logger.warning("Failed to publish cache invalidation for %s: %s", namespace, e)
+
+    async def _apply(self, namespace: str, doc_id: Optional[str] = None) -> None:
+        # Listeners first, so responses rebuilt after the eviction see their new data
+        for listener in self._listeners:
+            try:
+                await listener(namespace, doc_id)
+            except Exception:
+                logger.exception("Invalidation listener failed for %s", namespace)
+        self.cache.invalidate(namespace)
+
+    async def invalidate_all(self) -> None:
+        """Refresh listeners and evict every namespace, after writes that bypassed publish"""
+        for namespace in set(COLLECTION_NAMESPACES.values()):
+            await self._apply(namespace)
+        self.cache.clear()
+
+    async def _change_streams_supported(self) -> bool:
+        try:
+            async with self.db.watch():
+                return True
+        except OperationFailure:
+            return False
+        except PyMongoError as e:
+            logger.warning("Could not open change stream: %s", e)
+            return False
+
+    async def _watch_changes(self) -> None:
+        pipeline = [{"$match": {"ns.coll": {"$in": list(COLLECTION_NAMESPACES)}}}]
+        reconnecting = False
+        while True:
+            try:
+                async with self.db.watch(pipeline) as stream:
+                    if reconnecting:
+                        # Writes made while disconnected were missed, start clean
+                        await self.invalidate_all()
+                        reconnecting = False
+                    async for change in stream:
+                        namespace = COLLECTION_NAMESPACES.get(change["ns"]["coll"])
+                        if namespace:
+                            key = change.get("documentKey", {})
+                            await self._apply(namespace, decode_id(key["_id"]) if "_id" in key else None)
+            except PyMongoError as e:
+                logger.warning("Cache change stream interrupted: %s", e)
+                reconnecting = True
+                await asyncio.sleep(1)
+
+    async def _read_versions(self) -> Dict[str, int]:
+        doc = await self.db[VERSIONS_COLLECTION].find_one({"_id": VERSIONS_DOC_ID}) or {}
+        doc.pop("_id", None)
+        return doc
+
+    async def _poll_versions(self) -> None:
+        while True:
+            await asyncio.sleep(CACHE_POLL_INTERVAL)
+            try:
+                versions = await self._read_versions()
+            except PyMongoError as e:
+                logger.warning("Cache version poll failed: %s", e)
+                continue
+            for namespace, version in versions.items():
+                if self._versions.get(namespace) != version:
+                    await self._apply(namespace)
+            self._versions = versions
+
+
+cache = LocalCache()
+invalidation_bus = InvalidationBus(cache)
@@ -0,0 +1,300 @@
+"""In-memory replica of the public catalogue, an optional read model.
+
+With ``CATALOGUE_REPLICA=true`` each worker loads products, categories,
+services, gallery items, clients and reviews at startup and answers the
+public reads for them without a Mongo round trip. Documents are kept as
+tuples of their model's field values in numbered slots. A hash index maps
+ids (and slugs) to slots. Secondary indexes map a field value, such as a
+category or the featured flag, to its slots, kept in the collection's sort
+order so filtered lists need no sorting.
+
+The replica listens to the invalidation bus: a write to one document
+re-reads just that document, and a change of unknown extent reloads the
+collection. Every collection is also reloaded every
+CATALOGUE_RESYNC_SECONDS, to pick up writes made outside the app. Reads
+that the replica cannot answer, or that arrive before it has loaded, go to
+the repository instead. Routes choose this explicitly through ``catalogue``;
+admin read-modify-write paths keep reading Mongo.
+"""
+import asyncio
+import bisect
+import logging
+import os
+import sys
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+from pymongo.errors import PyMongoError
+
+from cache import invalidation_bus
+from metrics import catalogue_replica_bytes, catalogue_replica_documents
+from repositories import (
+    DEFAULT_LIMIT, CategoryRepository, ClientRepository, GalleryRepository, M, ProductRepository, Repository,
+    ReviewRepository, ServiceRepository
+)
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE_REPLICA = os.environ.get('CATALOGUE_REPLICA', 'false').lower() == 'true'
+CATALOGUE_RESYNC_SECONDS = float(os.environ.get('CATALOGUE_RESYNC_SECONDS', '300'))
+
+
+def deep_size(value: Any) -> int:
+    """Approximate bytes held by a value and everything it contains"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list, set)):
+        size += sum(deep_size(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(deep_size(key) + deep_size(item) for key, item in value.items())
+    elif isinstance(value, BaseModel):
+        size += deep_size(value.__dict__)
+    return size
+
+
+class CollectionReplica(Generic[M]):
+    """One collection held in memory, with its indexes"""
+
+    def __init__(self, repository: Type[Repository[M]], indexed: Sequence[str] = (), order_by: Optional[str] = None):
+        self.repository = repository
+        self.name = repository.name
+        self.model = repository.model
+        self.fields = tuple(self.model.model_fields)
+        self.indexed = tuple(indexed)
+        self.order_by = order_by
+        self.ready = False
+        self._lock = asyncio.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._slots: List[Optional[tuple]] = []
+        self._free: List[int] = []
+        self._ranks: List[tuple] = []
+        self._sizes: List[int] = []
+        self._seq = 0
+        self._by_id: Dict[str, int] = {}
+        self._by_slug: Dict[str, int] = {}
+        # field -> value -> slots in sort order
+        self._indexes: Dict[str, Dict[Any, List[int]]] = {field: {} for field in self.indexed}
+        self._ordered: List[int] = []
+        self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    # ----- reads -----
+    def _materialize(self, slot: int) -> M:
+        # Values were validated when loaded
+        return self.model.model_construct(**dict(zip(self.fields, self._slots[slot])))
+
+    def answers(self, query: dict, sort: Optional[List[Tuple[str, int]]] = None) -> bool:
+        """Whether find(query, sort) can be served from memory"""
+        if not self.ready:
+            return False
+        # Records are kept in this order: by order_by, otherwise as stored
+        if list(sort or []) != ([(self.order_by, 1)] if self.order_by else []):
+            return False
+        return all(field in self._indexes and not isinstance(value, dict) for field, value in query.items())
+
+    def get(self, item_id: str) -> Optional[M]:
+        slot = self._by_id.get(item_id)
+        return self._materialize(slot) if slot is not None else None
+
+    def get_by_id_or_slug(self, key: str) -> Optional[M]:
+        slot = self._by_id.get(key)
+        if slot is None:
+            slot = self._by_slug.get(key)
+        return self._materialize(slot) if slot is not None else None
+
+    def find(self, query: Optional[dict] = None, limit: Optional[int] = DEFAULT_LIMIT) -> List[M]:
+        """Documents matching equality filters on indexed fields, in sort order"""
+        query = query or {}
+        if query:
+            # Walk the smallest index bucket and check the other filters on the record
+            buckets = [self._indexes[field].get(value, []) for field, value in query.items()]
+            slots = min(buckets, key=len)
+            checks = [(self.fields.index(field), value) for field, value in query.items()]
+            slots = [slot for slot in slots if all(self._slots[slot][i] == value for i, value in checks)]
+        else:
+            slots = self._ordered
+        return [self._materialize(slot) for slot in slots[:limit]]
+
+    def distinct(self, field: str) -> List[Any]:
+        if field in self._indexes:
+            return [value for value, slots in self._indexes[field].items() if slots]
+        i = self.fields.index(field)
+        return list(dict.fromkeys(self._slots[slot][i] for slot in self._ordered))
+
+    # ----- writes -----
+    def _rank(self, record: tuple, seq: int) -> tuple:
+        if not self.order_by:
+            return (seq,)
+        # Mongo sorts missing and null values first
+        value = record[self.fields.index(self.order_by)]
+        return (value is not None, value if value is not None else 0, seq)
+
+    def _insert(self, item: M, seq: Optional[int] = None) -> None:
+        record = tuple(getattr(item, field) for field in self.fields)
+        if seq is None:
+            seq = self._seq
+            self._seq += 1
+        if self._free:
+            slot = self._free.pop()
+            self._slots[slot], self._ranks[slot], self._sizes[slot] = record, self._rank(record, seq), deep_size(record)
+        else:
+            slot = len(self._slots)
+            self._slots.append(record)
+            self._ranks.append(self._rank(record, seq))
+            self._sizes.append(deep_size(record))
+        self.bytes += self._sizes[slot]
+        self._by_id[item.id] = slot
+        if getattr(item, "slug", None):
+            # Like find_one, the first document with a slug wins
+            self._by_slug.setdefault(item.slug, slot)
+        rank = self._ranks.__getitem__
+        bisect.insort(self._ordered, slot, key=rank)
+        for field in self.indexed:
+            bisect.insort(self._indexes[field].setdefault(getattr(item, field), []), slot, key=rank)
+
+    def _remove(self, item_id: str) -> Optional[int]:
+        """Drops a document; returns its sequence number so an update keeps its place"""
+        slot = self._by_id.pop(item_id, None)
+        if slot is None:
+            return None
+        record = self._slots[slot]
+        slug = record[self.fields.index("slug")] if "slug" in self.fields else None
+        if slug and self._by_slug.get(slug) == slot:
+            del self._by_slug[slug]
+        self._ordered.remove(slot)
+        for field in self.indexed:
+            bucket = self._indexes[field][record[self.fields.index(field)]]
+            bucket.remove(slot)
+            if not bucket:
+                del self._indexes[field][record[self.fields.index(field)]]
+        self.bytes -= self._sizes[slot]
+        self._slots[slot] = None
+        self._free.append(slot)
+        return self._ranks[slot][-1]
+
+    async def reload(self, db) -> None:
+        """Loads the whole collection; the old contents serve reads until the new ones are complete"""
+        async with self._lock:
+            items = await self.repository(db).find(limit=None)
+            self._reset()
+            for item in items:
+                self._insert(item)
+            self.ready = True
+        self._report()
+
+    async def refresh(self, db, item_id: str) -> None:
+        """Re-reads one document after a write to it"""
+        async with self._lock:
+            item = await self.repository(db).get(item_id)
+            seq = self._remove(item_id)
+            if item is not None:
+                self._insert(item, seq)
+        self._report()
+
+    def _report(self) -> None:
+        catalogue_replica_documents.set(self.name, value=len(self))
+        catalogue_replica_bytes.set(self.name, value=self.bytes)
+
+
+class Catalogue:
+    """The replicated collections of one worker, and the reads routes make through them"""
+
+    def __init__(self):
+        self.db = None
+        self.enabled = False
+        self.replicas: Dict[str, CollectionReplica] = {
+            replica.name: replica for replica in (
+                CollectionReplica(ProductRepository, indexed=("category_id", "featured")),
+                CollectionReplica(CategoryRepository, indexed=("type",), order_by="order"),
+                CollectionReplica(ServiceRepository, indexed=("featured",), order_by="order"),
+                CollectionReplica(GalleryRepository, indexed=("category", "featured"), order_by="order"),
+                CollectionReplica(ClientRepository),
+                CollectionReplica(ReviewRepository),
+            )
+        }
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, db, enabled: bool = CATALOGUE_REPLICA) -> None:
+        self.db = db
+        self.enabled = enabled
+        if not enabled:
+            return
+        invalidation_bus.add_listener(self.on_change)
+        self._task = asyncio.create_task(self._resync())
+
+    async def stop(self) -> None:
+        invalidation_bus.remove_listener(self.on_change)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas.values():
+            replica.ready = False
+
+    async def on_change(self, namespace: str, doc_id: Optional[str]) -> None:
+        replica = self.replicas.get(namespace)
+        if replica is None or not self.enabled:
+            return
+        try:
+            if doc_id and replica.ready:
+                await replica.refresh(self.db, doc_id)
+            else:
+                await replica.reload(self.db)
+        except PyMongoError as e:
+            # Serve from Mongo until the next reload succeeds rather than serve a missed write
+            replica.ready = False
+            logger.warning("Catalogue replica of %s is stale: %s", namespace, e)
+
+    async def _resync(self) -> None:
+        while True:
+            for name, replica in self.replicas.items():
+                try:
+                    await replica.reload(self.db)
+                except PyMongoError as e:
+                    replica.ready = False
+                    logger.warning("Could not load the catalogue replica of %s: %s", name, e)
+            logger.info("Catalogue replica loaded: %s", {name: len(r) for name, r in self.replicas.items()})
+            await asyncio.sleep(CATALOGUE_RESYNC_SECONDS)
+
+    # ----- reads with a repository fallback -----
+    def _replica(self, repository: Repository[M]) -> Optional[CollectionReplica[M]]:
+        replica = self.replicas.get(repository.name)
+        return replica if replica is not None and replica.ready else None
+
+    async def get(self, repository: Repository[M], item_id: str) -> Optional[M]:
+        replica = self._replica(repository)
+        return replica.get(item_id) if replica else await repository.get(item_id)
+
+    async def get_many(self, repository: Repository[M], ids: List[str]) -> List[M]:
+        replica = self._replica(repository)
+        if replica:
+            return [item for item in map(replica.get, ids) if item is not None]
+        return await repository.get_many(ids)
+
+    async def get_by_id_or_slug(self, repository: Repository[M], key: str) -> Optional[M]:
+        replica = self._replica(repository)
+        return replica.get_by_id_or_slug(key) if replica else await repository.get_by_id_or_slug(key)
+
+    async def find(
+        self,
+        repository: Repository[M],
+        query: Optional[dict] = None,
+        sort: Optional[List[Tuple[str, int]]] = None
+    ) -> List[M]:
+        replica = self._replica(repository)
+        if replica and replica.answers(query or {}, sort):
+            return replica.find(query)
+        return await repository.find(query, sort=sort)
+
+    async def distinct(self, repository: Repository[M], field: str) -> List[Any]:
+        replica = self._replica(repository)
+        return replica.distinct(field) if replica else await repository.distinct(field)
+
+
+catalogue = Catalogue()
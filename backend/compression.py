@@ -0,0 +1,216 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+from cache import cache
+from resilience import mongo_breaker
+
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+# Bodies above this size are compressed on a worker thread instead of the event loop
+COMPRESSION_OFFLOAD_BYTES = int(os.environ.get('COMPRESSION_OFFLOAD_BYTES', '65536'))
+# Dynamic responses favour speed, cached entries are compressed once per change
+DYNAMIC_LEVELS = {"br": 4, "gzip": 6}
+CACHED_LEVELS = {"br": 9, "gzip": 9}
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml", "application/xml")
+
+
+def supported_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best encoding the client accepts, preferring Brotli over gzip"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in supported_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, levels: Dict[str, int] = DYNAMIC_LEVELS) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=levels["br"])
+    return gzip.compress(body, compresslevel=levels["gzip"], mtime=0)
+
+
+async def compress_async(body: bytes, encoding: str, levels: Dict[str, int] = DYNAMIC_LEVELS) -> bytes:
+    if len(body) >= COMPRESSION_OFFLOAD_BYTES:
+        return await asyncio.to_thread(compress, body, encoding, levels)
+    return compress(body, encoding, levels)
+
+
+class CachedResponse:
+    """Serialized JSON body with its ETag and compressed variants built on first use"""
+
+    def __init__(self, body: bytes, keep: bool = True):
+        self.body = body
+        # Whether the cache should hold on to this response
+        self.keep = keep
+        self.etag = 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self._variants: Dict[str, bytes] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def body_for(self, encoding: Optional[str]) -> bytes:
+        if encoding is None or len(self.body) < COMPRESSION_MIN_BYTES:
+            return self.body
+        if encoding in self._variants:
+            return self._variants[encoding]
+        # Concurrent misses share one compression instead of each doing it
+        pending = self._pending.get(encoding)
+        if pending is None:
+            pending = self._pending[encoding] = asyncio.ensure_future(compress_async(self.body, encoding, CACHED_LEVELS))
+        try:
+            variant = await asyncio.shield(pending)
+        finally:
+            if pending.done():
+                self._pending.pop(encoding, None)
+        self._variants[encoding] = variant
+        return variant
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def render_json(response_type: Any, value: Any) -> bytes:
+    """Validate and serialize like FastAPI does for a route with this response_model"""
+    if response_type is not None:
+        adapter = _adapter(response_type)
+        content = adapter.dump_python(adapter.validate_python(value), mode="json")
+    else:
+        content = jsonable_encoder(value)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+async def cached_json_response(
+    request: Request,
+    namespace: str,
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    response_type: Any = None,
+    cache_if: Optional[Callable[[Any], bool]] = None
+) -> Response:
+    """Serve a cached JSON body, answering 304s and reusing precompressed bytes.
+
+    Loads go through the Mongo circuit breaker; while Mongo is slow or down
+    the last good body is served with a Warning header. Results for which
+    cache_if returns False, such as empty lists for filters taken from the
+    request, are served without being cached.
+    """
+    async def build():
+        value = await mongo_breaker.call(loader)
+        return CachedResponse(render_json(response_type, value), cache_if is None or cache_if(value))
+
+    entry, warning = await cache.get_or_revalidate(namespace, key, build, keep=lambda response: response.keep)
+    headers = {"ETag": entry.etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if warning:
+        headers["Warning"] = warning
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and entry.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    body = await entry.body_for(encoding)
+    if body is not entry.body:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class CompressionMiddleware:
+    """Negotiated Brotli/gzip compression for complete, uncompressed responses.
+
+    Streaming responses and bodies that already carry a Content-Encoding (such
+    as cached_json_response variants) pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope.get("headers") or [])
+        encoding = negotiate_encoding(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or message["status"] < 200
+                    or message["status"] in (204, 304)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or start_message is None:
+                # Streaming body: send as is
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                passthrough = True
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            if len(body) >= self.minimum_size:
+                body = await compress_async(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            start_message = None
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,100 @@
+"""Write-time rendering of article content.
+
+Articles are written in Markdown; plain text renders as paragraphs. When an
+article is created or updated, ``article_content`` renders the body once
+and stores the result with it:
+
+- ``content_html``: the rendered body. Raw HTML in the source is escaped
+  and links with unsafe schemes (``javascript:`` and the like) are left
+  unlinked, so clients can insert it as is.
+- ``toc``: the level 2 and 3 headings, each with the id set on it.
+  Ids are prefixed with ``section-`` so they cannot collide with the
+  page's own, such as the ``root`` the app mounts on.
+- ``read_time``: minutes at ARTICLE_WORDS_PER_MINUTE.
+- ``excerpt``: the author's, or else the start of the first paragraph.
+
+Public reads serve these as stored, and article lists leave out the body
+and its rendering (see ``ArticleSummary``).
+"""
+import math
+import os
+import re
+from typing import List
+
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
+
+ARTICLE_WORDS_PER_MINUTE = int(os.environ.get('ARTICLE_WORDS_PER_MINUTE', '200'))
+EXCERPT_LENGTH = 200
+TOC_LEVELS = (2, 3)
+
+# The "default" preset has raw HTML off and validates link schemes
+markdown = MarkdownIt("default")
+
+WORD = re.compile(r"\w+")
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^\w]+", "-", text.lower()).strip("-") or "heading"
+
+
+def plain_text(inline: Token) -> str:
+    """The text of an inline token, without markup"""
+    parts = []
+    for child in inline.children or []:
+        if child.type in ("text", "code_inline"):
+            parts.append(child.content)
+        elif child.type in ("softbreak", "hardbreak"):
+            parts.append(" ")
+    return "".join(parts).strip()
+
+
+def truncate(text: str, length: int = EXCERPT_LENGTH) -> str:
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(" ", 1)[0].rstrip(",.;:") + "…"
+
+
+def render_article(content: str) -> dict:
+    """Rendered HTML, table of contents, reading time and excerpt of a Markdown body"""
+    tokens = markdown.parse(content)
+    toc: List[dict] = []
+    anchors = set()
+    words = 0
+    excerpt = ""
+    for opener, inline in zip(tokens, tokens[1:]):
+        if inline.type != "inline":
+            continue
+        text = plain_text(inline)
+        words += len(WORD.findall(text))
+        if opener.type == "heading_open":
+            anchor = base = f"section-{slugify(text)}"
+            suffix = 2
+            while anchor in anchors:
+                anchor, suffix = f"{base}-{suffix}", suffix + 1
+            anchors.add(anchor)
+            opener.attrSet("id", anchor)
+            level = int(opener.tag[1])
+            if level in TOC_LEVELS:
+                toc.append({"level": level, "text": text, "id": anchor})
+        elif opener.type == "paragraph_open" and not excerpt:
+            excerpt = truncate(text)
+    return {
+        "content_html": markdown.renderer.render(tokens, markdown.options, {}),
+        "toc": toc,
+        "read_time": max(1, math.ceil(words / ARTICLE_WORDS_PER_MINUTE)),
+        "excerpt": excerpt,
+    }
+
+
+def article_content(content: str, excerpt: str = "") -> dict:
+    """Stored fields for an article body and the excerpt its author gave, if any"""
+    rendered = render_article(content)
+    return {
+        "content": content,
+        "content_html": rendered["content_html"],
+        "toc": rendered["toc"],
+        "read_time": rendered["read_time"],
+        "excerpt": excerpt.strip() or rendered["excerpt"],
+        "excerpt_generated": not excerpt.strip(),
+    }
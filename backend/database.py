@@ -0,0 +1,146 @@
+"""MongoDB client setup shared by the app and the seed and migration scripts.
+
+The app opens its client in the lifespan handler, so every worker process
+gets its own pool; routes reach the database through ``get_db``. Pool
+size, timeouts, wire compression and read preference come from the
+environment. ``Warmup`` opens pool connections and primes caches after
+startup, and backs the readiness probe.
+"""
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Sequence
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from starlette.requests import Request
+
+load_dotenv(Path(__file__).parent / '.env')
+
+logger = logging.getLogger(__name__)
+
+MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+DB_NAME = os.environ.get('DB_NAME', 'ellavera_beauty')
+MONGO_APP_NAME = os.environ.get('MONGO_APP_NAME', 'ellavera-backend')
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '10'))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '300000'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '30000'))
+# How long a request waits for a free pooled connection before failing
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000'))
+# Comma separated, e.g. "zstd,zlib"; zstd and snappy need their Python packages
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS', '')
+MONGO_READ_PREFERENCE = os.environ.get('MONGO_READ_PREFERENCE', 'primary')
+# Connections opened during warm-up; defaults to the pool minimum
+MONGO_WARMUP_CONNECTIONS = int(os.environ.get('MONGO_WARMUP_CONNECTIONS', str(MONGO_MIN_POOL_SIZE)))
+READINESS_PING_TIMEOUT = float(os.environ.get('READINESS_PING_TIMEOUT_SECONDS', '1'))
+
+
+def client_options() -> dict:
+    options = {
+        "appname": MONGO_APP_NAME,
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS or None,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "readPreference": MONGO_READ_PREFERENCE,
+    }
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    return options
+
+
+def create_client(url: str = MONGO_URL, event_listeners: Sequence = ()):
+    """Motor client with the configured pool, or the in-memory store for memory:// URLs"""
+    if url.startswith('memory://'):
+        # In-process stand-in for benchmarks and local runs without MongoDB
+        from memory_db import MemoryClient
+        return MemoryClient()
+    return AsyncIOMotorClient(url, event_listeners=list(event_listeners), **client_options())
+
+
+def get_db(request: Request) -> AsyncIOMotorDatabase:
+    """Route dependency: the database of the app serving the request, opened in its lifespan"""
+    return request.app.state.db
+
+
+class Warmup:
+    """Startup warm-up: pre-open pool connections, then prime caches.
+
+    Runs in the background so the worker can answer liveness checks while it
+    warms; the readiness probe reports ready once every step has finished.
+    """
+
+    def __init__(self):
+        self.status = "pending"  # pending, warming, ready, failed
+        self.error: Optional[str] = None
+        self.steps: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, client, db, primers: Dict[str, Callable[[], Awaitable[None]]]) -> None:
+        self.steps = {}
+        self._task = asyncio.create_task(self._run(client, db, primers))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    async def _run(self, client, db, primers) -> None:
+        self.status = "warming"
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                await self._step("ping", client.admin.command("ping"))
+                # Concurrent commands force the driver to open that many connections
+                await self._step("connections", asyncio.gather(*(db.command("ping") for _ in range(MONGO_WARMUP_CONNECTIONS))))
+                break
+            except Exception as e:
+                attempt += 1
+                self.status = "failed"
+                self.error = str(e)
+                logger.error("Database warm-up failed (attempt %d): %s", attempt, e)
+                await asyncio.sleep(min(30, 2 ** attempt))
+        self.status = "warming"
+        self.error = None
+        results = await asyncio.gather(*(self._step(name, primer()) for name, primer in primers.items()), return_exceptions=True)
+        for name, result in zip(primers, results):
+            # A cold cache only costs the first request, so primers do not block readiness
+            if isinstance(result, Exception):
+                logger.warning("Cache warm-up step %s failed: %s", name, result)
+        self.status = "ready"
+        logger.info("Warm-up finished in %.0f ms", (time.perf_counter() - started) * 1000)
+
+    async def _step(self, name: str, awaitable) -> None:
+        started = time.perf_counter()
+        await awaitable
+        self.steps[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def check(self, db) -> dict:
+        """Readiness report; ready only when warm-up is done and Mongo answers a ping"""
+        report = {"status": self.status, "steps_ms": self.steps}
+        if self.error:
+            report["error"] = self.error
+        if not self.ready:
+            return report
+        try:
+            await asyncio.wait_for(db.command("ping"), READINESS_PING_TIMEOUT)
+        except Exception as e:
+            report["status"] = "unavailable"
+            report["error"] = f"Database ping failed: {e}"
+        return report
+
+
+warmup = Warmup()
@@ -0,0 +1,51 @@
+"""Production profile: several uvicorn workers under gunicorn.
+
+    gunicorn -c gunicorn.conf.py server:app
+
+Each worker is its own process with its own event loop, Mongo pool,
+in-process caches and background services. The app is not preloaded, so
+the Mongo client is created in each worker's lifespan after the fork and
+no pool is ever shared between processes. Pool settings apply per worker:
+a server can open up to WEB_CONCURRENCY x MONGO_MAX_POOL_SIZE connections,
+so size MONGO_MAX_POOL_SIZE against the cluster's connection limit.
+
+The public read API and the admin-only subsystems (AI jobs, backups,
+profiling) can run as separate deployments behind one proxy that sends
+/api/admin and /api/ai to the admin one:
+
+    # public API, one worker per core
+    APP_ROUTERS=public gunicorn -c gunicorn.conf.py server:app
+    # admin subsystems, a single worker
+    APP_ROUTERS=admin WEB_CONCURRENCY=1 gunicorn -c gunicorn.conf.py server:app
+
+Behind a proxy or ingress, FORWARDED_ALLOW_IPS is required: set it to the
+addresses the proxy connects from. Only those peers' X-Forwarded-For is
+trusted, and otherwise every visitor appears as the proxy and shares its
+rate limits, so the contact form limit throttles the whole site. The app
+logs an error when an untrusted peer sends X-Forwarded-For.
+
+With more than one worker, set RATE_LIMIT_BACKEND=mongo so limits are
+shared. Cache invalidations already reach every worker through Mongo, and
+/metrics reports per worker, so scrape each one or aggregate by instance.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', '8001')}")
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+# Clients must be created after the fork, in each worker's lifespan
+preload_app = False
+
+# Backups and lead exports stream for a while; AI work runs in background jobs
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+# Recycle workers now and then to bound memory growth; 0 disables
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+# Required behind a proxy, see above
+forwarded_allow_ips = os.environ.get('FORWARDED_ALLOW_IPS', '127.0.0.1')
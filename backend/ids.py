@@ -0,0 +1,62 @@
+"""Application ids stored as the Mongo ``_id``.
+
+Documents in ``KEYED_COLLECTIONS`` keep their uuid4 application id in
+``_id`` rather than in an ``id`` field next to an ObjectId, so each
+collection has a single unique key and id lookups use the primary index.
+The API still sees ``id``: ``to_document`` and ``from_document`` convert at
+the database boundary, and ``id_filter`` builds the matching query.
+
+``MONGO_ID_FORMAT=uuid`` stores ids as 16-byte BSON UUIDs instead of
+36-character strings. migrate_ids.py moves existing documents to the
+configured layout and must run before an app using it is deployed.
+"""
+import os
+import uuid
+from typing import Any, Iterable
+
+from bson.binary import Binary, UUID_SUBTYPE
+
+# "string" or "uuid"
+MONGO_ID_FORMAT = os.environ.get('MONGO_ID_FORMAT', 'string')
+
+KEYED_COLLECTIONS = (
+    "products", "articles", "gallery", "services", "categories", "page_sections",
+    "clients", "reviews", "contact_leads", "users",
+)
+
+
+def encode_id(item_id: str) -> Any:
+    if MONGO_ID_FORMAT == "uuid":
+        try:
+            return Binary.from_uuid(uuid.UUID(item_id))
+        except (TypeError, ValueError):
+            pass  # ids that are not UUIDs are kept as strings
+    return item_id
+
+
+def decode_id(value: Any) -> str:
+    if isinstance(value, Binary) and value.subtype == UUID_SUBTYPE:
+        return str(value.as_uuid())
+    # Clients configured with a uuidRepresentation decode to uuid.UUID
+    return str(value)
+
+
+def id_filter(item_id: str) -> dict:
+    return {"_id": encode_id(item_id)}
+
+
+def ids_filter(item_ids: Iterable[str]) -> dict:
+    return {"_id": {"$in": [encode_id(item_id) for item_id in item_ids]}}
+
+
+def to_document(doc: dict) -> dict:
+    """Copy of an API document for storage, with its id as the _id"""
+    stored = {key: value for key, value in doc.items() if key != "id"}
+    return {"_id": encode_id(doc["id"]), **stored}
+
+
+def from_document(doc: dict) -> dict:
+    """Turns a stored document back into its API form, in place"""
+    if "_id" in doc:
+        doc["id"] = decode_id(doc.pop("_id"))
+    return doc
@@ -0,0 +1,434 @@
+import asyncio
+import csv
+import fcntl
+import io
+import json
+import logging
+import os
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from ids import from_document, to_document
+from metrics import leads_buffered
+
+logger = logging.getLogger(__name__)
+
+LEADS_COLLECTION = "contact_leads"
+# Daily lead counts per dimension, maintained as leads are written
+ROLLUPS_COLLECTION = "lead_rollups"
+DEFAULT_SOURCE = "/contact"
+LEAD_WRITE_BEHIND = os.environ.get('LEAD_WRITE_BEHIND', 'true').lower() == 'true'
+LEAD_SPOOL_DIR = Path(os.environ.get('LEAD_SPOOL_DIR', Path(__file__).parent / 'spool'))
+# fsync every spool write; turning this off trades crash safety for latency
+LEAD_SPOOL_FSYNC = os.environ.get('LEAD_SPOOL_FSYNC', 'true').lower() == 'true'
+LEAD_BATCH_SIZE = int(os.environ.get('LEAD_BATCH_SIZE', '100'))
+LEAD_FLUSH_SECONDS = float(os.environ.get('LEAD_FLUSH_SECONDS', '1'))
+LEAD_MAX_BUFFER = int(os.environ.get('LEAD_MAX_BUFFER', '10000'))
+# Spool writes group every submission queued meanwhile, up to this many
+SPOOL_GROUP_SIZE = 500
+EXPORT_FIELDS = ("id", "created_at", "name", "email", "phone", "company", "source_page", "message")
+# Exported rows are sent in chunks of about this many bytes
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+class LeadBacklogFull(Exception):
+    """More than LEAD_MAX_BUFFER leads are waiting for Mongo"""
+
+
+def _open_segment():
+    path = LEAD_SPOOL_DIR / f"leads-{time.time_ns()}-{os.getpid()}.ndjson"
+    segment = open(path, "ab")
+    # Held until the segment is discarded so recovery on other workers skips it
+    fcntl.flock(segment, fcntl.LOCK_EX)
+    return segment
+
+
+def _append(segment, lines: List[bytes]) -> None:
+    segment.write(b"".join(lines))
+    segment.flush()
+    if LEAD_SPOOL_FSYNC:
+        os.fsync(segment.fileno())
+
+
+def _discard(segments: list) -> None:
+    for segment in segments:
+        os.unlink(segment.name)
+        segment.close()
+
+
+def _claim_orphans() -> Tuple[List[dict], list]:
+    """Leads from segments left behind by workers that exited before flushing"""
+    leads, segments = [], []
+    for path in sorted(LEAD_SPOOL_DIR.glob("leads-*.ndjson")):
+        segment = open(path, "rb+")
+        try:
+            fcntl.flock(segment, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            segment.close()
+            continue
+        for line in segment.read().splitlines():
+            try:
+                leads.append(json.loads(line))
+            except ValueError:
+                # Torn final line from a crash mid-write; it was never acknowledged
+                logger.warning("Skipping unreadable line in %s", path.name)
+        segments.append(segment)
+    return leads, segments
+
+
+async def insert_leads(db, leads: List[dict]) -> None:
+    """insert_many that tolerates leads already stored by an earlier replay, then updates the rollups"""
+    try:
+        await db[LEADS_COLLECTION].insert_many([to_document(lead) for lead in leads], ordered=False)
+    except BulkWriteError as e:
+        details = e.details or {}
+        if details.get("writeConcernErrors") or any(error.get("code") != 11000 for error in details.get("writeErrors", [])):
+            raise
+        duplicates = {error["index"] for error in details.get("writeErrors", [])}
+        leads = [lead for i, lead in enumerate(leads) if i not in duplicates]
+    if not leads:
+        return
+    try:
+        await update_rollups(db, leads)
+    except PyMongoError as e:
+        # The leads are stored; migrate_lead_rollups.py recounts if this drifts
+        logger.warning("Could not update lead rollups: %s", e)
+
+
+# ============= ROLLUPS =============
+def email_domain(email: str) -> str:
+    return email.rsplit("@", 1)[-1].strip().lower()
+
+
+def iso_week(day: date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def lead_day(lead: dict) -> date:
+    created_at = lead["created_at"]
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.astimezone(timezone.utc).date()
+
+
+def rollup_counts(leads) -> Counter:
+    """(dim, value, day) -> lead count; dim is total, domain or source"""
+    counts = Counter()
+    for lead in leads:
+        day = lead_day(lead)
+        counts[("total", "", day)] += 1
+        counts[("domain", email_domain(lead["email"]), day)] += 1
+        counts[("source", lead.get("source_page") or DEFAULT_SOURCE, day)] += 1
+    return counts
+
+
+def _rollup_update(dim: str, value: str, day: date, update: dict) -> UpdateOne:
+    return UpdateOne(
+        {"dim": dim, "day": day.isoformat(), "value": value},
+        {**update, "$setOnInsert": {"week": iso_week(day)}},
+        upsert=True
+    )
+
+
+async def update_rollups(db, leads: List[dict]) -> None:
+    counts = rollup_counts(leads)
+    await db[ROLLUPS_COLLECTION].bulk_write(
+        [_rollup_update(dim, value, day, {"$inc": {"count": n}}) for (dim, value, day), n in counts.items()],
+        ordered=False
+    )
+
+
+async def rebuild_rollups(db) -> int:
+    """Recount every rollup from the stored leads; returns the number of leads counted"""
+    counts = Counter()
+    total = 0
+    batch = []
+    async for lead in db[LEADS_COLLECTION].find({}, {"_id": 0, "email": 1, "created_at": 1, "source_page": 1}).batch_size(1000):
+        batch.append(lead)
+        if len(batch) >= 1000:
+            counts.update(rollup_counts(batch))
+            total += len(batch)
+            batch = []
+    counts.update(rollup_counts(batch))
+    total += len(batch)
+    if counts:
+        # $set rather than $inc, so workers rebuilding at the same time agree
+        await db[ROLLUPS_COLLECTION].bulk_write(
+            [_rollup_update(dim, value, day, {"$set": {"count": n}}) for (dim, value, day), n in counts.items()],
+            ordered=False
+        )
+    return total
+
+
+async def leads_since(db, start: date) -> int:
+    """Leads created on or after start, from the daily totals"""
+    rows = await db[ROLLUPS_COLLECTION].aggregate([
+        {"$match": {"dim": "total", "day": {"$gte": start.isoformat()}}},
+        {"$group": {"_id": None, "count": {"$sum": "$count"}}},
+    ]).to_list(None)
+    return rows[0]["count"] if rows else 0
+
+
+async def lead_stats(db, start: date, end: date, top: int = 10) -> dict:
+    """Lead counts between start and end inclusive, aggregated from the daily rollups"""
+    rollups = db[ROLLUPS_COLLECTION]
+    span = {"$gte": start.isoformat(), "$lte": end.isoformat()}
+
+    def totals(group_by: str):
+        return rollups.aggregate([
+            {"$match": {"dim": "total", "day": span}},
+            {"$group": {"_id": group_by, "count": {"$sum": "$count"}}},
+        ]).to_list(None)
+
+    def ranking(dim: str):
+        return rollups.aggregate([
+            {"$match": {"dim": dim, "day": span}},
+            {"$group": {"_id": "$value", "count": {"$sum": "$count"}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": top},
+        ]).to_list(None)
+
+    all_time = rollups.aggregate([
+        {"$match": {"dim": "total"}},
+        {"$group": {"_id": None, "count": {"$sum": "$count"}}},
+    ]).to_list(None)
+    by_day, by_week, by_domain, by_source, all_time = await asyncio.gather(
+        totals("$day"), totals("$week"), ranking("domain"), ranking("source"), all_time
+    )
+
+    # Dense series so charts get a point for every day and week in range
+    days = {row["_id"]: row["count"] for row in by_day}
+    weeks = {row["_id"]: row["count"] for row in by_week}
+    span_days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    week_keys = list(dict.fromkeys(iso_week(day) for day in span_days))
+    return {
+        "from": start,
+        "to": end,
+        "total": sum(days.values()),
+        "all_time": all_time[0]["count"] if all_time else 0,
+        "by_day": [{"key": day.isoformat(), "count": days.get(day.isoformat(), 0)} for day in span_days],
+        "by_week": [{"key": week, "count": weeks.get(week, 0)} for week in week_keys],
+        "by_domain": [{"key": row["_id"], "count": row["count"]} for row in by_domain],
+        "by_source": [{"key": row["_id"], "count": row["count"]} for row in by_source],
+    }
+
+
+# ============= EXPORT =============
+def created_between(start: Optional[date], end: Optional[date]) -> dict:
+    """created_at filter for whole UTC days; iso strings compare in date order"""
+    span = {}
+    if start:
+        span["$gte"] = start.isoformat()
+    if end:
+        span["$lt"] = (end + timedelta(days=1)).isoformat()
+    return {"created_at": span} if span else {}
+
+
+def _csv_cell(value) -> str:
+    value = "" if value is None else str(value)
+    # Keep spreadsheets from evaluating submitted text as formulas
+    return "'" + value if value[:1] in ("=", "+", "-", "@", "\t", "\r") else value
+
+
+async def export_leads(db, start: Optional[date], end: Optional[date], format: str) -> AsyncIterator[bytes]:
+    """Leads in created_at order as CSV or NDJSON, streamed from the cursor in chunks"""
+    cursor = db[LEADS_COLLECTION].find(
+        created_between(start, end), {field: 1 for field in EXPORT_FIELDS if field != "id"}
+    ).sort("created_at", 1).batch_size(1000)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if format == "csv":
+        writer.writerow(EXPORT_FIELDS)
+    async for lead in cursor:
+        from_document(lead)
+        if format == "csv":
+            writer.writerow([_csv_cell(lead.get(field)) for field in EXPORT_FIELDS])
+        else:
+            buffer.write(json.dumps({field: lead.get(field) for field in EXPORT_FIELDS}, default=str) + "\n")
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class LeadWriter:
+    """Write-behind ingestion for contact leads.
+
+    Submissions are appended to a local spool file and acknowledged once it
+    is synced to disk, then inserted into Mongo in batches when
+    LEAD_BATCH_SIZE leads are waiting or every LEAD_FLUSH_SECONDS. Spool
+    segments are deleted only after their leads are in Mongo, and segments
+    left by a crashed worker are replayed on the next start.
+    """
+
+    def __init__(self):
+        self.db = None
+        self.enabled = False
+        self._queue: Optional[asyncio.Queue] = None
+        self._buffer: List[dict] = []
+        self._segment = None
+        self._closed: list = []
+        self._spool_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._full = asyncio.Event()
+        self._spooler: Optional[asyncio.Task] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self, db) -> None:
+        self.db = db
+        try:
+            await db[LEADS_COLLECTION].create_index([("created_at", -1)])
+            await db[ROLLUPS_COLLECTION].create_index([("dim", 1), ("day", 1), ("value", 1)], unique=True)
+            # Covers the stats pipelines: match on dim and day, group by value or week, sum count
+            await db[ROLLUPS_COLLECTION].create_index([("dim", 1), ("day", 1), ("value", 1), ("week", 1), ("count", 1)])
+        except PyMongoError as e:
+            logger.warning("Could not create contact lead indexes: %s", e)
+        try:
+            if not await db[ROLLUPS_COLLECTION].estimated_document_count() and await db[LEADS_COLLECTION].estimated_document_count():
+                logger.info("Backfilled lead rollups from %d leads", await rebuild_rollups(db))
+        except PyMongoError as e:
+            logger.warning("Could not backfill lead rollups: %s", e)
+        if not LEAD_WRITE_BEHIND:
+            return
+
+        await asyncio.to_thread(LEAD_SPOOL_DIR.mkdir, parents=True, exist_ok=True)
+        orphans, segments = await asyncio.to_thread(_claim_orphans)
+        if orphans:
+            logger.info("Replaying %d spooled contact leads", len(orphans))
+        self._buffer.extend(orphans)
+        self._closed.extend(segments)
+        self._segment = await asyncio.to_thread(_open_segment)
+        self._queue = asyncio.Queue()
+        self._spooler = asyncio.create_task(self._spool_loop())
+        self._flusher = asyncio.create_task(self._flush_loop())
+        self.enabled = True
+        if self._buffer:
+            self._full.set()
+
+    async def stop(self) -> None:
+        if not self.enabled:
+            return
+        self.enabled = False
+        # Spool everything already accepted, then make a last attempt at Mongo
+        self._queue.put_nowait(None)
+        await self._spooler
+        self._flusher.cancel()
+        await asyncio.gather(self._flusher, return_exceptions=True)
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Last contact lead flush failed")
+        if self._buffer:
+            logger.warning("%d contact leads left in the spool for the next start", len(self._buffer))
+            for segment in self._closed + [self._segment]:
+                segment.close()
+        else:
+            await asyncio.to_thread(_discard, [self._segment])
+
+    async def submit(self, lead: dict) -> None:
+        """Returns once the lead is durable, spooled to disk or written to Mongo"""
+        if not self.enabled:
+            await insert_leads(self.db, [lead])
+            return
+        if len(self._buffer) + self._queue.qsize() >= LEAD_MAX_BUFFER:
+            raise LeadBacklogFull()
+        spooled = asyncio.get_running_loop().create_future()
+        # Copied so the caller can keep using its dict while the lead waits for Mongo
+        self._queue.put_nowait((dict(lead), spooled))
+        await spooled
+
+    async def flush(self) -> None:
+        """Insert every spooled lead into Mongo; failures stay buffered for the next try"""
+        # One flush at a time, so a segment is never discarded while its leads are in flight
+        async with self._flush_lock:
+            async with self._spool_lock:
+                if not self._buffer:
+                    return
+                if self._segment.tell():
+                    # Opened first, so a failure leaves the current segment in use
+                    segment = await asyncio.to_thread(_open_segment)
+                    self._closed.append(self._segment)
+                    self._segment = segment
+                batch, self._buffer = self._buffer, []
+            try:
+                await insert_leads(self.db, batch)
+            except PyMongoError as e:
+                logger.warning("Could not flush %d contact leads: %s", len(batch), e)
+                self._buffer[:0] = batch
+                return
+            except BaseException:
+                # Any other error, or cancellation, still leaves the batch for the next try
+                self._buffer[:0] = batch
+                raise
+            finally:
+                leads_buffered.set(value=len(self._buffer))
+            # Every lead spooled before the rotation is now in Mongo
+            closed, self._closed = self._closed, []
+            await asyncio.to_thread(_discard, closed)
+
+    async def _spool_loop(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            items = [item]
+            while len(items) < SPOOL_GROUP_SIZE and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    self._queue.put_nowait(None)
+                    break
+                items.append(item)
+            await self._spool(items)
+            if len(self._buffer) >= LEAD_BATCH_SIZE:
+                self._full.set()
+
+    async def _spool(self, items: list) -> None:
+        leads = [lead for lead, _ in items]
+        lines = [json.dumps(lead, default=str).encode("utf-8") + b"\n" for lead in leads]
+        error = None
+        async with self._spool_lock:
+            try:
+                # One write and fsync covers the whole group
+                await asyncio.to_thread(_append, self._segment, lines)
+                self._buffer.extend(leads)
+                leads_buffered.set(value=len(self._buffer))
+            except OSError as e:
+                logger.error("Lead spool write failed, writing straight to Mongo: %s", e)
+                try:
+                    await insert_leads(self.db, leads)
+                except Exception as insert_error:
+                    error = insert_error
+        for _, spooled in items:
+            if spooled.done():
+                continue
+            if error is not None:
+                spooled.set_exception(error)
+            else:
+                spooled.set_result(None)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), LEAD_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # Keep flushing; the leads stay buffered and spooled
+                logger.exception("Contact lead flush failed")
+
+
+lead_writer = LeadWriter()
@@ -0,0 +1,70 @@
+import hashlib
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from bson import Binary
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+MEDIA_COLLECTION = "media"
+MEDIA_URL_PREFIX = "/api/media"
+
+EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/gif": "gif",
+    "image/webp": "webp",
+}
+
+
+def media_url(media_id: str) -> str:
+    return f"{MEDIA_URL_PREFIX}/{media_id}"
+
+
+def media_filename(media: dict) -> str:
+    return f"{media['id']}.{EXTENSIONS.get(media['content_type'], 'bin')}"
+
+
+class MediaStore:
+    """Binary assets kept in Mongo and served by id from /api/media/{id}"""
+
+    def __init__(self):
+        self.db = None
+
+    async def start(self, db) -> None:
+        self.db = db
+        try:
+            await db[MEDIA_COLLECTION].create_index("id", unique=True)
+        except PyMongoError as e:
+            logger.warning("Could not create media index: %s", e)
+
+    async def save(self, data: bytes, content_type: str, source: str) -> dict:
+        """Store bytes and return their metadata, including the public URL"""
+        media_id = str(uuid.uuid4())
+        doc = {
+            "id": media_id,
+            "content_type": content_type,
+            "size": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "source": source,
+            "data": Binary(data),
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        await self.db[MEDIA_COLLECTION].insert_one(doc)
+        doc.pop("data")
+        doc.pop("_id", None)
+        doc["url"] = media_url(media_id)
+        return doc
+
+    async def get(self, media_id: str) -> Optional[dict]:
+        return await self.db[MEDIA_COLLECTION].find_one({"id": media_id}, {"_id": 0})
+
+    def list_all(self):
+        """Cursor over every stored asset, for backups"""
+        return self.db[MEDIA_COLLECTION].find({}, {"_id": 0})
+
+
+media_store = MediaStore()
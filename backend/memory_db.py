@@ -0,0 +1,732 @@
+"""In-memory stand-in for the subset of the Motor API used by the app.
+
+Selected with ``MONGO_URL=memory://``. It is the in-memory engine behind
+the repositories in repositories.py as well as the background services.
+Meant for benchmarks, route overhead measurements and local runs without
+a MongoDB server: data lives in the worker process and is lost on exit,
+and no command monitoring events are emitted.
+"""
+import copy
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+_MISSING = object()
+
+
+# ============= QUERY MATCHING =============
+def _get_values(doc: Any, path: str) -> List[Any]:
+    """All values reachable at a dotted path, descending into arrays"""
+    values = [doc]
+    for part in path.split("."):
+        found = []
+        for value in values:
+            if isinstance(value, dict):
+                if part in value:
+                    found.append(value[part])
+            elif isinstance(value, list):
+                if part.isdigit() and int(part) < len(value):
+                    found.append(value[int(part)])
+                else:
+                    found.extend(item[part] for item in value if isinstance(item, dict) and part in item)
+        values = found
+    return values or [_MISSING]
+
+
+def _candidates(values: List[Any]) -> List[Any]:
+    """Values plus array elements, which Mongo matches individually"""
+    result = []
+    for value in values:
+        result.append(value)
+        if isinstance(value, list):
+            result.extend(value)
+    return result
+
+
+def _equals(value: Any, expected: Any) -> bool:
+    if value is _MISSING:
+        return expected is None
+    if isinstance(value, bool) or isinstance(expected, bool):
+        # Mongo does not treat true and 1 as equal
+        return value is expected
+    return value == expected
+
+
+def _compare(value: Any, expected: Any, op) -> bool:
+    if value is _MISSING or value is None or expected is None:
+        return False
+    try:
+        return op(value, expected)
+    except TypeError:
+        return False
+
+
+_COMPARISONS = {
+    "$gt": lambda a, b: a > b,
+    "$gte": lambda a, b: a >= b,
+    "$lt": lambda a, b: a < b,
+    "$lte": lambda a, b: a <= b,
+}
+
+
+def _match_condition(values: List[Any], condition: Any) -> bool:
+    if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+        for op, expected in condition.items():
+            if op == "$options":
+                continue
+            if not _match_operator(values, op, expected, condition):
+                return False
+        return True
+    if isinstance(condition, re.Pattern):
+        return any(isinstance(v, str) and condition.search(v) for v in _candidates(values))
+    return any(_equals(v, condition) for v in _candidates(values))
+
+
+def _match_operator(values: List[Any], op: str, expected: Any, condition: dict) -> bool:
+    candidates = _candidates(values)
+    if op == "$eq":
+        return any(_equals(v, expected) for v in candidates)
+    if op == "$ne":
+        return not any(_equals(v, expected) for v in candidates)
+    if op == "$in":
+        return any(_equals(v, e) for v in candidates for e in expected)
+    if op == "$nin":
+        return not any(_equals(v, e) for v in candidates for e in expected)
+    if op in _COMPARISONS:
+        return any(_compare(v, expected, _COMPARISONS[op]) for v in candidates)
+    if op == "$exists":
+        return (values != [_MISSING]) == bool(expected)
+    if op == "$regex":
+        pattern = re.compile(expected, re.IGNORECASE if "i" in condition.get("$options", "") else 0)
+        return any(isinstance(v, str) and pattern.search(v) for v in candidates)
+    if op == "$size":
+        return any(isinstance(v, list) and len(v) == expected for v in values)
+    if op == "$all":
+        return all(any(_equals(v, e) for v in candidates) for e in expected)
+    if op == "$elemMatch":
+        return any(isinstance(v, list) and any(match_filter(item, expected) for item in v if isinstance(item, dict)) for v in values)
+    if op == "$not":
+        return not _match_condition(values, expected)
+    raise OperationFailure(f"unknown operator: {op}")
+
+
+def match_filter(doc: dict, flt: Optional[dict]) -> bool:
+    for key, condition in (flt or {}).items():
+        if key == "$or":
+            if not any(match_filter(doc, sub) for sub in condition):
+                return False
+        elif key == "$and":
+            if not all(match_filter(doc, sub) for sub in condition):
+                return False
+        elif key == "$nor":
+            if any(match_filter(doc, sub) for sub in condition):
+                return False
+        elif not _match_condition(_get_values(doc, key), condition):
+            return False
+    return True
+
+
+# ============= PROJECTION AND SORT =============
+def apply_projection(doc: dict, projection: Optional[dict]) -> dict:
+    doc = copy.deepcopy(doc)
+    if not projection:
+        return doc
+    include_id = projection.get("_id", 1)
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    if fields and all(fields.values()):
+        result = {key: doc[key] for key in fields if key in doc}
+        if include_id and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+    for key, value in fields.items():
+        if not value:
+            doc.pop(key, None)
+    if not include_id:
+        doc.pop("_id", None)
+    return doc
+
+
+def _type_rank(value: Any) -> int:
+    if value is _MISSING or value is None:
+        return 0
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 1
+    if isinstance(value, str):
+        return 2
+    if isinstance(value, dict):
+        return 3
+    if isinstance(value, list):
+        return 4
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 10
+
+
+def _sort_key(value: Any):
+    rank = _type_rank(value)
+    if rank in (0, 3, 4, 10):
+        return (rank, 0)
+    return (rank, value)
+
+
+def sort_documents(docs: List[dict], sort: List[tuple]) -> List[dict]:
+    for key, direction in reversed(sort):
+        docs.sort(key=lambda d: _sort_key(_get_values(d, key)[0]), reverse=direction < 0)
+    return docs
+
+
+def _normalize_sort(key_or_list, direction=None) -> List[tuple]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return list(key_or_list)
+
+
+# ============= UPDATES =============
+def _set_path(doc: dict, path: str, value: Any) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset_path(doc: dict, path: str) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def _get_path(doc: dict, path: str, default=None):
+    for part in path.split("."):
+        if not isinstance(doc, dict) or part not in doc:
+            return default
+        doc = doc[part]
+    return doc
+
+
+def apply_update(doc: dict, update: dict, inserting: bool = False) -> None:
+    if not any(key.startswith("$") for key in update):
+        # Replacement document
+        _id = doc.get("_id")
+        doc.clear()
+        doc.update(copy.deepcopy(update))
+        if _id is not None:
+            doc["_id"] = _id
+        return
+    for op, fields in update.items():
+        for path, value in fields.items():
+            value = copy.deepcopy(value)
+            if op == "$set" or (op == "$setOnInsert" and inserting):
+                _set_path(doc, path, value)
+            elif op == "$unset":
+                _unset_path(doc, path)
+            elif op == "$inc":
+                _set_path(doc, path, _get_path(doc, path, 0) + value)
+            elif op in ("$min", "$max"):
+                current = _get_path(doc, path, _MISSING)
+                if current is _MISSING or (value < current if op == "$min" else value > current):
+                    _set_path(doc, path, value)
+            elif op in ("$push", "$addToSet"):
+                items = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                array = _get_path(doc, path)
+                if array is None:
+                    array = []
+                    _set_path(doc, path, array)
+                for item in items:
+                    if op == "$push" or item not in array:
+                        array.append(item)
+            elif op == "$pull":
+                array = _get_path(doc, path)
+                if isinstance(array, list):
+                    keep = [item for item in array if not (
+                        match_filter(item, value) if isinstance(value, dict) and isinstance(item, dict) else item == value
+                    )]
+                    _set_path(doc, path, keep)
+            elif op == "$setOnInsert":
+                continue
+            else:
+                raise OperationFailure(f"unknown update operator: {op}")
+
+
+def _upsert_seed(flt: dict) -> dict:
+    """Equality fields of a filter, which an upsert copies into the new document"""
+    seed = {}
+    for key, value in (flt or {}).items():
+        if key.startswith("$"):
+            continue
+        if isinstance(value, dict) and any(k.startswith("$") for k in value):
+            if "$eq" in value:
+                _set_path(seed, key, copy.deepcopy(value["$eq"]))
+            continue
+        _set_path(seed, key, copy.deepcopy(value))
+    return seed
+
+
+# ============= AGGREGATION =============
+def _evaluate(doc: dict, expr: Any) -> Any:
+    """Field paths, nested documents of field paths and literals"""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return _get_path(doc, expr[1:])
+    if isinstance(expr, dict):
+        return {key: _evaluate(doc, value) for key, value in expr.items()}
+    return expr
+
+
+def _accumulate(op: str, state: Any, value: Any) -> Any:
+    if op == "$sum":
+        return state + (value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0)
+    if op == "$min":
+        return value if state is None or (value is not None and value < state) else state
+    if op == "$max":
+        return value if state is None or (value is not None and value > state) else state
+    if op == "$first":
+        return state
+    if op == "$last":
+        return value
+    if op == "$push":
+        return state + [value]
+    if op == "$addToSet":
+        return state if value in state else state + [value]
+    if op == "$avg":
+        return (state[0] + (value or 0), state[1] + 1)
+    raise OperationFailure(f"unknown group operator: {op}")
+
+
+def _initial(op: str, value: Any) -> Any:
+    if op == "$sum":
+        return _accumulate(op, 0, value)
+    if op in ("$push", "$addToSet"):
+        return [value]
+    if op == "$avg":
+        return (value or 0, 1)
+    return value
+
+
+def _group(docs: List[dict], spec: dict) -> List[dict]:
+    accumulators = [(field, *next(iter(acc.items()))) for field, acc in spec.items() if field != "_id"]
+    groups: Dict[str, dict] = {}
+    for doc in docs:
+        group_id = _evaluate(doc, spec["_id"])
+        key = repr(group_id)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {"_id": group_id, **{field: _initial(op, _evaluate(doc, expr)) for field, op, expr in accumulators}}
+            continue
+        for field, op, expr in accumulators:
+            group[field] = _accumulate(op, group[field], _evaluate(doc, expr))
+    for group in groups.values():
+        for field, op, _ in accumulators:
+            if op == "$avg":
+                total, count = group[field]
+                group[field] = total / count
+    return list(groups.values())
+
+
+def _project(doc: dict, spec: dict) -> dict:
+    if all(value in (0, 1, True, False) for value in spec.values()):
+        return apply_projection(doc, spec)
+    result = {"_id": doc["_id"]} if spec.get("_id", 1) and "_id" in doc else {}
+    for key, value in spec.items():
+        if value in (0, False):
+            result.pop(key, None)
+        elif value in (1, True):
+            if key in doc:
+                result[key] = doc[key]
+        else:
+            result[key] = _evaluate(doc, value)
+    return result
+
+
+def _unwind(docs: List[dict], path: str) -> List[dict]:
+    field = path[1:]
+    result = []
+    for doc in docs:
+        values = _get_path(doc, field)
+        if not isinstance(values, list):
+            if values is not None:
+                result.append(doc)
+            continue
+        for value in values:
+            item = copy.deepcopy(doc)
+            _set_path(item, field, value)
+            result.append(item)
+    return result
+
+
+def run_pipeline(docs: List[dict], pipeline: List[dict]) -> List[dict]:
+    """The stages the app uses: $match, $group, $sort, $skip, $limit, $project, $unwind, $count and $facet"""
+    for stage in pipeline:
+        (op, arg), = stage.items()
+        if op == "$match":
+            docs = [doc for doc in docs if match_filter(doc, arg)]
+        elif op == "$group":
+            docs = _group(docs, arg)
+        elif op == "$sort":
+            docs = sort_documents(docs, list(arg.items()))
+        elif op == "$skip":
+            docs = docs[arg:]
+        elif op == "$limit":
+            docs = docs[:arg]
+        elif op == "$project":
+            docs = [_project(doc, arg) for doc in docs]
+        elif op == "$unwind":
+            docs = _unwind(docs, arg if isinstance(arg, str) else arg["path"])
+        elif op == "$count":
+            docs = [{arg: len(docs)}] if docs else []
+        elif op == "$facet":
+            docs = [{name: run_pipeline(list(docs), sub) for name, sub in arg.items()}]
+        else:
+            raise OperationFailure(f"Unrecognized pipeline stage name: '{op}'")
+    return docs
+
+
+# ============= RESULTS =============
+class InsertOneResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+        self.acknowledged = True
+
+
+class InsertManyResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+        self.acknowledged = True
+
+
+class UpdateResult:
+    def __init__(self, matched_count: int, modified_count: int, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+        self.acknowledged = True
+
+
+class DeleteResult:
+    def __init__(self, deleted_count: int):
+        self.deleted_count = deleted_count
+        self.acknowledged = True
+
+
+class BulkWriteResult:
+    def __init__(self):
+        self.inserted_count = 0
+        self.matched_count = 0
+        self.modified_count = 0
+        self.deleted_count = 0
+        self.upserted_count = 0
+        self.upserted_ids: Dict[int, Any] = {}
+        self.acknowledged = True
+
+
+# ============= CURSOR, COLLECTION, DATABASE =============
+class MemoryCursor:
+    def __init__(self, collection: "MemoryCollection", flt: Optional[dict], projection: Optional[dict]):
+        self._collection = collection
+        self._filter = flt or {}
+        self._projection = projection
+        self._sort: List[tuple] = []
+        self._skip = 0
+        self._limit = 0
+        self._results: Optional[List[dict]] = None
+
+    def sort(self, key_or_list, direction=None) -> "MemoryCursor":
+        self._sort.extend(_normalize_sort(key_or_list, direction))
+        return self
+
+    def skip(self, count: int) -> "MemoryCursor":
+        self._skip = count
+        return self
+
+    def limit(self, count: int) -> "MemoryCursor":
+        self._limit = count
+        return self
+
+    def batch_size(self, size: int) -> "MemoryCursor":
+        return self
+
+    def _evaluate(self) -> List[dict]:
+        if self._results is None:
+            docs = [doc for doc in self._collection._docs.values() if match_filter(doc, self._filter)]
+            if self._sort:
+                docs = sort_documents(docs, self._sort)
+            docs = docs[self._skip:]
+            if self._limit:
+                docs = docs[:self._limit]
+            self._results = [apply_projection(doc, self._projection) for doc in docs]
+        return self._results
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        results = self._evaluate()
+        if length is None:
+            taken, self._results = results, []
+        else:
+            taken, self._results = results[:length], results[length:]
+        return taken
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        results = self._evaluate()
+        if not results:
+            raise StopAsyncIteration
+        return results.pop(0)
+
+
+class MemoryCommandCursor(MemoryCursor):
+    """Cursor over precomputed results, as returned by aggregate"""
+
+    def __init__(self, results: List[dict]):
+        self._results = results
+
+
+class _UnsupportedChangeStream:
+    async def __aenter__(self):
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class MemoryCollection:
+    def __init__(self, database: "MemoryDatabase", name: str):
+        self.database = database
+        self.name = name
+        # Keyed by _id, kept in insertion order like a collection scan
+        self._docs: Dict[Any, dict] = {}
+
+    def _matching(self, flt: Optional[dict]) -> List[dict]:
+        _id = (flt or {}).get("_id")
+        if _id is not None and not isinstance(_id, dict):
+            doc = self._docs.get(_id)
+            return [doc] if doc is not None and match_filter(doc, flt) else []
+        return [doc for doc in self._docs.values() if match_filter(doc, flt)]
+
+    def find(self, filter: Optional[dict] = None, projection: Optional[dict] = None, **kwargs) -> MemoryCursor:
+        cursor = MemoryCursor(self, filter, projection)
+        if kwargs.get("sort"):
+            cursor.sort(kwargs["sort"])
+        if kwargs.get("skip"):
+            cursor.skip(kwargs["skip"])
+        if kwargs.get("limit"):
+            cursor.limit(kwargs["limit"])
+        return cursor
+
+    async def find_one(self, filter: Optional[dict] = None, projection: Optional[dict] = None, **kwargs) -> Optional[dict]:
+        docs = await self.find(filter, projection, **kwargs).limit(1).to_list(1)
+        return docs[0] if docs else None
+
+    def _insert(self, document: dict) -> Any:
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+        if document["_id"] in self._docs:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} dup key: {{ _id: {document['_id']!r} }}")
+        self._docs[document["_id"]] = copy.deepcopy(document)
+        return document["_id"]
+
+    async def insert_one(self, document: dict, **kwargs) -> InsertOneResult:
+        return InsertOneResult(self._insert(document))
+
+    async def insert_many(self, documents: List[dict], ordered: bool = True, **kwargs) -> InsertManyResult:
+        return InsertManyResult([self._insert(document) for document in documents])
+
+    def _update(self, flt: dict, update: dict, upsert: bool, many: bool) -> UpdateResult:
+        docs = self._matching(flt)
+        if not many:
+            docs = docs[:1]
+        if not docs and upsert:
+            doc = _upsert_seed(flt)
+            apply_update(doc, update, inserting=True)
+            return UpdateResult(0, 0, self._insert(doc))
+        modified = 0
+        for doc in docs:
+            before = copy.deepcopy(doc)
+            apply_update(doc, update)
+            modified += doc != before
+        return UpdateResult(len(docs), modified)
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False, **kwargs) -> UpdateResult:
+        return self._update(filter, update, upsert, many=False)
+
+    async def update_many(self, filter: dict, update: dict, upsert: bool = False, **kwargs) -> UpdateResult:
+        return self._update(filter, update, upsert, many=True)
+
+    async def replace_one(self, filter: dict, replacement: dict, upsert: bool = False, **kwargs) -> UpdateResult:
+        return self._update(filter, replacement, upsert, many=False)
+
+    async def find_one_and_update(
+        self,
+        filter: dict,
+        update: dict,
+        projection: Optional[dict] = None,
+        sort=None,
+        upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+        **kwargs
+    ) -> Optional[dict]:
+        docs = self._matching(filter)
+        if sort:
+            docs = sort_documents(docs, _normalize_sort(sort))
+        if not docs:
+            if not upsert:
+                return None
+            doc = _upsert_seed(filter)
+            apply_update(doc, update, inserting=True)
+            self._insert(doc)
+            return apply_projection(self._docs[doc["_id"]], projection) if return_document else None
+        doc = docs[0]
+        before = apply_projection(doc, projection)
+        apply_update(doc, update)
+        return apply_projection(doc, projection) if return_document else before
+
+    async def find_one_and_delete(self, filter: dict, projection: Optional[dict] = None, sort=None, **kwargs) -> Optional[dict]:
+        docs = self._matching(filter)
+        if sort:
+            docs = sort_documents(docs, _normalize_sort(sort))
+        if not docs:
+            return None
+        doc = self._docs.pop(docs[0]["_id"])
+        return apply_projection(doc, projection)
+
+    async def delete_one(self, filter: dict, **kwargs) -> DeleteResult:
+        docs = self._matching(filter)[:1]
+        for doc in docs:
+            del self._docs[doc["_id"]]
+        return DeleteResult(len(docs))
+
+    async def delete_many(self, filter: dict, **kwargs) -> DeleteResult:
+        docs = self._matching(filter)
+        for doc in docs:
+            del self._docs[doc["_id"]]
+        return DeleteResult(len(docs))
+
+    async def bulk_write(self, requests: list, ordered: bool = True, **kwargs) -> BulkWriteResult:
+        result = BulkWriteResult()
+        for index, request in enumerate(requests):
+            if isinstance(request, InsertOne):
+                self._insert(request._doc)
+                result.inserted_count += 1
+            elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+                outcome = self._update(request._filter, request._doc, request._upsert, many=isinstance(request, UpdateMany))
+                result.matched_count += outcome.matched_count
+                result.modified_count += outcome.modified_count
+                if outcome.upserted_id is not None:
+                    result.upserted_count += 1
+                    result.upserted_ids[index] = outcome.upserted_id
+            elif isinstance(request, (DeleteOne, DeleteMany)):
+                docs = self._matching(request._filter)
+                if isinstance(request, DeleteOne):
+                    docs = docs[:1]
+                for doc in docs:
+                    del self._docs[doc["_id"]]
+                result.deleted_count += len(docs)
+            else:
+                raise TypeError(f"{request!r} is not a valid request")
+        return result
+
+    def aggregate(self, pipeline: List[dict], **kwargs) -> MemoryCommandCursor:
+        # Stages never modify their input, so only the (usually small) output is copied
+        return MemoryCommandCursor(copy.deepcopy(run_pipeline(list(self._docs.values()), pipeline)))
+
+    async def count_documents(self, filter: dict, **kwargs) -> int:
+        docs = self._matching(filter)
+        if kwargs.get("skip"):
+            docs = docs[kwargs["skip"]:]
+        if kwargs.get("limit"):
+            docs = docs[:kwargs["limit"]]
+        return len(docs)
+
+    async def estimated_document_count(self, **kwargs) -> int:
+        return len(self._docs)
+
+    async def distinct(self, key: str, filter: Optional[dict] = None, **kwargs) -> List[Any]:
+        result = []
+        for doc in self._matching(filter):
+            for value in _candidates(_get_values(doc, key)):
+                if value is not _MISSING and not isinstance(value, list) and value not in result:
+                    result.append(copy.deepcopy(value))
+        return result
+
+    async def create_index(self, keys, **kwargs) -> str:
+        keys = _normalize_sort(keys)
+        return kwargs.get("name") or "_".join(f"{key}_{direction}" for key, direction in keys)
+
+    async def drop_index(self, index_or_name, **kwargs) -> None:
+        pass
+
+    async def drop(self) -> None:
+        self._docs.clear()
+
+    def watch(self, *args, **kwargs):
+        return _UnsupportedChangeStream()
+
+
+class MemoryDatabase:
+    def __init__(self, client: "MemoryClient", name: str):
+        self.client = client
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(self, name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_collection(self, name: str, **kwargs) -> MemoryCollection:
+        return self[name]
+
+    async def list_collection_names(self, **kwargs) -> List[str]:
+        return [name for name, collection in self._collections.items() if collection._docs]
+
+    async def drop_collection(self, name: str, **kwargs) -> None:
+        self._collections.pop(name, None)
+
+    async def command(self, command, **kwargs) -> dict:
+        if command in ("ping", {"ping": 1}):
+            return {"ok": 1.0}
+        raise OperationFailure(f"command not supported in memory: {command}")
+
+    def watch(self, *args, **kwargs):
+        return _UnsupportedChangeStream()
+
+
+class MemoryClient:
+    def __init__(self, *args, **kwargs):
+        self._databases: Dict[str, MemoryDatabase] = {}
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(self, name)
+        return self._databases[name]
+
+    def __getattr__(self, name: str) -> MemoryDatabase:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_database(self, name: str, **kwargs) -> MemoryDatabase:
+        return self[name]
+
+    @property
+    def admin(self) -> MemoryDatabase:
+        return self["admin"]
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,274 @@
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+EVENT_LOOP_LAG_INTERVAL = float(os.environ.get('EVENT_LOOP_LAG_INTERVAL_SECONDS', '0.5'))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+
+class RequestStats:
+    """Mongo activity attributed to the request currently being handled"""
+    __slots__ = ("mongo_commands", "mongo_seconds")
+
+    def __init__(self):
+        self.mongo_commands = 0
+        self.mongo_seconds = 0.0
+
+
+# Motor runs commands on executor threads with a copy of the caller's context,
+# so listener callbacks still see the request that issued the command
+current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("current_request", default=None)
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return "\n".join(lines)
+
+
+class Gauge(Counter):
+    def set(self, *label_values: str, value: float) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+    def render(self) -> str:
+        return super().render().replace(f"# TYPE {self.name} counter", f"# TYPE {self.name} gauge")
+
+
+class Histogram:
+    def __init__(self, name: str, description: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, *label_values: str, value: float) -> None:
+        with self._lock:
+            series = self._values.get(label_values)
+            if series is None:
+                series = self._values[label_values] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, series in sorted(self._values.items()):
+                labels = _format_labels(self.labels, label_values)
+                for bound, count in zip(self.buckets, series):
+                    bucket_labels = _format_labels(self.labels, label_values, 'le="%s"' % bound)
+                    lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+                inf_labels = _format_labels(self.labels, label_values, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf_labels} {series[-2]}")
+                lines.append(f"{self.name}_count{labels} {series[-2]}")
+                lines.append(f"{self.name}_sum{labels} {series[-1]}")
+        return "\n".join(lines)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")))
+http_latency = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")))
+http_response_size = registry.register(Histogram(
+    "http_response_size_bytes", "HTTP response body size", ("method", "route"), SIZE_BUCKETS))
+request_mongo_commands = registry.register(Histogram(
+    "http_request_mongo_commands", "Mongo commands issued per HTTP request", ("method", "route"), COUNT_BUCKETS))
+request_mongo_time = registry.register(Histogram(
+    "http_request_mongo_duration_seconds", "Time spent in Mongo per HTTP request", ("method", "route")))
+mongo_latency = registry.register(Histogram(
+    "mongo_command_duration_seconds", "Mongo command latency", ("command", "collection")))
+mongo_failures = registry.register(Counter(
+    "mongo_command_failures_total", "Failed Mongo commands", ("command", "collection")))
+rate_limit_rejections = registry.register(Counter(
+    "rate_limit_rejections_total", "Requests rejected by rate limiting", ("rule",)))
+leads_buffered = registry.register(Gauge(
+    "contact_leads_buffered", "Contact leads spooled but not yet in Mongo"))
+event_loop_lag = registry.register(Histogram(
+    "event_loop_lag_seconds", "Delay of scheduled event loop callbacks", buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)))
+event_loop_lag_last = registry.register(Gauge(
+    "event_loop_lag_last_seconds", "Most recent event loop lag sample"))
+mongo_circuit_open = registry.register(Gauge(
+    "mongo_circuit_open", "Whether the circuit breaker in front of public reads is open", ("breaker",)))
+mongo_circuit_trips = registry.register(Counter(
+    "mongo_circuit_trips_total", "Times the circuit breaker opened", ("breaker",)))
+stale_responses = registry.register(Counter(
+    "stale_responses_total", "Cached responses served past their TTL", ("namespace", "reason")))
+cache_entries = registry.register(Gauge(
+    "cache_entries", "Entries held by the local response cache"))
+cache_evictions = registry.register(Counter(
+    "cache_evictions_total", "Local cache entries dropped before they were replaced", ("namespace", "reason")))
+catalogue_replica_documents = registry.register(Gauge(
+    "catalogue_replica_documents", "Documents held by the in-memory catalogue replica", ("collection",)))
+catalogue_replica_bytes = registry.register(Gauge(
+    "catalogue_replica_bytes", "Approximate memory held by catalogue replica records", ("collection",)))
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Records every Mongo command globally and against the current request"""
+
+    def __init__(self):
+        self._pending: Dict[int, Tuple[str, str]] = {}
+        self._stats_lock = threading.Lock()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        if not isinstance(collection, str):
+            collection = ""
+        self._pending[event.request_id] = (event.command_name, collection)
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        command, collection = self._record(event)
+        mongo_failures.inc(command, collection)
+
+    def _record(self, event) -> Tuple[str, str]:
+        command, collection = self._pending.pop(event.request_id, (event.command_name, ""))
+        seconds = event.duration_micros / 1_000_000
+        mongo_latency.observe(command, collection, value=seconds)
+        stats = current_request.get()
+        if stats is not None:
+            # Commands gathered concurrently by one request finish on different threads
+            with self._stats_lock:
+                stats.mongo_commands += 1
+                stats.mongo_seconds += seconds
+        return command, collection
+
+
+mongo_listener = MongoCommandListener()
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each request and measuring its response body"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = ["500"]
+        body_size = [0]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            elif message["type"] == "http.response.body":
+                body_size[0] += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            # Label by route template so path parameters don't explode cardinality
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_requests.inc(method, route_path, status[0])
+            http_latency.observe(method, route_path, value=elapsed)
+            http_response_size.observe(method, route_path, value=body_size[0])
+            request_mongo_commands.observe(method, route_path, value=stats.mongo_commands)
+            request_mongo_time.observe(method, route_path, value=stats.mongo_seconds)
+
+
+class EventLoopLagMonitor:
+    """Samples how late the event loop runs a callback scheduled at a fixed interval"""
+
+    def __init__(self, interval: float = EVENT_LOOP_LAG_INTERVAL):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            event_loop_lag.observe(value=lag)
+            event_loop_lag_last.set(value=lag)
+
+
+event_loop_monitor = EventLoopLagMonitor()
+
+
+def render_metrics() -> str:
+    return registry.render()
@@ -0,0 +1,34 @@
+import asyncio
+from pymongo import UpdateOne
+from content import article_content
+from database import DB_NAME, create_client
+
+BATCH_SIZE = 500
+
+async def migrate_article_content():
+    """Render existing article bodies and compute their reading time and excerpt"""
+    client = create_client()
+    db = client[DB_NAME]
+    
+    print("🔄 Starting migration: render article content at write time...")
+    
+    rendered = 0
+    ops = []
+    async for doc in db.articles.find({}, {"content": 1, "excerpt": 1}).batch_size(BATCH_SIZE):
+        # An excerpt already stored was written by its author
+        fields = article_content(doc.get("content") or "", doc.get("excerpt") or "")
+        del fields["content"]
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+        rendered += 1
+        if len(ops) >= BATCH_SIZE:
+            await db.articles.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        await db.articles.bulk_write(ops, ordered=False)
+    
+    print(f"✅ Rendered {rendered} articles")
+    
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(migrate_article_content())
@@ -0,0 +1,52 @@
+import asyncio
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+from pymongo.errors import OperationFailure
+from database import DB_NAME, create_client
+from ids import KEYED_COLLECTIONS, MONGO_ID_FORMAT, decode_id, encode_id
+
+BATCH_SIZE = 500
+
+async def rekey_collection(collection) -> int:
+    """Store every document under its application id; returns how many were rewritten"""
+    rewritten = 0
+    ops = []
+    async for doc in collection.find({}).batch_size(BATCH_SIZE):
+        old_id = doc.pop("_id")
+        # Old layout: an ObjectId _id next to the id field
+        item_id = doc.pop("id", None)
+        new_id = encode_id(item_id or decode_id(old_id))
+        if new_id != old_id:
+            # An _id cannot change in place: write the new document, then delete the old one.
+            # Upserting by the new _id keeps an interrupted run safe to repeat.
+            ops += [ReplaceOne({"_id": new_id}, doc, upsert=True), DeleteOne({"_id": old_id})]
+        elif item_id is not None:
+            ops.append(UpdateOne({"_id": old_id}, {"$unset": {"id": ""}}))
+        else:
+            continue
+        rewritten += 1
+        if len(ops) >= BATCH_SIZE:
+            await collection.bulk_write(ops, ordered=True)
+            ops = []
+    if ops:
+        await collection.bulk_write(ops, ordered=True)
+    return rewritten
+
+async def migrate_ids():
+    """Move application ids into _id and drop the separate id indexes"""
+    client = create_client()
+    db = client[DB_NAME]
+
+    print(f"🔄 Starting migration: application ids as _id ({MONGO_ID_FORMAT})...")
+
+    for name in KEYED_COLLECTIONS:
+        rewritten = await rekey_collection(db[name])
+        try:
+            await db[name].drop_index("id_1")
+        except OperationFailure:
+            pass  # never created, or already dropped
+        print(f"✅ {name}: rewrote {rewritten} documents")
+
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(migrate_ids())
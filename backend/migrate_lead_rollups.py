@@ -0,0 +1,19 @@
+import asyncio
+from database import DB_NAME, create_client
+from leads import rebuild_rollups
+
+async def migrate_lead_rollups():
+    """Recount the lead_rollups documents behind /api/contact/leads/stats"""
+    client = create_client()
+    db = client[DB_NAME]
+    
+    print("🔄 Starting migration: rebuild lead rollups from contact_leads...")
+    
+    counted = await rebuild_rollups(db)
+    
+    print(f"✅ Rollups rebuilt from {counted} leads")
+    
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(migrate_lead_rollups())
@@ -0,0 +1,20 @@
+import asyncio
+from database import DB_NAME, create_client
+from routers.products import repair_product_categories
+
+async def migrate_product_categories():
+    """Backfill category_name/category_slug on existing product documents"""
+    client = create_client()
+    db = client[DB_NAME]
+    
+    print("🔄 Starting migration: denormalize category fields onto products...")
+    
+    result = await repair_product_categories(db)
+    
+    print(f"✅ Updated {result['repaired']} products with their category name and slug")
+    print(f"✅ Cleared category fields on {result['orphaned']} products without a category")
+    
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(migrate_product_categories())
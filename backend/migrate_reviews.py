@@ -1,13 +1,13 @@
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
+from database import DB_NAME, create_client
+from ids import to_document
 from datetime import datetime, timezone
-import os
 import uuid
 
 async def migrate_reviews():
     """Migrate testimonials from clients to reviews collection"""
-    client = AsyncIOMotorClient(os.environ.get('MONGO_URL', 'mongodb://localhost:27017'))
-    db = client['ellavera_beauty']
+    client = create_client()
+    db = client[DB_NAME]
     
     print("🔄 Starting migration: Clients → Reviews...")
     
@@ -34,7 +34,7 @@ async def migrate_reviews():
                 "created_at": client_data.get('created_at', datetime.now(timezone.utc).isoformat())
             }
             
-            await db.reviews.insert_one(review)
+            await db.reviews.insert_one(to_document(review))
             reviews_created += 1
             print(f"  ✅ Created review for: {client_data['name']}")
     
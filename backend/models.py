@@ -0,0 +1,400 @@
+"""Request and response models for the API routers"""
+from datetime import date, datetime
+from typing import List, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+
+# ============= AUTH MODELS =============
+class UserCreate(BaseModel):
+    email: EmailStr
+    password: str
+    full_name: str
+
+class UserLogin(BaseModel):
+    email: EmailStr
+    password: str
+
+class User(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    email: str
+    full_name: str
+    is_admin: bool = False
+    created_at: datetime
+
+class TokenResponse(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    user: User
+
+# ============= FACET MODELS =============
+class FacetCount(BaseModel):
+    value: Optional[Union[bool, str]] = None
+    label: Optional[str] = None  # display name, where the value is an id
+    count: int
+
+# ============= PRODUCT MODELS =============
+class ProductCategory(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    name: str
+    slug: str
+    description: Optional[str] = None
+    created_at: datetime
+
+class ProductCategoryCreate(BaseModel):
+    name: str
+    description: Optional[str] = None
+
+class Product(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    name: str
+    slug: str
+    category_id: str
+    category_name: Optional[str] = None
+    category_slug: Optional[str] = None
+    description: str
+    benefits: Optional[str] = None
+    key_ingredients: Optional[str] = None
+    packaging_options: Optional[str] = None
+    meta_description: Optional[str] = None
+    images: List[str] = []
+    documents: List[dict] = []  # {name, url, type}
+    featured: bool = False
+    related_ids: List[str] = Field([], exclude=True)  # computed by related.py
+    created_at: datetime
+    updated_at: datetime
+
+class ProductCreate(BaseModel):
+    name: str
+    category_id: str
+    description: str
+    benefits: Optional[str] = None
+    key_ingredients: Optional[str] = None
+    packaging_options: Optional[str] = None
+    meta_description: Optional[str] = None
+    featured: bool = False
+
+class ProductBrowse(BaseModel):
+    items: List[Product]
+    by_category: List[FacetCount]
+    by_featured: List[FacetCount]
+    by_document_type: List[FacetCount]
+
+# ============= ARTICLE MODELS =============
+class TocEntry(BaseModel):
+    level: int
+    text: str
+    id: str  # of the heading in content_html
+
+# What article lists need; the body and its rendering are left out
+class ArticleSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    title: str
+    slug: str
+    excerpt: str
+    excerpt_generated: bool = False  # taken from the content, not written by the author
+    cover_image: Optional[str] = None
+    category: str
+    meta_title: Optional[str] = None
+    meta_description: Optional[str] = None
+    read_time: int = 5
+    published: bool = False
+    related_ids: List[str] = Field([], exclude=True)  # computed by related.py
+    created_at: datetime
+    updated_at: datetime
+
+class Article(ArticleSummary):
+    content: str  # Markdown
+    content_html: str = ""  # rendered by content.py when written
+    toc: List[TocEntry] = []
+
+class ArticleCreate(BaseModel):
+    title: str
+    content: str
+    excerpt: str = ""  # taken from the content when empty
+    cover_image: Optional[str] = None
+    category: str
+    meta_title: Optional[str] = None
+    meta_description: Optional[str] = None
+    published: bool = False
+
+# ============= CLIENT MODELS =============
+class Client(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    name: str
+    logo_url: str
+    created_at: datetime
+
+class ClientCreate(BaseModel):
+    name: str
+    logo_url: str
+
+# ============= REVIEW MODELS =============
+class Review(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    customer_name: str
+    review_text: str
+    rating: int = 5
+    position: Optional[str] = None
+    company: Optional[str] = None
+    photo_url: Optional[str] = None
+    created_at: datetime
+
+class ReviewCreate(BaseModel):
+    customer_name: str
+    review_text: str
+    rating: int = 5
+    position: Optional[str] = None
+    company: Optional[str] = None
+    photo_url: Optional[str] = None
+
+# ============= CATEGORY MODELS =============
+class Category(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    name: str
+    slug: str
+    type: str  # 'product' or 'article'
+    description: Optional[str] = None
+    order: float = 0
+    created_at: datetime
+    updated_at: datetime
+
+class CategoryCreate(BaseModel):
+    name: str
+    type: str  # 'product' or 'article'
+    description: Optional[str] = None
+    order: float = 0
+
+# ============= GALLERY MODELS =============
+class GalleryItem(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    title: str
+    description: Optional[str] = None
+    image_url: str
+    category: Optional[str] = None
+    featured: bool = False
+    order: float = 0
+    created_at: datetime
+    updated_at: datetime
+
+class GalleryItemCreate(BaseModel):
+    title: str
+    description: Optional[str] = None
+    image_url: str
+    category: Optional[str] = None
+    featured: bool = False
+    order: float = 0
+
+class GalleryBrowse(BaseModel):
+    items: List[GalleryItem]
+    by_category: List[FacetCount]
+    by_featured: List[FacetCount]
+
+# ============= SERVICE MODELS =============
+class Service(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    name: str
+    slug: str
+    short_description: str
+    description: str
+    icon: str = "Sparkles"
+    image_url: Optional[str] = None
+    features: List[str] = []
+    benefits: Optional[str] = None
+    process_steps: Optional[str] = None
+    featured: bool = False
+    order: float = 0
+    created_at: datetime
+    updated_at: datetime
+
+class ServiceCreate(BaseModel):
+    name: str
+    short_description: str
+    description: str
+    icon: str = "Sparkles"
+    image_url: Optional[str] = None
+    features: List[str] = []
+    benefits: Optional[str] = None
+    process_steps: Optional[str] = None
+    featured: bool = False
+    order: float = 0
+
+# ============= THEME MODELS =============
+class ThemeSettings(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    primary_color: str = "#06b6d4"
+    accent_color: str = "#0891b2"
+    background_color: str = "#ffffff"
+    text_color: str = "#0f172a"
+    heading_font: str = "Playfair Display"
+    body_font: str = "Inter"
+    theme_mode: str = "light"
+    updated_at: datetime
+
+class ThemeSettingsUpdate(BaseModel):
+    primary_color: Optional[str] = None
+    accent_color: Optional[str] = None
+    background_color: Optional[str] = None
+    text_color: Optional[str] = None
+    heading_font: Optional[str] = None
+    body_font: Optional[str] = None
+    theme_mode: Optional[str] = None
+
+# ============= SITE SETTINGS MODELS =============
+class SiteSettings(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    site_name: str = "Ellavera Beauty"
+    site_tagline: str = "Premium Cosmetic Manufacturing"
+    logo_url: Optional[str] = None
+    favicon_url: Optional[str] = None
+    logo_text: str = "Ellavera Beauty"
+    footer_text: str = "Premium cosmetic manufacturing solutions for your brand."
+    footer_copyright: Optional[str] = None
+    footer_links_title: str = "Quick Links"
+    footer_services_title: str = "Our Services"
+    footer_contact_title: str = "Contact Us"
+    footer_services: List[str] = []
+    contact_email: str = "info@ellavera.com"
+    contact_phone: str = "+62 123 456 7890"
+    contact_address: str = "Jakarta, Indonesia"
+    whatsapp_number: str = "6281234567890"
+    whatsapp_message: str = "Hello! I'm interested in your services."
+    google_maps_url: str = "https://www.google.com/maps/embed?pb=!1m18!1m12!1m3!1d253840.65833061103!2d106.68942995!3d-6.229386599999999!2m3!1f0!2f0!3f0!3m2!1i1024!2i768!4f13.1!3m3!1m2!1s0x2e69f3e945e34b9d%3A0x5371bf0fdad786a2!2sJakarta%2C%20Indonesia!5e0!3m2!1sen!2s!4v1620000000000!5m2!1sen!2s"
+    facebook_url: str = "#"
+    instagram_url: str = "#"
+    twitter_url: str = "#"
+    linkedin_url: Optional[str] = None
+    youtube_url: Optional[str] = None
+    # Page titles and subtitles
+    page_titles: dict = {
+        "products": {"title": "Our Products", "subtitle": "Discover our range of quality products"},
+        "services": {"title": "Our Services", "subtitle": "Professional solutions for your needs"},
+        "articles": {"title": "Articles & News", "subtitle": "Latest updates and insights"},
+        "gallery": {"title": "Gallery", "subtitle": "See our work and facilities"},
+        "clients": {"title": "Our Clients", "subtitle": "Trusted by leading brands"},
+        "contact": {"title": "Contact Us", "subtitle": "Get in touch with our team"},
+        "about": {"title": "About Us", "subtitle": "Learn more about our company"}
+    }
+    updated_at: datetime
+
+class SiteSettingsUpdate(BaseModel):
+    site_name: Optional[str] = None
+    site_tagline: Optional[str] = None
+    logo_url: Optional[str] = None
+    favicon_url: Optional[str] = None
+    logo_text: Optional[str] = None
+    footer_text: Optional[str] = None
+    footer_copyright: Optional[str] = None
+    footer_links_title: Optional[str] = None
+    footer_services_title: Optional[str] = None
+    footer_contact_title: Optional[str] = None
+    footer_services: Optional[List[str]] = None
+    contact_email: Optional[str] = None
+    contact_phone: Optional[str] = None
+    contact_address: Optional[str] = None
+    whatsapp_number: Optional[str] = None
+    whatsapp_message: Optional[str] = None
+    google_maps_url: Optional[str] = None
+    facebook_url: Optional[str] = None
+    instagram_url: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    youtube_url: Optional[str] = None
+    twitter_url: Optional[str] = None
+    page_titles: Optional[dict] = None
+
+# ============= CONTACT MODELS =============
+class ContactLead(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    name: str
+    email: str
+    phone: Optional[str] = None
+    company: Optional[str] = None
+    message: str
+    source_page: Optional[str] = None
+    created_at: datetime
+
+class ContactLeadCreate(BaseModel):
+    name: str
+    email: EmailStr
+    phone: Optional[str] = None
+    company: Optional[str] = None
+    message: str
+    source_page: Optional[str] = Field(None, max_length=200)  # path of the page the visitor came from
+
+class LeadCount(BaseModel):
+    key: str
+    count: int
+
+class LeadStats(BaseModel):
+    start: date = Field(alias="from")
+    end: date = Field(alias="to")
+    total: int
+    all_time: int
+    by_day: List[LeadCount]
+    by_week: List[LeadCount]
+    by_domain: List[LeadCount]
+    by_source: List[LeadCount]
+
+# ============= PAGE SECTION MODELS =============
+class PageSection(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    page_name: str
+    section_name: str
+    section_type: str  # hero, features, timeline, testimonials, etc.
+    content: dict
+    order: float
+    visible: bool = True
+    created_at: datetime
+    updated_at: datetime
+
+class PageSectionCreate(BaseModel):
+    page_name: str
+    section_name: str
+    section_type: str
+    content: dict
+    order: float
+    visible: bool = True
+
+# ============= ORDERING MODELS =============
+class MoveRequest(BaseModel):
+    after_id: Optional[str] = None  # the item it should follow
+    before_id: Optional[str] = None  # the item it should precede
+
+# ============= AI MODELS =============
+class AIContentGenerateRequest(BaseModel):
+    prompt: str
+    content_type: str  # product_description, article, benefits, etc.
+    regenerate: bool = False  # skip the stored result for this prompt
+
+class AIImageGenerateRequest(BaseModel):
+    prompt: str
+    regenerate: bool = False
+
+class AIBatchCreate(BaseModel):
+    target: str  # products, articles
+    fields: List[str]  # e.g. benefits, description, meta_description
+    category: Optional[str] = None  # category id for products, category name for articles
+    only_missing: bool = True  # only fill empty fields
+
+class AIJobCreate(BaseModel):
+    kind: str  # content, image
+    prompt: str
+    content_type: Optional[str] = None  # required for content jobs
+    regenerate: bool = False
+
+# ============= PROFILING MODELS =============
+class ProfilingSettingsUpdate(BaseModel):
+    enabled: bool
+    threshold_ms: int = 500
+    duration_minutes: int = 30
+    routes: Optional[List[str]] = None  # path prefixes, e.g. /api/admin/backup
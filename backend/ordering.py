@@ -0,0 +1,187 @@
+"""Drag-and-drop ordering with fractional keys.
+
+Gallery items, services, categories and page sections are listed by their
+numeric ``order``. Moving an item between two neighbours gives it the
+midpoint of their keys, so a move is a single-document write however long
+the list is. Keys are floats: repeated moves into the same gap halve it
+each time, and when the neighbours leave no room between them the list is
+rebalanced first, rewriting the keys to 0, 1, 2, ... in their current
+order. A background pass every ORDER_REBALANCE_SECONDS does the same for
+lists whose keys have crowded below ORDER_MIN_GAP, or that have ties, so
+moves rarely pay for a rebalance themselves.
+
+Categories are ordered per type and page sections per page; the other
+collections have a single list.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from cache import COLLECTION_NAMESPACES, invalidation_bus
+from ids import encode_id
+from repositories import M, Repository
+
+logger = logging.getLogger(__name__)
+
+ORDER_REBALANCE_SECONDS = float(os.environ.get('ORDER_REBALANCE_SECONDS', '3600'))
+# Gaps below this are rebalanced in the background, well before doubles run out of precision
+ORDER_MIN_GAP = float(os.environ.get('ORDER_MIN_GAP', str(2 ** -20)))
+
+# Ordered collection -> the field whose values each have their own list
+ORDER_SCOPES: Dict[str, Optional[str]] = {
+    "gallery": None,
+    "services": None,
+    "categories": "type",
+    "page_sections": "page_name",
+}
+
+
+def key_between(low: Optional[float], high: Optional[float]) -> Optional[float]:
+    """A key strictly between two neighbours' keys (None for an open end); None when they leave no room"""
+    if low is None and high is None:
+        return 0.0
+    if low is None:
+        return high - 1
+    if high is None:
+        return low + 1
+    key = (low + high) / 2
+    return key if low < key < high else None
+
+
+def crowded(keys: List[float]) -> bool:
+    """Whether sorted keys have ties or gaps too small for many more moves"""
+    return any(b - a < ORDER_MIN_GAP for a, b in zip(keys, keys[1:]))
+
+
+def _scope_query(repository: Repository, item) -> dict:
+    field = ORDER_SCOPES[repository.name]
+    return {field: getattr(item, field)} if field else {}
+
+
+async def rebalance(collection, query: dict) -> int:
+    """Rewrites the keys of one list to 0, 1, 2, ... in their current order; returns how many changed"""
+    # _id breaks ties, so documents sharing a key keep the same relative order every time
+    docs = await collection.find(query, {"order": 1}).sort([("order", 1), ("_id", 1)]).to_list(None)
+    ops = [
+        UpdateOne({"_id": doc["_id"]}, {"$set": {"order": float(position)}})
+        for position, doc in enumerate(docs) if doc.get("order") != position
+    ]
+    if ops:
+        await collection.bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+async def _neighbour_keys(
+    repository: Repository[M],
+    item: M,
+    after_id: Optional[str],
+    before_id: Optional[str]
+) -> Tuple[Optional[float], Optional[float]]:
+    scope = _scope_query(repository, item)
+    neighbours = {}
+    for name, neighbour_id in (("after_id", after_id), ("before_id", before_id)):
+        if neighbour_id is None:
+            continue
+        if neighbour_id == item.id:
+            raise HTTPException(status_code=400, detail=f"{name} cannot be the item being moved")
+        neighbour = await repository.get(neighbour_id)
+        if neighbour is None or _scope_query(repository, neighbour) != scope:
+            raise HTTPException(status_code=400, detail=f"{name} is not in the same list")
+        neighbours[name] = neighbour.order
+
+    low, high = neighbours.get("after_id"), neighbours.get("before_id")
+    # With one neighbour given, the other is whatever sits next to it now
+    others = {"_id": {"$nin": [encode_id(i) for i in (item.id, after_id, before_id) if i]}}
+    if before_id is None:
+        following = await repository.find({**scope, **others, "order": {"$gte": low}}, sort=[("order", 1)], limit=1)
+        high = following[0].order if following else None
+    elif after_id is None:
+        preceding = await repository.find({**scope, **others, "order": {"$lte": high}}, sort=[("order", -1)], limit=1)
+        low = preceding[0].order if preceding else None
+    return low, high
+
+
+async def move(repository: Repository[M], item_id: str, after_id: Optional[str], before_id: Optional[str]) -> Optional[M]:
+    """Places an item just after one item and/or just before another; None when the id is unknown"""
+    if after_id is None and before_id is None:
+        raise HTTPException(status_code=400, detail="Give after_id or before_id")
+    item = await repository.get(item_id)
+    if item is None:
+        return None
+
+    namespace = COLLECTION_NAMESPACES[repository.name]
+    low, high = await _neighbour_keys(repository, item, after_id, before_id)
+    if after_id is not None and before_id is not None and low > high:
+        raise HTTPException(status_code=409, detail="after_id must come before before_id")
+    key = key_between(low, high)
+    if key is None:
+        # Only ties or a worn-out gap leave no room; spread the list out and look again
+        await rebalance(repository.collection, _scope_query(repository, item))
+        await invalidation_bus.publish(namespace)
+        low, high = await _neighbour_keys(repository, item, after_id, before_id)
+        key = key_between(low, high)
+        if key is None:
+            raise HTTPException(status_code=409, detail="after_id must come before before_id")
+
+    moved = await repository.update(item_id, {"order": key, "updated_at": datetime.now(timezone.utc).isoformat()})
+    await invalidation_bus.publish(namespace, item_id)
+    return moved
+
+
+class Rebalancer:
+    """Periodically spreads out lists whose keys have crowded"""
+
+    def __init__(self):
+        self.db = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, db) -> None:
+        self.db = db
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def rebalance_crowded(self) -> int:
+        """Rebalances every crowded list; returns how many were"""
+        rebalanced = 0
+        for name, field in ORDER_SCOPES.items():
+            collection = self.db[name]
+            projection = {"order": 1, field: 1} if field else {"order": 1}
+            lists: Dict[Optional[str], List[float]] = {}
+            async for doc in collection.find({}, projection).sort("order", 1):
+                lists.setdefault(doc.get(field) if field else None, []).append(doc.get("order") or 0)
+            changed = False
+            for value, keys in lists.items():
+                if crowded(keys):
+                    await rebalance(collection, {field: value} if field else {})
+                    rebalanced += 1
+                    changed = True
+            if changed:
+                await invalidation_bus.publish(COLLECTION_NAMESPACES[name])
+        return rebalanced
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(ORDER_REBALANCE_SECONDS)
+            try:
+                rebalanced = await self.rebalance_crowded()
+                if rebalanced:
+                    logger.info("Rebalanced the order keys of %d lists", rebalanced)
+            except PyMongoError as e:
+                logger.warning("Order rebalancing failed: %s", e)
+
+
+rebalancer = Rebalancer()
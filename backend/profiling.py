@@ -0,0 +1,334 @@
+import asyncio
+import contextvars
+import functools
+import hmac
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import bson
+from pymongo import monitoring
+
+from cache import cache
+from resilience import mongo_breaker
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = Path(os.environ.get('PROFILE_DIR', Path(__file__).parent / 'profiles'))
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+PROFILE_HEADER = "x-profile"
+PROFILE_SAMPLE_INTERVAL = int(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', '5')) / 1000
+PROFILE_THRESHOLD_MS = int(os.environ.get('PROFILE_THRESHOLD_MS', '500'))
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', '200'))
+
+# Command fields that hold the filter or pipeline, by command name
+FILTER_FIELDS = {
+    "find": "filter",
+    "aggregate": "pipeline",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+
+
+def _thread_stack(frame) -> List[str]:
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _await_stack(coro) -> List[str]:
+    """Chain of coroutines a suspended task is waiting in, outermost first"""
+    stack = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            stack.append(f"<{type(coro).__name__}>")
+            break
+        stack.append(_frame_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return stack
+
+
+class RequestProfile:
+    """Stack samples and Mongo commands captured for one request"""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route = path
+        self.task = asyncio.current_task()
+        self.loop = asyncio.get_running_loop()
+        self.thread_id = threading.get_ident()
+        self.started_at = datetime.now(timezone.utc)
+        self.samples: Counter = Counter()
+        self.commands: List[dict] = []
+        self._pending: Dict[int, dict] = {}
+        self._lock = threading.Lock()
+
+    def sample(self, frames: dict) -> None:
+        if self.task is None or self.task.done():
+            return
+        if asyncio.current_task(self.loop) is self.task:
+            # Running on the loop thread right now: on-CPU sample
+            stack = _thread_stack(frames.get(self.thread_id))
+        else:
+            # Suspended: record what the handler is awaiting
+            stack = _await_stack(self.task.get_coro()) + ["[awaiting]"]
+        if stack:
+            self.samples[";".join(stack)] += 1
+
+    def command_started(self, event) -> None:
+        field = FILTER_FIELDS.get(event.command_name)
+        if field:
+            query = event.command.get(field)
+        elif event.command_name in ("update", "delete"):
+            statements = event.command.get(event.command_name + "s", [])
+            query = [statement.get("q") for statement in statements]
+        else:
+            query = None
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = event.command.get("collection")
+        with self._lock:
+            self._pending[event.request_id] = {
+                "command": event.command_name,
+                "collection": collection,
+                "filter": query,
+                "bytes_sent": len(bson.encode(event.command)),
+            }
+
+    def command_finished(self, event, failure: Optional[str] = None) -> None:
+        with self._lock:
+            record = self._pending.pop(event.request_id, {"command": event.command_name})
+        record["duration_ms"] = event.duration_micros / 1000
+        if failure is not None:
+            record["error"] = failure
+        else:
+            reply = event.reply
+            cursor = reply.get("cursor") or {}
+            batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+            record["docs_returned"] = len(batch) if batch is not None else reply.get("n")
+            record["bytes_received"] = len(bson.encode(reply))
+        with self._lock:
+            self.commands.append(record)
+
+    def folded(self) -> str:
+        """Collapsed stacks, one per line, as consumed by flamegraph.pl and speedscope"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+current_profile: contextvars.ContextVar[Optional[RequestProfile]] = contextvars.ContextVar("current_profile", default=None)
+
+
+class StackSampler:
+    """One background thread sampling every request currently being profiled"""
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self._profiles = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.add(profile)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+
+    def remove(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.discard(profile)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                profiles = list(self._profiles)
+                if not profiles:
+                    self._thread = None
+                    return
+            frames = sys._current_frames()
+            for profile in profiles:
+                try:
+                    profile.sample(frames)
+                except Exception:
+                    # The sampled task may change under us; skip this tick
+                    pass
+            time.sleep(self.interval)
+
+
+sampler = StackSampler()
+
+
+class ProfilingCommandListener(monitoring.CommandListener):
+    """Captures the filter, result size and timing of commands from profiled requests"""
+
+    def started(self, event):
+        profile = current_profile.get()
+        if profile is not None:
+            profile.command_started(event)
+
+    def succeeded(self, event):
+        profile = current_profile.get()
+        if profile is not None:
+            profile.command_finished(event)
+
+    def failed(self, event):
+        profile = current_profile.get()
+        if profile is not None:
+            profile.command_finished(event, failure=str(event.failure))
+
+
+profiling_listener = ProfilingCommandListener()
+
+
+def _should_profile(settings: dict, path: str) -> bool:
+    if not settings.get("enabled"):
+        return False
+    expires_at = settings.get("expires_at")
+    if expires_at and datetime.fromisoformat(expires_at) < datetime.now(timezone.utc):
+        return False
+    routes = settings.get("routes")
+    return not routes or any(path.startswith(prefix) for prefix in routes)
+
+
+def write_profile(profile: RequestProfile, duration_ms: float, status: int) -> str:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    route = re.sub(r"[^A-Za-z0-9]+", "_", profile.route).strip("_") or "root"
+    name = f"{profile.started_at.strftime('%Y%m%d_%H%M%S_%f')}_{profile.method}_{route}_{int(duration_ms)}ms"
+    (PROFILE_DIR / f"{name}.folded").write_text(profile.folded())
+    report = {
+        "method": profile.method,
+        "path": profile.path,
+        "route": profile.route,
+        "status": status,
+        "started_at": profile.started_at.isoformat(),
+        "duration_ms": duration_ms,
+        "samples": sum(profile.samples.values()),
+        "sample_interval_ms": sampler.interval * 1000,
+        "mongo": {
+            "commands": len(profile.commands),
+            "duration_ms": sum(c.get("duration_ms", 0) for c in profile.commands),
+            "bytes_received": sum(c.get("bytes_received", 0) for c in profile.commands),
+        },
+        "commands": profile.commands,
+    }
+    (PROFILE_DIR / f"{name}.json").write_text(json.dumps(report, indent=2, default=str))
+    _prune_profiles()
+    return name
+
+
+def _prune_profiles() -> None:
+    reports = sorted(PROFILE_DIR.glob("*.json"))
+    for report in reports[:max(0, len(reports) - PROFILE_MAX_FILES)]:
+        report.unlink(missing_ok=True)
+        report.with_suffix(".folded").unlink(missing_ok=True)
+
+
+def list_profiles() -> List[dict]:
+    if not PROFILE_DIR.exists():
+        return []
+    profiles = []
+    for report in sorted(PROFILE_DIR.glob("*.json"), reverse=True):
+        try:
+            data = json.loads(report.read_text())
+        except (OSError, ValueError):
+            continue
+        profiles.append({
+            "name": report.stem,
+            "method": data.get("method"),
+            "route": data.get("route"),
+            "status": data.get("status"),
+            "duration_ms": data.get("duration_ms"),
+            "mongo_commands": data.get("mongo", {}).get("commands"),
+            "started_at": data.get("started_at"),
+        })
+    return profiles
+
+
+def profile_path(name: str, suffix: str) -> Optional[Path]:
+    if not re.fullmatch(r"[A-Za-z0-9_]+", name) or suffix not in ("json", "folded"):
+        return None
+    path = PROFILE_DIR / f"{name}.{suffix}"
+    return path if path.exists() else None
+
+
+async def get_profiling_settings(db) -> dict:
+    """The admin profiling switch, cached until it changes"""
+    async def load_profiling_settings():
+        return await db.profiling_settings.find_one({}, {"_id": 0}) or {}
+
+    # Checked on every request, so an outage must not make each one wait for Mongo
+    settings, _ = await cache.get_or_revalidate("profiling", "", functools.partial(mongo_breaker.call, load_profiling_settings))
+    return settings
+
+
+class ProfilingMiddleware:
+    """Profiles requests enabled by header token or by the admin profiling switch.
+
+    Requests carrying ``X-Profile: <PROFILE_TOKEN>`` are always written to
+    PROFILE_DIR; requests picked up by the admin switch only when slower than
+    its threshold.
+    """
+
+    def __init__(self, app, settings_loader: Callable[[], Awaitable[dict]]):
+        self.app = app
+        self.settings_loader = settings_loader
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        header_value = headers.get(PROFILE_HEADER.encode())
+        try:
+            settings = await self.settings_loader()
+        except Exception as e:
+            logger.warning("Could not load profiling settings: %s", e)
+            settings = {}
+        by_header = bool(PROFILE_TOKEN and header_value and hmac.compare_digest(header_value, PROFILE_TOKEN.encode()))
+        if not by_header and not _should_profile(settings, scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope.get("method", ""), scope["path"])
+        token = current_profile.set(profile)
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        sampler.add(profile)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            sampler.remove(profile)
+            current_profile.reset(token)
+            route = scope.get("route")
+            profile.route = getattr(route, "path", None) or scope["path"]
+            threshold = 0 if by_header else settings.get("threshold_ms", PROFILE_THRESHOLD_MS)
+            if duration_ms >= threshold:
+                name = await asyncio.to_thread(write_profile, profile, duration_ms, status[0])
+                logger.info("Wrote profile %s for %s %s (%.0f ms)", name, profile.method, profile.path, duration_ms)
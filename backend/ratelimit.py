@@ -0,0 +1,168 @@
+import hashlib
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone, timedelta
+from typing import Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from metrics import rate_limit_rejections
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')  # memory, mongo
+RATE_LIMIT_COLLECTION = "rate_limits"
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, rule: str, retry_after: float):
+        super().__init__(f"Rate limit {rule} exceeded")
+        self.rule = rule
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class Rule:
+    """Token bucket holding up to ``count`` requests, refilled at count per period"""
+
+    def __init__(self, name: str, spec: str):
+        count, _, period = spec.partition("/")
+        self.name = name
+        self.capacity = int(count)
+        self.period = PERIODS[period.strip()]
+        self.rate = self.capacity / self.period
+
+
+def _rule(name: str, env: str, default: str) -> Rule:
+    return Rule(name, os.environ.get(env, default))
+
+
+CONTACT_PER_IP = _rule("contact_ip", 'RATE_LIMIT_CONTACT_IP', '5/minute')
+CONTACT_PER_EMAIL = _rule("contact_email", 'RATE_LIMIT_CONTACT_EMAIL', '3/hour')
+LOGIN_PER_IP = _rule("login_ip", 'RATE_LIMIT_LOGIN_IP', '20/minute')
+LOGIN_PER_EMAIL = _rule("login_email", 'RATE_LIMIT_LOGIN_EMAIL', '5/minute')
+REGISTER_PER_IP = _rule("register_ip", 'RATE_LIMIT_REGISTER_IP', '5/hour')
+
+
+# Peers already reported for sending X-Forwarded-For without being trusted
+_untrusted_proxies = set()
+
+
+def client_ip(request) -> Optional[str]:
+    """The client's address, which uvicorn takes from X-Forwarded-For only for peers in FORWARDED_ALLOW_IPS"""
+    if request.client is None:
+        return None
+    host = request.client.host
+    forwarded = request.headers.get("x-forwarded-for")
+    # A trusted proxy's client is one of the forwarded addresses; otherwise this is the proxy itself
+    if forwarded and host not in {part.strip() for part in forwarded.split(",")} and host not in _untrusted_proxies:
+        _untrusted_proxies.add(host)
+        logger.error(
+            "X-Forwarded-For from untrusted peer %s; add it to FORWARDED_ALLOW_IPS, "
+            "or every client behind it shares its rate limits", host
+        )
+    return host
+
+
+class MemoryBackend:
+    """Buckets held by this worker; limits apply per process"""
+
+    MAX_KEYS = 100_000
+
+    def __init__(self):
+        # Least recently used first, so the cap evicts the longest idle bucket in constant time
+        self._buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+
+    async def start(self, db) -> None:
+        pass
+
+    async def consume(self, key: str, rule: Rule, now: float) -> float:
+        """Take one token; returns 0 when allowed, else seconds until a token is available"""
+        bucket = self._buckets.pop(key, None)
+        tokens, updated = bucket if bucket is not None else (rule.capacity, now)
+        tokens = min(rule.capacity, tokens + (now - updated) * rule.rate)
+        while len(self._buckets) >= self.MAX_KEYS:
+            self._buckets.popitem(last=False)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+        self._buckets[key] = (tokens, now)
+        return (1 - tokens) / rule.rate
+
+
+class MongoBackend:
+    """Buckets shared by every worker, updated with compare-and-set"""
+
+    ATTEMPTS = 5
+
+    def __init__(self):
+        self.db = None
+
+    async def start(self, db) -> None:
+        self.db = db
+        try:
+            await db[RATE_LIMIT_COLLECTION].create_index("key", unique=True)
+            await db[RATE_LIMIT_COLLECTION].create_index("expire_at", expireAfterSeconds=0)
+        except PyMongoError as e:
+            logger.warning("Could not create rate limit indexes: %s", e)
+
+    async def consume(self, key: str, rule: Rule, now: float) -> float:
+        collection = self.db[RATE_LIMIT_COLLECTION]
+        # Drop the bucket once it would have refilled completely
+        expire_at = datetime.now(timezone.utc) + timedelta(seconds=rule.period)
+        for _ in range(self.ATTEMPTS):
+            bucket = await collection.find_one({"key": key}, {"_id": 0})
+            if bucket is None:
+                try:
+                    await collection.insert_one({"key": key, "tokens": rule.capacity - 1, "updated": now, "expire_at": expire_at})
+                    return 0.0
+                except DuplicateKeyError:
+                    continue
+            tokens = min(rule.capacity, bucket["tokens"] + (now - bucket["updated"]) * rule.rate)
+            allowed = tokens >= 1
+            result = await collection.update_one(
+                {"key": key, "tokens": bucket["tokens"], "updated": bucket["updated"]},
+                {"$set": {"tokens": tokens - 1 if allowed else tokens, "updated": now, "expire_at": expire_at}}
+            )
+            if result.matched_count:
+                return 0.0 if allowed else (1 - tokens) / rule.rate
+        # Constant contention on one key is itself a flood
+        return 1.0
+
+
+class RateLimiter:
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def start(self, db) -> None:
+        await self.backend.start(db)
+
+    async def hit(self, rule: Rule, identity: Optional[str]) -> None:
+        """Count a request against rule for identity, raising RateLimitExceeded when over"""
+        if not RATE_LIMIT_ENABLED or not identity:
+            return
+        # Emails and IPs are stored hashed
+        digest = hashlib.sha256(identity.strip().lower().encode("utf-8")).hexdigest()[:32]
+        try:
+            retry_after = await self.backend.consume(f"{rule.name}:{digest}", rule, time.time())
+        except PyMongoError as e:
+            # Fail open: a limiter outage should not take the contact form down
+            logger.warning("Rate limit check failed for %s: %s", rule.name, e)
+            return
+        if retry_after > 0:
+            rate_limit_rejections.inc(rule.name)
+            raise RateLimitExceeded(rule.name, retry_after)
+
+
+def create_backend(name: str = RATE_LIMIT_BACKEND):
+    if name == "mongo":
+        return MongoBackend()
+    return MemoryBackend()
+
+
+rate_limiter = RateLimiter(create_backend())
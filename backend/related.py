@@ -0,0 +1,264 @@
+"""Related products and articles, precomputed from their text.
+
+Every product (name, description, key ingredients, benefits) and every
+published article (title, excerpt, content without markup) becomes a
+TF-IDF vector. Cosine similarities are computed in row batches with NumPy
+matrix products, and each document stores the ids of its RELATED_TOP_K
+most similar documents in its own collection as ``related_ids``. The
+``/related`` endpoints then only read those ids and the documents they
+name.
+
+On workers serving the products or articles routers, ``related_indexer``
+rebuilds a collection RELATED_DEBOUNCE_SECONDS after writes to it, and
+once at startup, writing only documents whose neighbours changed. Every
+such worker hears about writes through the invalidation bus, but only the
+one holding the collection's lease in RELATED_LEASES_COLLECTION rebuilds
+it; the others skip, since the holder heard of the same writes. The
+invalidation a rebuild publishes for its own writes schedules nothing on
+the worker that published it, and the other workers hear it as a write,
+so a rebuild also records a hash of the texts it read in the lease and
+skips the computation while they are unchanged. ``python related.py``
+rebuilds everything offline. NumPy is an optional dependency, imported in
+a worker thread on first build; without it nothing is built and the
+endpoints return empty lists.
+"""
+import asyncio
+import contextvars
+import hashlib
+import logging
+import math
+import os
+import re
+import socket
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from cache import COLLECTION_NAMESPACES, invalidation_bus
+from database import DB_NAME, create_client
+from ids import decode_id
+
+logger = logging.getLogger(__name__)
+
+RELATED_TOP_K = int(os.environ.get('RELATED_TOP_K', '6'))
+RELATED_DEBOUNCE_SECONDS = float(os.environ.get('RELATED_DEBOUNCE_SECONDS', '10'))
+# Pairs less similar than this are not worth showing
+RELATED_MIN_SCORE = float(os.environ.get('RELATED_MIN_SCORE', '0.05'))
+# Caps the vectors at the terms shared by the most documents, to bound memory on large collections
+RELATED_MAX_TERMS = int(os.environ.get('RELATED_MAX_TERMS', '20000'))
+# Rows of the similarity matrix computed at once
+RELATED_BATCH_SIZE = 512
+# A rebuild renews its lease every third of this; a worker that dies mid-rebuild holds it at most this long
+RELATED_LEASE_SECONDS = float(os.environ.get('RELATED_LEASE_SECONDS', '60'))
+RELATED_LEASES_COLLECTION = "related_leases"
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Set while the indexer rebuilds, so the invalidation it publishes does not schedule another rebuild
+rebuilding: contextvars.ContextVar[bool] = contextvars.ContextVar("related_rebuilding", default=False)
+
+# Collection -> text fields, and a field that must be true for a document to take part
+RELATED_SOURCES: Dict[str, Tuple[Tuple[str, ...], Optional[str]]] = {
+    "products": (("name", "description", "key_ingredients", "benefits"), None),
+    "articles": (("title", "excerpt", "content"), "published"),
+}
+
+MARKUP = re.compile(r"<[^>]+>")
+WORD = re.compile(r"[^\W\d_]{3,}")
+# Common English and Indonesian words, which would otherwise link unrelated texts
+STOP_WORDS = frozenset("""
+    and are but can for from has have into its more not our that the their them then these this
+    those was were what when which while who will with you your
+    adalah akan anda atau bagi bahwa dalam dan dari dengan juga kami karena oleh pada para sangat
+    serta tersebut untuk yang
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in WORD.findall(MARKUP.sub(" ", text).lower()) if word not in STOP_WORDS]
+
+
+def nearest_neighbours(texts: Sequence[str], top_k: int = RELATED_TOP_K) -> List[List[int]]:
+    """For each text, the indexes of the most similar other texts, most similar first"""
+    import numpy as np  # optional, and slow to import; callers run this in a thread
+
+    n = len(texts)
+    if n < 2 or top_k < 1:
+        return [[] for _ in texts]
+    term_counts = [Counter(tokenize(text)) for text in texts]
+    document_frequency = Counter(term for counts in term_counts for term in counts)
+    idf = {term: math.log((1 + n) / (1 + df)) + 1 for term, df in document_frequency.items()}
+    # Terms found in one document add nothing to any similarity, only to its norm
+    shared = [term for term, df in document_frequency.most_common(RELATED_MAX_TERMS) if df > 1]
+    columns = {term: i for i, term in enumerate(shared)}
+
+    vectors = np.zeros((n, len(shared)), dtype=np.float32)
+    for row, counts in enumerate(term_counts):
+        weights = {term: (1 + math.log(tf)) * idf[term] for term, tf in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        for term, weight in weights.items():
+            column = columns.get(term)
+            if column is not None:
+                vectors[row, column] = weight / norm
+
+    k = min(top_k, n - 1)
+    neighbours = []
+    for start in range(0, n, RELATED_BATCH_SIZE):
+        scores = vectors[start:start + RELATED_BATCH_SIZE] @ vectors.T
+        rows = np.arange(scores.shape[0])
+        scores[rows, start + rows] = -1  # not related to itself
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        ranked = np.take_along_axis(top, np.argsort(-top_scores, axis=1, kind="stable"), axis=1)
+        for row, indexes in zip(rows, ranked):
+            neighbours.append([int(i) for i in indexes if scores[row, i] >= RELATED_MIN_SCORE])
+    return neighbours
+
+
+def source_hash(ids: Sequence[str], texts: Sequence[str]) -> str:
+    """Identifies the inputs of a rebuild, settings included"""
+    digest = hashlib.sha256()
+    for part in (str(RELATED_TOP_K), str(RELATED_MIN_SCORE), str(RELATED_MAX_TERMS), *ids, *texts):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+async def rebuild(db, name: str) -> int:
+    """Recomputes related_ids across one collection; returns how many documents changed"""
+    fields, required = RELATED_SOURCES[name]
+    projection = {field: 1 for field in (*fields, "related_ids", required) if field}
+    docs = await db[name].find({}, projection).to_list(None)
+    candidates = [doc for doc in docs if not required or doc.get(required)]
+    texts = [" ".join(str(doc.get(field) or "") for field in fields) for doc in candidates]
+    ids = [decode_id(doc["_id"]) for doc in candidates]
+    source = source_hash(ids, texts)
+    if await db[RELATED_LEASES_COLLECTION].find_one({"_id": name, "source_hash": source}, {"_id": 1}):
+        return 0
+    neighbours = await asyncio.to_thread(nearest_neighbours, texts)
+
+    related = {item_id: [ids[i] for i in indexes] for item_id, indexes in zip(ids, neighbours)}
+    ops = []
+    for doc in docs:
+        # Documents left out, such as unpublished articles, have no related items
+        related_ids = related.get(decode_id(doc["_id"]), [])
+        if doc.get("related_ids", []) != related_ids:
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"related_ids": related_ids}}))
+    if ops:
+        await db[name].bulk_write(ops, ordered=False)
+    # Recorded before publishing, so the rebuilds that publication schedules find it
+    await db[RELATED_LEASES_COLLECTION].update_one({"_id": name}, {"$set": {"source_hash": source}}, upsert=True)
+    if ops:
+        await invalidation_bus.publish(COLLECTION_NAMESPACES[name])
+    return len(ops)
+
+
+class RelatedIndexer:
+    """Keeps related_ids current as products and articles change"""
+
+    def __init__(self):
+        self.db = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Collections written to while their rebuild was running
+        self._dirty = set()
+
+    async def start(self, db) -> None:
+        self.db = db
+        invalidation_bus.add_listener(self.on_change)
+        for name in RELATED_SOURCES:
+            self._schedule(name)
+
+    async def stop(self) -> None:
+        invalidation_bus.remove_listener(self.on_change)
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+
+    async def on_change(self, namespace: str, doc_id: Optional[str]) -> None:
+        if namespace in RELATED_SOURCES and not rebuilding.get():
+            self._schedule(namespace)
+
+    def _schedule(self, name: str) -> None:
+        task = self._tasks.get(name)
+        if task is None or task.done():
+            self._tasks[name] = asyncio.create_task(self._rebuild_later(name))
+        else:
+            self._dirty.add(name)
+
+    async def _rebuild_later(self, name: str) -> None:
+        while True:
+            # Let a burst of edits settle into one rebuild
+            await asyncio.sleep(RELATED_DEBOUNCE_SECONDS)
+            self._dirty.discard(name)
+            try:
+                changed = await self._rebuild_leased(name)
+                if changed:
+                    logger.info("Related %s rebuilt: %d documents changed", name, changed)
+            except ImportError:
+                logger.warning("NumPy is not installed; related %s are not computed", name)
+                return
+            except PyMongoError as e:
+                logger.warning("Could not rebuild related %s: %s", name, e)
+            if name not in self._dirty:
+                return
+
+    async def _rebuild_leased(self, name: str) -> Optional[int]:
+        """Rebuilds when this worker can take the collection's lease; None when another worker holds it"""
+        now = datetime.now(timezone.utc)
+        try:
+            # Inserts the lease the first time; a duplicate key means another worker holds it
+            await self.db[RELATED_LEASES_COLLECTION].find_one_and_update(
+                {"_id": name, "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}, {"owner": WORKER_ID}]},
+                {"$set": {"lease_until": now + timedelta(seconds=RELATED_LEASE_SECONDS), "owner": WORKER_ID}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return None
+        heartbeat = asyncio.create_task(self._heartbeat(name))
+        # Only this task's own publication sees the flag; writes arrive in other tasks
+        token = rebuilding.set(True)
+        try:
+            return await rebuild(self.db, name)
+        finally:
+            rebuilding.reset(token)
+            heartbeat.cancel()
+            try:
+                await self.db[RELATED_LEASES_COLLECTION].update_one(
+                    {"_id": name, "owner": WORKER_ID}, {"$set": {"lease_until": None}}
+                )
+            except PyMongoError as e:
+                logger.warning("Could not release the related %s lease: %s", name, e)
+
+    async def _heartbeat(self, name: str) -> None:
+        while True:
+            await asyncio.sleep(RELATED_LEASE_SECONDS / 3)
+            try:
+                await self.db[RELATED_LEASES_COLLECTION].update_one(
+                    {"_id": name, "owner": WORKER_ID},
+                    {"$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=RELATED_LEASE_SECONDS)}}
+                )
+            except PyMongoError as e:
+                logger.warning("Could not renew the related %s lease: %s", name, e)
+
+
+related_indexer = RelatedIndexer()
+
+
+async def rebuild_all():
+    """Recompute related products and articles"""
+    client = create_client()
+    db = client[DB_NAME]
+
+    for name in RELATED_SOURCES:
+        changed = await rebuild(db, name)
+        print(f"✅ {name}: updated related items on {changed} documents")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_all())
@@ -0,0 +1,223 @@
+"""Typed data access, one repository per collection.
+
+A repository owns how its collection is read: the projection, decoding of
+stored values (timestamps are kept as ISO strings) into its model,
+batched lookups and facet counts. It only uses the Motor collection API,
+so the in-memory engine in memory_db (``MONGO_URL=memory://``) runs every
+repository unchanged, without a MongoDB server. Ids are stored as the ``_id`` (see
+ids.py) and returned as ``id``.
+
+Repositories are route dependencies, ``Depends(ProductRepository)``, and
+can be built directly from a database elsewhere: ``ProductRepository(db)``.
+"""
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from fastapi import Depends
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+
+from database import get_db
+from ids import from_document, id_filter, ids_filter, to_document
+from models import (
+    Article, ArticleSummary, Category, Client, ContactLead, GalleryItem, PageSection, Product, Review, Service, User
+)
+
+M = TypeVar("M", bound=BaseModel)
+
+DEFAULT_LIMIT = 1000
+
+
+class Repository(Generic[M]):
+    name: str
+    model: Type[M]
+    # Stored as ISO strings, returned as datetimes
+    date_fields: Tuple[str, ...] = ("created_at", "updated_at")
+    projection: Optional[dict] = None
+    # Facet name -> the field it counts and a field with a display label for its values
+    facets: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    def __init__(self, db: AsyncIOMotorDatabase = Depends(get_db)):
+        self.collection = db[self.name]
+
+    def decode(self, doc: dict) -> M:
+        from_document(doc)
+        for field in self.date_fields:
+            if isinstance(doc.get(field), str):
+                doc[field] = datetime.fromisoformat(doc[field])
+        return self.model(**doc)
+
+    async def get(self, item_id: str) -> Optional[M]:
+        return await self.find_one(id_filter(item_id))
+
+    async def get_by_id_or_slug(self, key: str) -> Optional[M]:
+        return await self.get(key) or await self.find_one({"slug": key})
+
+    async def find_one(self, query: dict) -> Optional[M]:
+        doc = await self.collection.find_one(query, self.projection)
+        return self.decode(doc) if doc else None
+
+    async def get_many(self, ids: Sequence[str]) -> List[M]:
+        """Documents for several ids in one query, in the order asked; unknown ids are skipped"""
+        if not ids:
+            return []
+        docs = await self.collection.find(ids_filter(ids), self.projection).to_list(len(ids))
+        by_id = {item.id: item for item in map(self.decode, docs)}
+        return [by_id[item_id] for item_id in ids if item_id in by_id]
+
+    async def find(
+        self,
+        query: Optional[dict] = None,
+        sort: Optional[List[Tuple[str, int]]] = None,
+        limit: Optional[int] = DEFAULT_LIMIT
+    ) -> List[M]:
+        cursor = self.collection.find(query or {}, self.projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        return [self.decode(doc) for doc in await cursor.to_list(limit)]
+
+    async def exists(self, query: dict) -> bool:
+        return await self.collection.find_one(query, {"_id": 1}) is not None
+
+    async def insert(self, doc: dict) -> M:
+        await self.collection.insert_one(to_document(doc))
+        return self.decode(doc)
+
+    async def update(self, item_id: str, fields: dict) -> Optional[M]:
+        """Set fields and return the updated document in one round trip; None when the id is unknown"""
+        doc = await self.collection.find_one_and_update(
+            id_filter(item_id), {"$set": fields},
+            projection=self.projection, return_document=ReturnDocument.AFTER
+        )
+        return self.decode(doc) if doc else None
+
+    async def update_many(self, query: dict, fields: dict) -> int:
+        result = await self.collection.update_many(query, {"$set": fields})
+        return result.modified_count
+
+    async def delete(self, item_id: str) -> bool:
+        result = await self.collection.delete_one(id_filter(item_id))
+        return result.deleted_count > 0
+
+    async def distinct(self, field: str, query: Optional[dict] = None) -> List[Any]:
+        return await self.collection.distinct(field, query or {})
+
+    def facet_query(self, filters: Dict[str, Any], skip: Optional[str] = None) -> dict:
+        """Query for facet filters (facet name -> chosen value), leaving out one facet"""
+        return {self.facets[name][0]: value for name, value in filters.items() if name != skip}
+
+    async def facet_counts(self, filters: Dict[str, Any]) -> Dict[str, List[dict]]:
+        """Documents per value of each facet, in one $facet aggregation.
+
+        Each facet is counted under every filter but its own, so a filter
+        sidebar shows how many documents choosing another value would give.
+        """
+        stages = {}
+        for name, (field, label) in self.facets.items():
+            counts = [{"$match": self.facet_query(filters, skip=name)}]
+            if "." in field:
+                # A field of subdocuments in an array: count each document once per value
+                counts += [
+                    {"$unwind": "$" + field.split(".")[0]},
+                    {"$group": {"_id": {"doc": "$_id", "value": "$" + field}}},
+                    {"$group": {"_id": "$_id.value", "count": {"$sum": 1}}},
+                ]
+            else:
+                group = {"_id": "$" + field, "count": {"$sum": 1}}
+                if label:
+                    group["label"] = {"$first": "$" + label}
+                counts.append({"$group": group})
+            counts.append({"$sort": {"count": -1, "_id": 1}})
+            stages[name] = counts
+        result = (await self.collection.aggregate([{"$facet": stages}]).to_list(1))[0]
+        return {
+            name: [{"value": row["_id"], "label": row.get("label"), "count": row["count"]} for row in result[name]]
+            for name in self.facets
+        }
+
+
+class ProductRepository(Repository[Product]):
+    name = "products"
+    model = Product
+    facets = {
+        "category_id": ("category_id", "category_name"),
+        "featured": ("featured", None),
+        "document_type": ("documents.type", None),
+    }
+
+
+class ArticleRepository(Repository[Article]):
+    name = "articles"
+    model = Article
+
+
+class ArticleSummaryRepository(Repository[ArticleSummary]):
+    name = "articles"
+    model = ArticleSummary
+    # Lists never read the body or its rendering
+    projection = {"content": 0, "content_html": 0, "toc": 0}
+
+
+class GalleryRepository(Repository[GalleryItem]):
+    name = "gallery"
+    model = GalleryItem
+    facets = {
+        "category": ("category", None),
+        "featured": ("featured", None),
+    }
+
+
+class ServiceRepository(Repository[Service]):
+    name = "services"
+    model = Service
+
+
+class ClientRepository(Repository[Client]):
+    name = "clients"
+    model = Client
+    date_fields = ("created_at",)
+
+
+class ReviewRepository(Repository[Review]):
+    name = "reviews"
+    model = Review
+    date_fields = ("created_at",)
+
+
+class CategoryRepository(Repository[Category]):
+    name = "categories"
+    model = Category
+
+    def decode(self, doc: dict) -> Category:
+        # Early categories were stored without a type or updated_at
+        doc.setdefault("type", "")
+        doc.setdefault("updated_at", doc.get("created_at"))
+        return super().decode(doc)
+
+
+class PageSectionRepository(Repository[PageSection]):
+    name = "page_sections"
+    model = PageSection
+
+
+class LeadRepository(Repository[ContactLead]):
+    name = "contact_leads"
+    model = ContactLead
+    date_fields = ("created_at",)
+
+
+class UserRepository(Repository[User]):
+    name = "users"
+    model = User
+    date_fields = ("created_at",)
+    # Password hashes never leave the repository except through credentials()
+    projection = {"password": 0}
+
+    async def credentials(self, email: str) -> Optional[Tuple[User, str]]:
+        """The user with this email and their password hash"""
+        doc = await self.collection.find_one({"email": email})
+        if not doc:
+            return None
+        password = doc.pop("password")
+        return self.decode(doc), password
@@ -0,0 +1,103 @@
+"""Timeouts and a circuit breaker for the public reads that depend on Mongo.
+
+Cached public responses load through ``mongo_breaker.call``. Each load is
+bounded by MONGO_READ_TIMEOUT_SECONDS. After MONGO_BREAKER_FAILURES
+consecutive timeouts or connection failures the breaker opens, and for
+MONGO_BREAKER_RESET_SECONDS loads fail at once instead of queueing on a
+struggling server. Then one probe load is let through: success closes the
+breaker, failure opens it again. Every failure surfaces as
+``MongoUnavailable``, which the cache answers with its last good response
+(see ``LocalCache.get_or_revalidate``) and the app otherwise turns into a
+503 with Retry-After.
+"""
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
+
+from metrics import mongo_circuit_open, mongo_circuit_trips
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MONGO_READ_TIMEOUT = float(os.environ.get('MONGO_READ_TIMEOUT_SECONDS', '2'))
+MONGO_BREAKER_FAILURES = int(os.environ.get('MONGO_BREAKER_FAILURES', '5'))
+MONGO_BREAKER_RESET_SECONDS = float(os.environ.get('MONGO_BREAKER_RESET_SECONDS', '30'))
+
+# Failures that say the server is slow or unreachable, rather than that a query is wrong
+UNAVAILABLE_ERRORS = (asyncio.TimeoutError, ConnectionFailure, ExecutionTimeout)
+
+
+class MongoUnavailable(Exception):
+    """A read could not reach Mongo in time, or the circuit breaker is open"""
+
+    def __init__(self, reason: str, retry_after: int = 1):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = MONGO_BREAKER_FAILURES,
+        reset_timeout: float = MONGO_BREAKER_RESET_SECONDS,
+        timeout: float = MONGO_READ_TIMEOUT
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.timeout = timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def _retry_after(self) -> int:
+        remaining = self.reset_timeout - (time.monotonic() - self.opened_at) if self.opened_at is not None else 0
+        return max(1, math.ceil(remaining))
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        state = self.state
+        if state == "open" or (state == "half_open" and self._probing):
+            raise MongoUnavailable(f"{self.name} circuit open", self._retry_after())
+        probe = state == "half_open"
+        self._probing = self._probing or probe
+        try:
+            result = await asyncio.wait_for(func(), self.timeout)
+        except UNAVAILABLE_ERRORS as e:
+            self._failure(probe)
+            raise MongoUnavailable(f"{self.name} unavailable: {e!r}", self._retry_after()) from e
+        finally:
+            if probe:
+                self._probing = False
+        self._success()
+        return result
+
+    def _failure(self, probe: bool) -> None:
+        self.failures += 1
+        if probe or (self.opened_at is None and self.failures >= self.failure_threshold):
+            self.opened_at = time.monotonic()
+            mongo_circuit_open.set(self.name, value=1)
+            mongo_circuit_trips.inc(self.name)
+            logger.warning("%s circuit opened after %d consecutive failures", self.name, self.failures)
+
+    def _success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("%s circuit closed", self.name)
+            mongo_circuit_open.set(self.name, value=0)
+        self.failures = 0
+        self.opened_at = None
+
+
+mongo_breaker = CircuitBreaker("mongo")
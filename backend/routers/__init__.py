@@ -0,0 +1,45 @@
+"""API routers, one module per domain, mounted under /api by ``server.create_app``.
+
+``APP_ROUTERS`` picks the routers a process serves: router names and the
+``public``/``admin`` profiles below, comma separated, or ``all``. Health
+probes are always mounted. Routers are imported only when mounted, so a
+public read worker never loads the AI, backup or profiling code.
+"""
+import importlib
+from typing import List
+
+from fastapi import APIRouter
+
+PUBLIC_ROUTERS = (
+    "auth", "settings", "theme", "categories", "products", "articles", "pages",
+    "clients", "reviews", "gallery", "services", "contact", "media",
+)
+# Admin-only subsystems, with their own background services
+ADMIN_ROUTERS = ("admin", "ai", "profiling")
+ROUTERS = ("health",) + PUBLIC_ROUTERS + ADMIN_ROUTERS
+
+PROFILES = {
+    "all": ROUTERS,
+    "public": PUBLIC_ROUTERS,
+    "admin": ADMIN_ROUTERS,
+}
+
+
+def resolve_routers(spec: str) -> List[str]:
+    """Router names from an APP_ROUTERS value such as "public" or "public,ai" """
+    # Every process answers its liveness and readiness probes
+    names = ["health"]
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        for name in PROFILES.get(item, (item,)):
+            if name not in ROUTERS:
+                raise ValueError(f"Unknown router: {name}")
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def load_router(name: str) -> APIRouter:
+    return importlib.import_module(f"routers.{name}").router
@@ -0,0 +1,291 @@
+"""Backups, maintenance and the dashboard summary"""
+import asyncio
+import base64
+import csv
+import io
+import json
+import os
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from auth import require_admin
+from cache import cache
+from database import get_db
+from ids import from_document
+from leads import leads_since
+from media import media_filename, media_store
+from models import User
+from routers.products import repair_product_categories
+
+# Admin dashboard summary
+ADMIN_SUMMARY_TTL = float(os.environ.get('ADMIN_SUMMARY_TTL_SECONDS', '5'))
+SUMMARY_RECENT_ITEMS = 5
+COUNTED_COLLECTIONS = (
+    "products", "articles", "clients", "reviews", "services", "gallery",
+    "categories", "page_sections", "contact_leads", "users"
+)
+
+router = APIRouter()
+
+# ============= BACKUP ROUTES =============
+def generate_sql_insert(table_name: str, documents: list) -> str:
+    """Generate SQL INSERT statements from documents"""
+    if not documents:
+        return f"-- No data in {table_name}\n"
+    
+    lines = [f"-- Table: {table_name}", f"-- Records: {len(documents)}\n"]
+    
+    # Get all unique keys
+    all_keys = set()
+    for doc in documents:
+        all_keys.update(doc.keys())
+    columns = sorted(list(all_keys))
+    
+    # Generate INSERT statements
+    for doc in documents:
+        values = []
+        for col in columns:
+            val = doc.get(col)
+            if val is None:
+                values.append("NULL")
+            elif isinstance(val, bool):
+                values.append("1" if val else "0")
+            elif isinstance(val, (int, float)):
+                values.append(str(val))
+            elif isinstance(val, datetime):
+                values.append(f"'{val.isoformat()}'")
+            elif isinstance(val, (list, dict)):
+                # Store as JSON string
+                json_str = json.dumps(val, ensure_ascii=False).replace("'", "''")
+                values.append(f"'{json_str}'")
+            else:
+                # Escape single quotes
+                str_val = str(val).replace("'", "''")
+                values.append(f"'{str_val}'")
+        
+        cols_str = ", ".join([f"`{c}`" for c in columns])
+        vals_str = ", ".join(values)
+        lines.append(f"INSERT INTO `{table_name}` ({cols_str}) VALUES ({vals_str});")
+    
+    return "\n".join(lines) + "\n\n"
+
+@router.get("/admin/backup")
+async def backup_data(
+    format: str = Query("json", enum=["json", "csv", "sql"]), 
+    include_media: bool = Query(False, description="Extract and include media files separately"),
+    admin: User = Depends(require_admin),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Export all data from database in JSON, CSV, or SQL format (ZIP file)"""
+    
+    collections_to_backup = [
+        ("products", db.products),
+        ("articles", db.articles),
+        ("clients", db.clients),
+        ("reviews", db.reviews),
+        ("services", db.services),
+        ("gallery", db.gallery),
+        ("categories", db.categories),
+        ("page_sections", db.page_sections),
+        ("contact_leads", db.contact_leads),
+        ("users", db.users),
+    ]
+    
+    try:
+        # Create a ZIP file in memory
+        zip_buffer = io.BytesIO()
+        media_count = 0
+        
+        def extract_base64_images(obj, path=""):
+            """Recursively extract base64 images from object and return list of (filename, data)"""
+            images = []
+            if isinstance(obj, dict):
+                for key, value in obj.items():
+                    if isinstance(value, str) and value.startswith("data:image"):
+                        # Extract base64 image
+                        try:
+                            mime_match = value.split(";")[0].split(":")[1] if ":" in value else "image/png"
+                            ext = mime_match.split("/")[1] if "/" in mime_match else "png"
+                            if ext == "jpeg":
+                                ext = "jpg"
+                            b64_data = value.split(",")[1] if "," in value else value
+                            images.append((f"{path}_{key}.{ext}", base64.b64decode(b64_data)))
+                        except:
+                            pass
+                    elif isinstance(value, (dict, list)):
+                        images.extend(extract_base64_images(value, f"{path}_{key}"))
+            elif isinstance(obj, list):
+                for idx, item in enumerate(obj):
+                    images.extend(extract_base64_images(item, f"{path}_{idx}"))
+            return images
+        
+        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for collection_name, collection in collections_to_backup:
+                # Fetch all documents from collection
+                documents = [from_document(doc) for doc in await collection.find({}).to_list(10000)]
+                
+                # Extract media files if requested
+                if include_media:
+                    for idx, doc in enumerate(documents):
+                        doc_id = doc.get("id", str(idx))
+                        images = extract_base64_images(doc, f"{collection_name}/{doc_id}")
+                        for filename, img_data in images:
+                            zip_file.writestr(f"media/{filename}", img_data)
+                            media_count += 1
+                
+                if format == "json":
+                    # Convert datetime objects to ISO strings for JSON serialization
+                    for doc in documents:
+                        for key, value in doc.items():
+                            if isinstance(value, datetime):
+                                doc[key] = value.isoformat()
+                    
+                    content = json.dumps(documents, indent=2, ensure_ascii=False)
+                    zip_file.writestr(f"{collection_name}.json", content)
+                
+                elif format == "csv":
+                    if documents:
+                        output = io.StringIO()
+                        # Get all unique keys from all documents
+                        all_keys = set()
+                        for doc in documents:
+                            all_keys.update(doc.keys())
+                        fieldnames = sorted(list(all_keys))
+                        
+                        writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction='ignore')
+                        writer.writeheader()
+                        
+                        for doc in documents:
+                            # Convert complex types to strings
+                            row = {}
+                            for key, value in doc.items():
+                                if isinstance(value, (list, dict)):
+                                    row[key] = json.dumps(value, ensure_ascii=False)
+                                elif isinstance(value, datetime):
+                                    row[key] = value.isoformat()
+                                else:
+                                    row[key] = value
+                            writer.writerow(row)
+                        
+                        zip_file.writestr(f"{collection_name}.csv", output.getvalue())
+                
+                elif format == "sql":
+                    sql_content = generate_sql_insert(collection_name, documents)
+                    zip_file.writestr(f"{collection_name}.sql", sql_content)
+            
+            # Generated images live in the media store rather than inline
+            if include_media:
+                async for media in media_store.list_all():
+                    zip_file.writestr(f"media/{media_filename(media)}", bytes(media["data"]))
+                    media_count += 1
+            
+            # Also backup settings
+            settings = await db.settings.find_one({}, {"_id": 0})
+            if settings:
+                if format == "json":
+                    for key, value in settings.items():
+                        if isinstance(value, datetime):
+                            settings[key] = value.isoformat()
+                    zip_file.writestr("settings.json", json.dumps(settings, indent=2, ensure_ascii=False))
+                elif format == "csv":
+                    for key, value in settings.items():
+                        if isinstance(value, datetime):
+                            settings[key] = value.isoformat()
+                    output = io.StringIO()
+                    writer = csv.DictWriter(output, fieldnames=list(settings.keys()))
+                    writer.writeheader()
+                    writer.writerow(settings)
+                    zip_file.writestr("settings.csv", output.getvalue())
+                elif format == "sql":
+                    sql_content = generate_sql_insert("settings", [settings])
+                    zip_file.writestr("settings.sql", sql_content)
+            
+            # Backup theme
+            theme = await db.theme.find_one({}, {"_id": 0})
+            if theme:
+                if format == "json":
+                    for key, value in theme.items():
+                        if isinstance(value, datetime):
+                            theme[key] = value.isoformat()
+                    zip_file.writestr("theme.json", json.dumps(theme, indent=2, ensure_ascii=False))
+                elif format == "csv":
+                    for key, value in theme.items():
+                        if isinstance(value, datetime):
+                            theme[key] = value.isoformat()
+                    output = io.StringIO()
+                    writer = csv.DictWriter(output, fieldnames=list(theme.keys()))
+                    writer.writeheader()
+                    writer.writerow(theme)
+                    zip_file.writestr("theme.csv", output.getvalue())
+                elif format == "sql":
+                    sql_content = generate_sql_insert("theme", [theme])
+                    zip_file.writestr("theme.sql", sql_content)
+        
+        zip_buffer.seek(0)
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"backup_{timestamp}.zip"
+        
+        return StreamingResponse(
+            zip_buffer,
+            media_type="application/zip",
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Backup failed: {str(e)}")
+
+@router.post("/admin/maintenance/product-categories")
+async def repair_product_categories_route(admin: User = Depends(require_admin), db: AsyncIOMotorDatabase = Depends(get_db)):
+    """Repair drift between products and the category fields copied onto them"""
+    return await repair_product_categories(db)
+
+async def collection_counts(db: AsyncIOMotorDatabase) -> dict:
+    """Document counts from collection metadata, fetched concurrently; approximate after unclean shutdowns"""
+    counts = await asyncio.gather(*(db[name].estimated_document_count() for name in COUNTED_COLLECTIONS))
+    return dict(zip(COUNTED_COLLECTIONS, counts))
+
+@router.get("/admin/backup/stats")
+async def backup_stats(admin: User = Depends(require_admin), db: AsyncIOMotorDatabase = Depends(get_db)):
+    """Get statistics about data that will be backed up"""
+    
+    stats = await collection_counts(db)
+    
+    stats["total"] = sum(stats.values())
+    
+    return stats
+
+# ============= ADMIN SUMMARY =============
+@router.get("/admin/summary")
+async def admin_summary(admin: User = Depends(require_admin), db: AsyncIOMotorDatabase = Depends(get_db)):
+    """Totals and recent activity for the admin dashboard in one request"""
+    async def load_summary():
+        today = datetime.now(timezone.utc).date()
+        counts, leads_7d, recent_leads, recent_products, recent_articles = await asyncio.gather(
+            collection_counts(db),
+            leads_since(db, today - timedelta(days=6)),
+            db.contact_leads.find(
+                {}, {"name": 1, "email": 1, "company": 1, "created_at": 1}
+            ).sort("created_at", -1).limit(SUMMARY_RECENT_ITEMS).to_list(SUMMARY_RECENT_ITEMS),
+            db.products.find(
+                {}, {"name": 1, "slug": 1, "category_name": 1, "updated_at": 1}
+            ).sort("updated_at", -1).limit(SUMMARY_RECENT_ITEMS).to_list(SUMMARY_RECENT_ITEMS),
+            db.articles.find(
+                {}, {"title": 1, "slug": 1, "published": 1, "updated_at": 1}
+            ).sort("updated_at", -1).limit(SUMMARY_RECENT_ITEMS).to_list(SUMMARY_RECENT_ITEMS),
+        )
+        return {
+            "counts": counts,
+            "leads_last_7_days": leads_7d,
+            "recent_leads": [from_document(lead) for lead in recent_leads],
+            "recent_products": [from_document(product) for product in recent_products],
+            "recent_articles": [from_document(article) for article in recent_articles],
+            "generated_at": datetime.now(timezone.utc).isoformat()
+        }
+
+    # Not invalidated by writes; a few seconds of staleness is fine for totals
+    return await cache.get_or_load("admin", "summary", load_summary, ttl=ADMIN_SUMMARY_TTL)
@@ -0,0 +1,120 @@
+"""AI copy and image generation, jobs and batches"""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from ai import AIBusyError, AITimeoutError, ai_executor
+from ai_batches import BATCH_FIELDS, ai_batch_runner
+from ai_jobs import ai_job_runner
+from auth import require_admin
+from models import AIBatchCreate, AIContentGenerateRequest, AIImageGenerateRequest, AIJobCreate, User
+
+router = APIRouter()
+
+@router.post("/ai/generate-content")
+async def generate_content(request: AIContentGenerateRequest, admin: User = Depends(require_admin)):
+    if not ai_executor.provider.configured:
+        raise HTTPException(status_code=500, detail="AI service not configured")
+    
+    try:
+        response = await ai_executor.generate_text(admin.id, request.content_type, request.prompt, request.regenerate)
+        return {"content": response}
+    except AIBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except AITimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI generation failed: {str(e)}")
+
+@router.post("/ai/generate-image")
+async def generate_image(request: AIImageGenerateRequest, admin: User = Depends(require_admin)):
+    if not ai_executor.provider.configured:
+        raise HTTPException(status_code=500, detail="AI service not configured")
+    
+    try:
+        media = await ai_executor.generate_image(admin.id, request.prompt, request.regenerate)
+        return {"image_url": media["url"], "media_id": media["media_id"]}
+    except AIBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except AITimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Image generation failed: {str(e)}")
+
+@router.post("/ai/jobs", status_code=202)
+async def create_ai_job(request: AIJobCreate, admin: User = Depends(require_admin)):
+    """Queue a generation; follow it at /ai/jobs/{id} or /ai/jobs/{id}/events"""
+    if not ai_executor.provider.configured:
+        raise HTTPException(status_code=500, detail="AI service not configured")
+    if request.kind not in ("content", "image"):
+        raise HTTPException(status_code=400, detail="Job kind must be 'content' or 'image'")
+    if request.kind == "content" and not request.content_type:
+        raise HTTPException(status_code=400, detail="content_type is required for content jobs")
+    
+    return await ai_job_runner.submit(admin.id, request.kind, request.prompt, request.content_type, request.regenerate)
+
+@router.get("/ai/jobs/{job_id}")
+async def get_ai_job(job_id: str, admin: User = Depends(require_admin)):
+    job = await ai_job_runner.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/ai/jobs/{job_id}/events")
+async def stream_ai_job(job_id: str, admin: User = Depends(require_admin)):
+    """Server-sent events with status changes and text as it is generated"""
+    if not await ai_job_runner.get(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        ai_job_runner.events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.delete("/ai/jobs/{job_id}")
+async def cancel_ai_job(job_id: str, admin: User = Depends(require_admin)):
+    job = await ai_job_runner.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/ai/batches", status_code=202)
+async def create_ai_batch(request: AIBatchCreate, admin: User = Depends(require_admin)):
+    """Generate copy for every selected product or article in the background"""
+    if not ai_executor.provider.configured:
+        raise HTTPException(status_code=500, detail="AI service not configured")
+    if request.target not in BATCH_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Target must be one of: {', '.join(BATCH_FIELDS)}")
+    unknown = [field for field in request.fields if field not in BATCH_FIELDS[request.target]]
+    if not request.fields or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Fields for {request.target} must be among: {', '.join(BATCH_FIELDS[request.target])}"
+        )
+    
+    return await ai_batch_runner.create(admin.id, request.target, request.fields, request.category, request.only_missing)
+
+@router.get("/ai/batches")
+async def list_ai_batches(admin: User = Depends(require_admin)):
+    return await ai_batch_runner.list()
+
+@router.get("/ai/batches/{batch_id}")
+async def get_ai_batch(batch_id: str, admin: User = Depends(require_admin)):
+    batch = await ai_batch_runner.get(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
+@router.post("/ai/batches/{batch_id}/resume")
+async def resume_ai_batch(batch_id: str, admin: User = Depends(require_admin)):
+    """Retry failed items and restart a cancelled or finished batch"""
+    batch = await ai_batch_runner.resume(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
+@router.delete("/ai/batches/{batch_id}")
+async def cancel_ai_batch(batch_id: str, admin: User = Depends(require_admin)):
+    batch = await ai_batch_runner.cancel(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
@@ -0,0 +1,98 @@
+"""Articles"""
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from auth import require_admin
+from cache import invalidation_bus
+from compression import cached_json_response
+from content import article_content
+from models import Article, ArticleCreate, ArticleSummary, User
+from repositories import ArticleRepository, ArticleSummaryRepository
+
+router = APIRouter()
+
+@router.get("/articles", response_model=List[ArticleSummary])
+async def get_articles(request: Request, category: Optional[str] = None, published: Optional[bool] = None, articles: ArticleSummaryRepository = Depends(ArticleSummaryRepository)):
+    query = {}
+    if category:
+        query["category"] = category
+    if published is not None:
+        query["published"] = published
+    
+    async def load_articles():
+        return await articles.find(query)
+    
+    key = f"{category or ''}|{published}"
+    return await cached_json_response(request, "articles", key, load_articles, List[ArticleSummary], cache_if=bool)
+
+@router.get("/articles/{article_id}", response_model=Article)
+async def get_article(article_id: str, articles: ArticleRepository = Depends(ArticleRepository)):
+    article = await articles.get(article_id)
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return article
+
+@router.get("/articles/{article_id}/related", response_model=List[ArticleSummary])
+async def get_related_articles(request: Request, article_id: str, articles: ArticleSummaryRepository = Depends(ArticleSummaryRepository)):
+    async def load_related():
+        article = await articles.get(article_id)
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        return await articles.get_many(article.related_ids)
+    
+    return await cached_json_response(request, "articles", f"related|{article_id}", load_related, List[ArticleSummary])
+
+@router.post("/articles", response_model=Article)
+async def create_article(article_data: ArticleCreate, admin: User = Depends(require_admin), articles: ArticleRepository = Depends(ArticleRepository)):
+    article_id = str(uuid.uuid4())
+    slug = article_data.title.lower().replace(" ", "-")
+    
+    article = {
+        "id": article_id,
+        "title": article_data.title,
+        "slug": slug,
+        **article_content(article_data.content, article_data.excerpt),
+        "cover_image": article_data.cover_image,
+        "category": article_data.category,
+        "meta_title": article_data.meta_title,
+        "meta_description": article_data.meta_description,
+        "published": article_data.published,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    created = await articles.insert(article)
+    await invalidation_bus.publish("articles")
+    return created
+
+@router.put("/articles/{article_id}", response_model=Article)
+async def update_article(article_id: str, article_data: ArticleCreate, admin: User = Depends(require_admin), articles: ArticleRepository = Depends(ArticleRepository)):
+    slug = article_data.title.lower().replace(" ", "-")
+    update_data = {
+        "title": article_data.title,
+        "slug": slug,
+        # Rendered once here, so reads serve it as stored
+        **article_content(article_data.content, article_data.excerpt),
+        "cover_image": article_data.cover_image,
+        "category": article_data.category,
+        "meta_title": article_data.meta_title,
+        "meta_description": article_data.meta_description,
+        "published": article_data.published,
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    article = await articles.update(article_id, update_data)
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    await invalidation_bus.publish("articles")
+    return article
+
+@router.delete("/articles/{article_id}")
+async def delete_article(article_id: str, admin: User = Depends(require_admin), articles: ArticleRepository = Depends(ArticleRepository)):
+    if not await articles.delete(article_id):
+        raise HTTPException(status_code=404, detail="Article not found")
+    await invalidation_bus.publish("articles")
+    return {"message": "Article deleted successfully"}
@@ -0,0 +1,55 @@
+"""Registration, login and the current user"""
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from auth import create_access_token, get_current_user, pwd_context
+from models import TokenResponse, User, UserCreate, UserLogin
+from repositories import UserRepository
+from ratelimit import LOGIN_PER_EMAIL, LOGIN_PER_IP, REGISTER_PER_IP, client_ip, rate_limiter
+
+router = APIRouter()
+
+@router.post("/auth/register", response_model=TokenResponse)
+async def register(user_data: UserCreate, request: Request, users: UserRepository = Depends(UserRepository)):
+    await rate_limiter.hit(REGISTER_PER_IP, client_ip(request))
+    # Check if user exists
+    if await users.exists({"email": user_data.email}):
+        raise HTTPException(status_code=400, detail="Email already registered")
+    
+    # Create user
+    user_id = str(uuid.uuid4())
+    hashed_password = pwd_context.hash(user_data.password)
+    
+    user = {
+        "id": user_id,
+        "email": user_data.email,
+        "full_name": user_data.full_name,
+        "password": hashed_password,
+        "is_admin": False,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    created = await users.insert(user)
+    
+    # Create token
+    token = create_access_token({"sub": user_id})
+    return TokenResponse(access_token=token, user=created)
+
+@router.post("/auth/login", response_model=TokenResponse)
+async def login(credentials: UserLogin, request: Request, users: UserRepository = Depends(UserRepository)):
+    # Checked before the user lookup and bcrypt so floods stay cheap
+    await rate_limiter.hit(LOGIN_PER_IP, client_ip(request))
+    await rate_limiter.hit(LOGIN_PER_EMAIL, credentials.email)
+    found = await users.credentials(credentials.email)
+    if not found or not pwd_context.verify(credentials.password, found[1]):
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    user = found[0]
+    
+    token = create_access_token({"sub": user.id})
+    return TokenResponse(access_token=token, user=user)
+
+@router.get("/auth/me", response_model=User)
+async def get_me(current_user: User = Depends(get_current_user)):
+    return current_user
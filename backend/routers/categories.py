@@ -0,0 +1,121 @@
+"""Product and article categories"""
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from auth import require_admin
+from cache import invalidation_bus
+from catalogue import catalogue
+from compression import cached_json_response
+from models import Category, CategoryCreate, MoveRequest, User
+from ordering import move
+from repositories import CategoryRepository, ProductRepository
+
+router = APIRouter()
+
+@router.get("/categories", response_model=List[Category])
+async def get_categories(
+    request: Request,
+    category_type: Optional[str] = Query(None, alias="type"),
+    categories: CategoryRepository = Depends(CategoryRepository)
+):
+    query = {}
+    if category_type:
+        query["type"] = category_type
+    
+    async def load_categories():
+        return await catalogue.find(categories, query, sort=[("order", 1)])
+    
+    return await cached_json_response(request, "categories", category_type or "", load_categories, List[Category], cache_if=bool)
+
+@router.get("/categories/{category_id}", response_model=Category)
+async def get_category(category_id: str, categories: CategoryRepository = Depends(CategoryRepository)):
+    category = await catalogue.get_by_id_or_slug(categories, category_id)
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return category
+
+@router.post("/categories", response_model=Category)
+async def create_category(
+    cat_data: CategoryCreate,
+    admin: User = Depends(require_admin),
+    categories: CategoryRepository = Depends(CategoryRepository)
+):
+    category_id = str(uuid.uuid4())
+    slug = cat_data.name.lower().replace(" ", "-")
+    
+    # Check if slug already exists for this type
+    if await categories.exists({"slug": slug, "type": cat_data.type}):
+        raise HTTPException(status_code=400, detail="Category with this name already exists")
+    
+    category = {
+        "id": category_id,
+        "name": cat_data.name,
+        "slug": slug,
+        "type": cat_data.type,
+        "description": cat_data.description,
+        "order": cat_data.order,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    created = await categories.insert(category)
+    await invalidation_bus.publish("categories", created.id)
+    return created
+
+@router.put("/categories/{category_id}", response_model=Category)
+async def update_category(
+    category_id: str,
+    cat_data: CategoryCreate,
+    admin: User = Depends(require_admin),
+    categories: CategoryRepository = Depends(CategoryRepository),
+    products: ProductRepository = Depends(ProductRepository)
+):
+    slug = cat_data.name.lower().replace(" ", "-")
+    
+    update_data = {
+        "name": cat_data.name,
+        "slug": slug,
+        "description": cat_data.description,
+        "order": cat_data.order,
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    category = await categories.update(category_id, update_data)
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+    await invalidation_bus.publish("categories", category_id)
+    
+    # Propagate the rename to every product in this category
+    await products.update_many({"category_id": category_id}, {"category_name": cat_data.name, "category_slug": slug})
+    await invalidation_bus.publish("products")
+    return category
+
+@router.post("/categories/{category_id}/move", response_model=Category)
+async def move_category(
+    category_id: str,
+    position: MoveRequest,
+    admin: User = Depends(require_admin),
+    categories: CategoryRepository = Depends(CategoryRepository)
+):
+    category = await move(categories, category_id, position.after_id, position.before_id)
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return category
+
+@router.delete("/categories/{category_id}")
+async def delete_category(
+    category_id: str,
+    admin: User = Depends(require_admin),
+    categories: CategoryRepository = Depends(CategoryRepository),
+    products: ProductRepository = Depends(ProductRepository)
+):
+    if not await categories.delete(category_id):
+        raise HTTPException(status_code=404, detail="Category not found")
+    await invalidation_bus.publish("categories", category_id)
+    
+    await products.update_many({"category_id": category_id}, {"category_name": None, "category_slug": None})
+    await invalidation_bus.publish("products")
+    return {"message": "Category deleted successfully"}
@@ -0,0 +1,40 @@
+"""Client logos"""
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from auth import require_admin
+from cache import invalidation_bus
+from catalogue import catalogue
+from models import Client, ClientCreate, User
+from repositories import ClientRepository
+
+router = APIRouter()
+
+@router.get("/clients", response_model=List[Client])
+async def get_clients(clients: ClientRepository = Depends(ClientRepository)):
+    return await catalogue.find(clients)
+
+@router.post("/clients", response_model=Client)
+async def create_client(client_data: ClientCreate, admin: User = Depends(require_admin), clients: ClientRepository = Depends(ClientRepository)):
+    client_id = str(uuid.uuid4())
+    
+    client = {
+        "id": client_id,
+        "name": client_data.name,
+        "logo_url": client_data.logo_url,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    created = await clients.insert(client)
+    await invalidation_bus.publish("clients", client_id)
+    return created
+
+@router.delete("/clients/{client_id}")
+async def delete_client(client_id: str, admin: User = Depends(require_admin), clients: ClientRepository = Depends(ClientRepository)):
+    if not await clients.delete(client_id):
+        raise HTTPException(status_code=404, detail="Client not found")
+    await invalidation_bus.publish("clients", client_id)
+    return {"message": "Client deleted successfully"}
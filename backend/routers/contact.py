@@ -0,0 +1,86 @@
+"""Contact form submissions and lead reporting"""
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from auth import require_admin
+from database import get_db
+from leads import LeadBacklogFull, export_leads, lead_stats, lead_writer
+from models import ContactLead, ContactLeadCreate, LeadStats, User
+from repositories import LeadRepository
+from ratelimit import CONTACT_PER_EMAIL, CONTACT_PER_IP, client_ip, rate_limiter
+
+router = APIRouter()
+
+@router.post("/contact", response_model=ContactLead)
+async def create_contact_lead(lead_data: ContactLeadCreate, request: Request):
+    await rate_limiter.hit(CONTACT_PER_IP, client_ip(request))
+    await rate_limiter.hit(CONTACT_PER_EMAIL, lead_data.email)
+    lead_id = str(uuid.uuid4())
+    
+    lead = {
+        "id": lead_id,
+        "name": lead_data.name,
+        "email": lead_data.email,
+        "phone": lead_data.phone,
+        "company": lead_data.company,
+        "message": lead_data.message,
+        "source_page": lead_data.source_page,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    try:
+        await lead_writer.submit(lead)
+    except LeadBacklogFull:
+        raise HTTPException(status_code=503, detail="Too many pending messages, try again shortly", headers={"Retry-After": "5"})
+    lead['created_at'] = datetime.fromisoformat(lead['created_at'])
+    return ContactLead(**lead)
+
+@router.get("/contact/leads", response_model=List[ContactLead])
+async def get_contact_leads(admin: User = Depends(require_admin), leads: LeadRepository = Depends(LeadRepository)):
+    # Leads this worker has accepted but not yet written show up immediately
+    await lead_writer.flush()
+    return await leads.find(sort=[("created_at", -1)])
+
+@router.get("/contact/leads/stats", response_model=LeadStats)
+async def get_contact_lead_stats(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    top: int = Query(10, ge=1, le=100),
+    admin: User = Depends(require_admin),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Lead counts per day, ISO week, email domain and source page; defaults to the last 90 days"""
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=89)
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    if (end - start).days > 731:
+        raise HTTPException(status_code=400, detail="Date range is limited to two years")
+    return await lead_stats(db, start, end, top)
+
+@router.get("/contact/leads/export")
+async def export_contact_leads(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    format: str = Query("csv", enum=["csv", "ndjson"]),
+    admin: User = Depends(require_admin),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Stream leads created between from and to (inclusive UTC days) for CRM import"""
+    if format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    await lead_writer.flush()
+    filename = f"leads_{start or 'start'}_{end or datetime.now(timezone.utc).date()}.{format}"
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_leads(db, start, end, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
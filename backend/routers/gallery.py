@@ -0,0 +1,118 @@
+"""Gallery items"""
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from auth import require_admin
+from cache import invalidation_bus
+from catalogue import catalogue
+from compression import cached_json_response
+from models import GalleryBrowse, GalleryItem, GalleryItemCreate, MoveRequest, User
+from ordering import move
+from repositories import GalleryRepository
+
+router = APIRouter()
+
+@router.get("/gallery", response_model=List[GalleryItem])
+async def get_gallery(category: Optional[str] = None, featured: Optional[bool] = None, gallery: GalleryRepository = Depends(GalleryRepository)):
+    query = {}
+    if category:
+        query["category"] = category
+    if featured is not None:
+        query["featured"] = featured
+    
+    return await catalogue.find(gallery, query, sort=[("order", 1)])
+
+@router.get("/gallery/browse", response_model=GalleryBrowse)
+async def browse_gallery(
+    request: Request,
+    category: Optional[str] = None,
+    featured: Optional[bool] = None,
+    gallery: GalleryRepository = Depends(GalleryRepository)
+):
+    """Gallery items with their counts per category and featured flag, for filter sidebars"""
+    filters = {}
+    if category:
+        filters["category"] = category
+    if featured is not None:
+        filters["featured"] = featured
+    
+    async def load_browse():
+        items, counts = await asyncio.gather(
+            catalogue.find(gallery, gallery.facet_query(filters), sort=[("order", 1)]),
+            gallery.facet_counts(filters)
+        )
+        return {"items": items, "by_category": counts["category"], "by_featured": counts["featured"]}
+    
+    key = f"browse|{category or ''}|{featured}"
+    return await cached_json_response(request, "gallery", key, load_browse, GalleryBrowse, cache_if=lambda browse: bool(browse["items"]))
+
+@router.get("/gallery/categories", response_model=List[str])
+async def get_gallery_categories(request: Request, gallery: GalleryRepository = Depends(GalleryRepository)):
+    async def load_categories():
+        categories = await catalogue.distinct(gallery, "category")
+        return [c for c in categories if c]
+    
+    return await cached_json_response(request, "gallery", "categories", load_categories, List[str])
+
+@router.get("/gallery/{item_id}", response_model=GalleryItem)
+async def get_gallery_item(item_id: str, gallery: GalleryRepository = Depends(GalleryRepository)):
+    item = await catalogue.get(gallery, item_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Gallery item not found")
+    return item
+
+@router.post("/gallery", response_model=GalleryItem)
+async def create_gallery_item(item_data: GalleryItemCreate, admin: User = Depends(require_admin), gallery: GalleryRepository = Depends(GalleryRepository)):
+    item_id = str(uuid.uuid4())
+    
+    item = {
+        "id": item_id,
+        "title": item_data.title,
+        "description": item_data.description,
+        "image_url": item_data.image_url,
+        "category": item_data.category,
+        "featured": item_data.featured,
+        "order": item_data.order,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    created = await gallery.insert(item)
+    await invalidation_bus.publish("gallery", item_id)
+    return created
+
+@router.put("/gallery/{item_id}", response_model=GalleryItem)
+async def update_gallery_item(item_id: str, item_data: GalleryItemCreate, admin: User = Depends(require_admin), gallery: GalleryRepository = Depends(GalleryRepository)):
+    update_data = {
+        "title": item_data.title,
+        "description": item_data.description,
+        "image_url": item_data.image_url,
+        "category": item_data.category,
+        "featured": item_data.featured,
+        "order": item_data.order,
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    item = await gallery.update(item_id, update_data)
+    if not item:
+        raise HTTPException(status_code=404, detail="Gallery item not found")
+    await invalidation_bus.publish("gallery", item_id)
+    return item
+
+@router.post("/gallery/{item_id}/move", response_model=GalleryItem)
+async def move_gallery_item(item_id: str, position: MoveRequest, admin: User = Depends(require_admin), gallery: GalleryRepository = Depends(GalleryRepository)):
+    item = await move(gallery, item_id, position.after_id, position.before_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Gallery item not found")
+    return item
+
+@router.delete("/gallery/{item_id}")
+async def delete_gallery_item(item_id: str, admin: User = Depends(require_admin), gallery: GalleryRepository = Depends(GalleryRepository)):
+    if not await gallery.delete(item_id):
+        raise HTTPException(status_code=404, detail="Gallery item not found")
+    await invalidation_bus.publish("gallery", item_id)
+    return {"message": "Gallery item deleted successfully"}
@@ -0,0 +1,19 @@
+"""Liveness and readiness probes"""
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from database import get_db, warmup
+
+router = APIRouter()
+
+@router.get("/health")
+async def health():
+    """Liveness: the worker is up and serving requests"""
+    return {"status": "ok"}
+
+@router.get("/health/ready")
+async def readiness(db: AsyncIOMotorDatabase = Depends(get_db)):
+    """Readiness: warm-up has finished and Mongo is reachable"""
+    report = await warmup.check(db)
+    return JSONResponse(status_code=200 if report["status"] == "ready" else 503, content=report)
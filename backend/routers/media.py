@@ -0,0 +1,21 @@
+"""Generated media files"""
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response
+
+from media import media_store
+
+router = APIRouter()
+
+@router.get("/media/{media_id}")
+async def get_media(media_id: str, if_none_match: Optional[str] = Header(None)):
+    media = await media_store.get(media_id)
+    if not media:
+        raise HTTPException(status_code=404, detail="Media not found")
+    
+    # Media ids are never reused, so clients may cache them forever
+    headers = {"ETag": f'"{media["sha256"]}"', "Cache-Control": "public, max-age=31536000, immutable"}
+    if if_none_match == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=bytes(media["data"]), media_type=media["content_type"], headers=headers)
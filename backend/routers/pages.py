@@ -0,0 +1,74 @@
+"""Editable page sections"""
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from auth import require_admin
+from cache import invalidation_bus
+from compression import cached_json_response
+from models import MoveRequest, PageSection, PageSectionCreate, User
+from ordering import move
+from repositories import PageSectionRepository
+
+router = APIRouter()
+
+@router.get("/pages/{page_name}/sections", response_model=List[PageSection])
+async def get_page_sections(request: Request, page_name: str, sections: PageSectionRepository = Depends(PageSectionRepository)):
+    async def load_sections():
+        return await sections.find({"page_name": page_name}, sort=[("order", 1)])
+    
+    return await cached_json_response(request, "pages", page_name, load_sections, List[PageSection], cache_if=bool)
+
+@router.post("/pages/sections", response_model=PageSection)
+async def create_page_section(section_data: PageSectionCreate, admin: User = Depends(require_admin), sections: PageSectionRepository = Depends(PageSectionRepository)):
+    section_id = str(uuid.uuid4())
+    
+    section = {
+        "id": section_id,
+        "page_name": section_data.page_name,
+        "section_name": section_data.section_name,
+        "section_type": section_data.section_type,
+        "content": section_data.content,
+        "order": section_data.order,
+        "visible": section_data.visible,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    created = await sections.insert(section)
+    await invalidation_bus.publish("pages")
+    return created
+
+@router.put("/pages/sections/{section_id}", response_model=PageSection)
+async def update_page_section(section_id: str, section_data: PageSectionCreate, admin: User = Depends(require_admin), sections: PageSectionRepository = Depends(PageSectionRepository)):
+    update_data = {
+        "page_name": section_data.page_name,
+        "section_name": section_data.section_name,
+        "section_type": section_data.section_type,
+        "content": section_data.content,
+        "order": section_data.order,
+        "visible": section_data.visible,
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    section = await sections.update(section_id, update_data)
+    if not section:
+        raise HTTPException(status_code=404, detail="Section not found")
+    await invalidation_bus.publish("pages")
+    return section
+
+@router.post("/pages/sections/{section_id}/move", response_model=PageSection)
+async def move_page_section(section_id: str, position: MoveRequest, admin: User = Depends(require_admin), sections: PageSectionRepository = Depends(PageSectionRepository)):
+    section = await move(sections, section_id, position.after_id, position.before_id)
+    if not section:
+        raise HTTPException(status_code=404, detail="Section not found")
+    return section
+
+@router.delete("/pages/sections/{section_id}")
+async def delete_page_section(section_id: str, admin: User = Depends(require_admin), sections: PageSectionRepository = Depends(PageSectionRepository)):
+    if not await sections.delete(section_id):
+        raise HTTPException(status_code=404, detail="Section not found")
+    await invalidation_bus.publish("pages")
+    return {"message": "Section deleted successfully"}
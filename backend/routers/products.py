@@ -0,0 +1,345 @@
+"""Products, their images and documents, and admin file uploads"""
+import asyncio
+import base64
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from auth import require_admin
+from cache import invalidation_bus
+from catalogue import catalogue
+from compression import cached_json_response
+from models import Product, ProductBrowse, ProductCreate, User
+from repositories import CategoryRepository, ProductRepository
+
+router = APIRouter()
+
+# ============= PRODUCT CATEGORY DENORMALIZATION =============
+async def get_category_fields(categories: CategoryRepository, category_id: Optional[str]) -> dict:
+    """Category name and slug copied onto product documents at write time"""
+    category = await categories.get(category_id) if category_id else None
+    return {
+        "category_name": category.name if category else None,
+        "category_slug": category.slug if category else None
+    }
+
+async def repair_product_categories(db: AsyncIOMotorDatabase) -> dict:
+    """Re-sync denormalized category fields on products that drifted from their category"""
+    products = ProductRepository(db)
+    categories = await CategoryRepository(db).find(limit=10000)
+    
+    repaired = 0
+    for cat in categories:
+        repaired += await products.update_many(
+            {
+                "category_id": cat.id,
+                "$or": [
+                    {"category_name": {"$ne": cat.name}},
+                    {"category_slug": {"$ne": cat.slug}}
+                ]
+            },
+            {"category_name": cat.name, "category_slug": cat.slug}
+        )
+    
+    # Products pointing at a deleted category keep no stale name
+    orphaned = await products.update_many(
+        {
+            "category_id": {"$nin": [cat.id for cat in categories]},
+            "$or": [{"category_name": {"$ne": None}}, {"category_slug": {"$ne": None}}]
+        },
+        {"category_name": None, "category_slug": None}
+    )
+    if repaired or orphaned:
+        await invalidation_bus.publish("products")
+    
+    return {"repaired": repaired, "orphaned": orphaned}
+
+# ============= PRODUCT ROUTES =============
+@router.get("/products", response_model=List[Product])
+async def get_products(
+    request: Request,
+    category_id: Optional[str] = None,
+    featured: Optional[bool] = None,
+    products: ProductRepository = Depends(ProductRepository)
+):
+    query = {}
+    if category_id:
+        query["category_id"] = category_id
+    if featured is not None:
+        query["featured"] = featured
+    
+    async def load_products():
+        # Category name and slug are stored on the product, so this is the only query
+        return await catalogue.find(products, query)
+    
+    key = f"{category_id or ''}|{featured}"
+    return await cached_json_response(request, "products", key, load_products, List[Product], cache_if=bool)
+
+@router.get("/products/browse", response_model=ProductBrowse)
+async def browse_products(
+    request: Request,
+    category_id: Optional[str] = None,
+    featured: Optional[bool] = None,
+    document_type: Optional[str] = None,
+    products: ProductRepository = Depends(ProductRepository)
+):
+    """Products with their counts per category, featured flag and document type, for filter sidebars"""
+    filters = {}
+    if category_id:
+        filters["category_id"] = category_id
+    if featured is not None:
+        filters["featured"] = featured
+    if document_type:
+        filters["document_type"] = document_type
+    
+    async def load_browse():
+        # Items are read apart from the counts: a $facet result is a single document, capped at 16 MB
+        items, counts = await asyncio.gather(
+            catalogue.find(products, products.facet_query(filters)),
+            products.facet_counts(filters)
+        )
+        return {
+            "items": items,
+            "by_category": counts["category_id"],
+            "by_featured": counts["featured"],
+            "by_document_type": counts["document_type"]
+        }
+    
+    key = f"browse|{category_id or ''}|{featured}|{document_type or ''}"
+    return await cached_json_response(request, "products", key, load_browse, ProductBrowse, cache_if=lambda browse: bool(browse["items"]))
+
+@router.get("/products/{product_id}", response_model=Product)
+async def get_product(product_id: str, products: ProductRepository = Depends(ProductRepository)):
+    product = await catalogue.get(products, product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return product
+
+@router.get("/products/{product_id}/related", response_model=List[Product])
+async def get_related_products(request: Request, product_id: str, products: ProductRepository = Depends(ProductRepository)):
+    async def load_related():
+        product = await catalogue.get(products, product_id)
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return await catalogue.get_many(products, product.related_ids)
+    
+    return await cached_json_response(request, "products", f"related|{product_id}", load_related, List[Product])
+
+@router.post("/products", response_model=Product)
+async def create_product(
+    product_data: ProductCreate,
+    admin: User = Depends(require_admin),
+    products: ProductRepository = Depends(ProductRepository),
+    categories: CategoryRepository = Depends(CategoryRepository)
+):
+    product_id = str(uuid.uuid4())
+    slug = product_data.name.lower().replace(" ", "-")
+    
+    product = {
+        "id": product_id,
+        "name": product_data.name,
+        "slug": slug,
+        "category_id": product_data.category_id,
+        "description": product_data.description,
+        "benefits": product_data.benefits,
+        "key_ingredients": product_data.key_ingredients,
+        "packaging_options": product_data.packaging_options,
+        "meta_description": product_data.meta_description,
+        "images": [],
+        "documents": [],
+        "featured": product_data.featured,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    product.update(await get_category_fields(categories, product_data.category_id))
+    
+    created = await products.insert(product)
+    await invalidation_bus.publish("products", product_id)
+    return created
+
+@router.put("/products/{product_id}", response_model=Product)
+async def update_product(
+    product_id: str,
+    product_data: ProductCreate,
+    admin: User = Depends(require_admin),
+    products: ProductRepository = Depends(ProductRepository),
+    categories: CategoryRepository = Depends(CategoryRepository)
+):
+    slug = product_data.name.lower().replace(" ", "-")
+    update_data = {
+        "name": product_data.name,
+        "slug": slug,
+        "category_id": product_data.category_id,
+        "description": product_data.description,
+        "benefits": product_data.benefits,
+        "key_ingredients": product_data.key_ingredients,
+        "packaging_options": product_data.packaging_options,
+        "featured": product_data.featured,
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    update_data.update(await get_category_fields(categories, product_data.category_id))
+    # Forms without the field keep a generated meta description
+    if product_data.meta_description is not None:
+        update_data["meta_description"] = product_data.meta_description
+    
+    product = await products.update(product_id, update_data)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    await invalidation_bus.publish("products", product_id)
+    return product
+
+@router.delete("/products/{product_id}")
+async def delete_product(product_id: str, admin: User = Depends(require_admin), products: ProductRepository = Depends(ProductRepository)):
+    if not await products.delete(product_id):
+        raise HTTPException(status_code=404, detail="Product not found")
+    await invalidation_bus.publish("products", product_id)
+    return {"message": "Product deleted successfully"}
+
+@router.post("/products/{product_id}/images")
+async def add_product_image(
+    product_id: str,
+    image_url: str = Form(...),
+    admin: User = Depends(require_admin),
+    products: ProductRepository = Depends(ProductRepository)
+):
+    product = await products.get(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    images = product.images + [image_url]
+    
+    await products.update(product_id, {"images": images})
+    await invalidation_bus.publish("products", product_id)
+    return {"message": "Image added successfully", "images": images}
+
+@router.post("/products/{product_id}/documents")
+async def add_product_document(
+    product_id: str,
+    name: str = Form(...),
+    url: str = Form(...),
+    doc_type: str = Form(...),
+    admin: User = Depends(require_admin),
+    products: ProductRepository = Depends(ProductRepository)
+):
+    product = await products.get(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    doc_id = str(uuid.uuid4())
+    documents = product.documents + [{
+        "id": doc_id,
+        "name": name,
+        "url": url,
+        "type": doc_type,
+        "uploaded_at": datetime.now(timezone.utc).isoformat()
+    }]
+    
+    await products.update(product_id, {"documents": documents})
+    await invalidation_bus.publish("products", product_id)
+    return {"message": "Document added successfully", "documents": documents}
+
+@router.delete("/products/{product_id}/documents/{doc_id}")
+async def delete_product_document(
+    product_id: str,
+    doc_id: str,
+    admin: User = Depends(require_admin),
+    products: ProductRepository = Depends(ProductRepository)
+):
+    product = await products.get(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    documents = [doc for doc in product.documents if doc.get('id') != doc_id]
+    
+    await products.update(product_id, {"documents": documents})
+    await invalidation_bus.publish("products", product_id)
+    return {"message": "Document deleted successfully", "documents": documents}
+
+@router.post("/upload-file")
+async def upload_file(file: UploadFile = File(...), admin: User = Depends(require_admin)):
+    """Upload file and return base64 data URL"""
+    try:
+        # Read file content
+        contents = await file.read()
+        
+        # Convert to base64
+        file_base64 = base64.b64encode(contents).decode('utf-8')
+        
+        # Get file extension
+        file_ext = file.filename.split('.')[-1].lower() if '.' in file.filename else 'pdf'
+        
+        # Create data URL based on file type
+        mime_types = {
+            'pdf': 'application/pdf',
+            'doc': 'application/msword',
+            'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+            'xls': 'application/vnd.ms-excel',
+            'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            'txt': 'text/plain',
+            'png': 'image/png',
+            'jpg': 'image/jpeg',
+            'jpeg': 'image/jpeg',
+            'gif': 'image/gif',
+            'webp': 'image/webp',
+            'svg': 'image/svg+xml'
+        }
+        
+        mime_type = mime_types.get(file_ext, 'application/octet-stream')
+        data_url = f"data:{mime_type};base64,{file_base64}"
+        
+        return {
+            "success": True,
+            "filename": file.filename,
+            "data_url": data_url,
+            "size": len(contents),
+            "type": "image" if file_ext in ['png', 'jpg', 'jpeg', 'gif', 'webp'] else "document"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
+
+@router.post("/upload-image")
+async def upload_image(file: UploadFile = File(...), admin: User = Depends(require_admin)):
+    """Upload image specifically and return base64 data URL"""
+    try:
+        # Validate file type
+        file_ext = file.filename.split('.')[-1].lower() if '.' in file.filename else ''
+        allowed_extensions = ['png', 'jpg', 'jpeg', 'gif', 'webp']
+        
+        if file_ext not in allowed_extensions:
+            raise HTTPException(status_code=400, detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}")
+        
+        # Read file content
+        contents = await file.read()
+        
+        # Check file size (max 2MB for images)
+        if len(contents) > 2 * 1024 * 1024:
+            raise HTTPException(status_code=400, detail="Image size must be less than 2MB")
+        
+        # Convert to base64
+        file_base64 = base64.b64encode(contents).decode('utf-8')
+        
+        # Create data URL
+        mime_types = {
+            'png': 'image/png',
+            'jpg': 'image/jpeg',
+            'jpeg': 'image/jpeg',
+            'gif': 'image/gif',
+            'webp': 'image/webp'
+        }
+        
+        mime_type = mime_types.get(file_ext, 'image/jpeg')
+        data_url = f"data:{mime_type};base64,{file_base64}"
+        
+        return {
+            "success": True,
+            "filename": file.filename,
+            "data_url": data_url,
+            "size": len(contents)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Image upload failed: {str(e)}")
@@ -0,0 +1,52 @@
+"""Slow request profiling switch and captured profiles"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from auth import require_admin
+from cache import invalidation_bus
+from database import get_db
+from models import ProfilingSettingsUpdate, User
+from profiling import get_profiling_settings, list_profiles, profile_path
+
+router = APIRouter()
+
+@router.get("/admin/profiling")
+async def get_profiling(admin: User = Depends(require_admin), db: AsyncIOMotorDatabase = Depends(get_db)):
+    """Current profiling switch and the profiles captured so far"""
+    return {
+        "settings": await get_profiling_settings(db),
+        "profiles": await asyncio.to_thread(list_profiles)
+    }
+
+@router.put("/admin/profiling")
+async def update_profiling(settings_data: ProfilingSettingsUpdate, admin: User = Depends(require_admin), db: AsyncIOMotorDatabase = Depends(get_db)):
+    """Turn on sampled profiling of slow requests on every worker for a limited time"""
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings_data.duration_minutes)
+    settings = {
+        "enabled": settings_data.enabled,
+        "threshold_ms": settings_data.threshold_ms,
+        "routes": settings_data.routes,
+        "expires_at": expires_at.isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    await db.profiling_settings.update_one({}, {"$set": settings}, upsert=True)
+    await invalidation_bus.publish("profiling")
+    return settings
+
+@router.get("/admin/profiling/profiles/{name}")
+async def download_profile(
+    name: str,
+    format: str = Query("folded", enum=["folded", "json"]),
+    admin: User = Depends(require_admin)
+):
+    """Download a captured profile as collapsed stacks or as the Mongo command report"""
+    path = profile_path(name, format)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "application/json" if format == "json" else "text/plain"
+    return FileResponse(path, media_type=media_type, filename=path.name)
@@ -0,0 +1,61 @@
+"""Customer reviews"""
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from auth import require_admin
+from cache import invalidation_bus
+from catalogue import catalogue
+from models import Review, ReviewCreate, User
+from repositories import ReviewRepository
+
+router = APIRouter()
+
+@router.get("/reviews", response_model=List[Review])
+async def get_reviews(reviews: ReviewRepository = Depends(ReviewRepository)):
+    return await catalogue.find(reviews)
+
+@router.post("/reviews", response_model=Review)
+async def create_review(review_data: ReviewCreate, admin: User = Depends(require_admin), reviews: ReviewRepository = Depends(ReviewRepository)):
+    review_id = str(uuid.uuid4())
+    
+    review = {
+        "id": review_id,
+        "customer_name": review_data.customer_name,
+        "review_text": review_data.review_text,
+        "rating": review_data.rating,
+        "position": review_data.position,
+        "company": review_data.company,
+        "photo_url": review_data.photo_url,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    created = await reviews.insert(review)
+    await invalidation_bus.publish("reviews", review_id)
+    return created
+
+@router.put("/reviews/{review_id}", response_model=Review)
+async def update_review(review_id: str, review_data: ReviewCreate, admin: User = Depends(require_admin), reviews: ReviewRepository = Depends(ReviewRepository)):
+    update_data = {
+        "customer_name": review_data.customer_name,
+        "review_text": review_data.review_text,
+        "rating": review_data.rating,
+        "position": review_data.position,
+        "company": review_data.company,
+        "photo_url": review_data.photo_url
+    }
+    
+    review = await reviews.update(review_id, update_data)
+    if not review:
+        raise HTTPException(status_code=404, detail="Review not found")
+    await invalidation_bus.publish("reviews", review_id)
+    return review
+
+@router.delete("/reviews/{review_id}")
+async def delete_review(review_id: str, admin: User = Depends(require_admin), reviews: ReviewRepository = Depends(ReviewRepository)):
+    if not await reviews.delete(review_id):
+        raise HTTPException(status_code=404, detail="Review not found")
+    await invalidation_bus.publish("reviews", review_id)
+    return {"message": "Review deleted successfully"}
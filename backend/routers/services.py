@@ -0,0 +1,95 @@
+"""Manufacturing services"""
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from auth import require_admin
+from cache import invalidation_bus
+from catalogue import catalogue
+from models import MoveRequest, Service, ServiceCreate, User
+from ordering import move
+from repositories import ServiceRepository
+
+router = APIRouter()
+
+@router.get("/services", response_model=List[Service])
+async def get_services(featured: Optional[bool] = None, services: ServiceRepository = Depends(ServiceRepository)):
+    query = {}
+    if featured is not None:
+        query["featured"] = featured
+    
+    return await catalogue.find(services, query, sort=[("order", 1)])
+
+@router.get("/services/{service_id}", response_model=Service)
+async def get_service(service_id: str, services: ServiceRepository = Depends(ServiceRepository)):
+    service = await catalogue.get_by_id_or_slug(services, service_id)
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+    return service
+
+@router.post("/services", response_model=Service)
+async def create_service(service_data: ServiceCreate, admin: User = Depends(require_admin), services: ServiceRepository = Depends(ServiceRepository)):
+    service_id = str(uuid.uuid4())
+    slug = service_data.name.lower().replace(" ", "-")
+    
+    service = {
+        "id": service_id,
+        "name": service_data.name,
+        "slug": slug,
+        "short_description": service_data.short_description,
+        "description": service_data.description,
+        "icon": service_data.icon,
+        "image_url": service_data.image_url,
+        "features": service_data.features,
+        "benefits": service_data.benefits,
+        "process_steps": service_data.process_steps,
+        "featured": service_data.featured,
+        "order": service_data.order,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    created = await services.insert(service)
+    await invalidation_bus.publish("services", service_id)
+    return created
+
+@router.put("/services/{service_id}", response_model=Service)
+async def update_service(service_id: str, service_data: ServiceCreate, admin: User = Depends(require_admin), services: ServiceRepository = Depends(ServiceRepository)):
+    slug = service_data.name.lower().replace(" ", "-")
+    
+    update_data = {
+        "name": service_data.name,
+        "slug": slug,
+        "short_description": service_data.short_description,
+        "description": service_data.description,
+        "icon": service_data.icon,
+        "image_url": service_data.image_url,
+        "features": service_data.features,
+        "benefits": service_data.benefits,
+        "process_steps": service_data.process_steps,
+        "featured": service_data.featured,
+        "order": service_data.order,
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    service = await services.update(service_id, update_data)
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+    await invalidation_bus.publish("services", service_id)
+    return service
+
+@router.post("/services/{service_id}/move", response_model=Service)
+async def move_service(service_id: str, position: MoveRequest, admin: User = Depends(require_admin), services: ServiceRepository = Depends(ServiceRepository)):
+    service = await move(services, service_id, position.after_id, position.before_id)
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+    return service
+
+@router.delete("/services/{service_id}")
+async def delete_service(service_id: str, admin: User = Depends(require_admin), services: ServiceRepository = Depends(ServiceRepository)):
+    if not await services.delete(service_id):
+        raise HTTPException(status_code=404, detail="Service not found")
+    await invalidation_bus.publish("services", service_id)
+    return {"message": "Service deleted successfully"}
@@ -0,0 +1,60 @@
+"""Site-wide settings"""
+import functools
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, Request
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from auth import require_admin
+from cache import invalidation_bus
+from compression import cached_json_response
+from database import get_db
+from models import SiteSettings, SiteSettingsUpdate, User
+
+router = APIRouter()
+
+@router.get("/settings", response_model=SiteSettings)
+async def get_settings(request: Request, db: AsyncIOMotorDatabase = Depends(get_db)):
+    return await cached_json_response(request, "settings", "", functools.partial(load_settings, db), SiteSettings)
+
+async def load_settings(db: AsyncIOMotorDatabase) -> SiteSettings:
+    settings = await db.site_settings.find_one({}, {"_id": 0})
+    if not settings:
+        # Return default settings
+        default_settings = {
+            "site_name": "Ellavera Beauty",
+            "site_tagline": "Premium Cosmetic Manufacturing",
+            "logo_text": "Ellavera Beauty",
+            "footer_text": "Premium cosmetic manufacturing solutions for your brand. We create beauty products that inspire confidence.",
+            "contact_email": "info@ellavera.com",
+            "contact_phone": "+62 123 456 7890",
+            "contact_address": "Jakarta, Indonesia",
+            "whatsapp_number": "6281234567890",
+            "whatsapp_message": "Hello Ellavera Beauty! I'm interested in your cosmetic manufacturing services.",
+            "google_maps_url": "https://www.google.com/maps/embed?pb=!1m18!1m12!1m3!1d253840.65833061103!2d106.68942995!3d-6.229386599999999!2m3!1f0!2f0!3f0!3m2!1i1024!2i768!4f13.1!3m3!1m2!1s0x2e69f3e945e34b9d%3A0x5371bf0fdad786a2!2sJakarta%2C%20Indonesia!5e0!3m2!1sen!2s!4v1620000000000!5m2!1sen!2s",
+            "facebook_url": "#",
+            "instagram_url": "#",
+            "twitter_url": "#",
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+        await db.site_settings.insert_one(default_settings)
+        settings = default_settings
+    
+    if isinstance(settings['updated_at'], str):
+        settings['updated_at'] = datetime.fromisoformat(settings['updated_at'])
+    
+    return SiteSettings(**settings)
+
+@router.put("/settings", response_model=SiteSettings)
+async def update_settings(settings_data: SiteSettingsUpdate, admin: User = Depends(require_admin), db: AsyncIOMotorDatabase = Depends(get_db)):
+    update_fields = {k: v for k, v in settings_data.model_dump().items() if v is not None}
+    update_fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+    
+    await db.site_settings.update_one({}, {"$set": update_fields}, upsert=True)
+    await invalidation_bus.publish("settings")
+    
+    settings = await db.site_settings.find_one({}, {"_id": 0})
+    if isinstance(settings['updated_at'], str):
+        settings['updated_at'] = datetime.fromisoformat(settings['updated_at'])
+    
+    return SiteSettings(**settings)
@@ -0,0 +1,54 @@
+"""Theme colours and fonts"""
+import functools
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, Request
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from auth import require_admin
+from cache import invalidation_bus
+from compression import cached_json_response
+from database import get_db
+from models import ThemeSettings, ThemeSettingsUpdate, User
+
+router = APIRouter()
+
+@router.get("/theme", response_model=ThemeSettings)
+async def get_theme(request: Request, db: AsyncIOMotorDatabase = Depends(get_db)):
+    return await cached_json_response(request, "theme", "", functools.partial(load_theme, db), ThemeSettings)
+
+async def load_theme(db: AsyncIOMotorDatabase) -> ThemeSettings:
+    theme = await db.theme_settings.find_one({}, {"_id": 0})
+    if not theme:
+        # Return default theme
+        default_theme = {
+            "primary_color": "#06b6d4",
+            "accent_color": "#0891b2",
+            "background_color": "#ffffff",
+            "text_color": "#0f172a",
+            "heading_font": "Playfair Display",
+            "body_font": "Inter",
+            "theme_mode": "light",
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+        await db.theme_settings.insert_one(default_theme)
+        theme = default_theme
+    
+    if isinstance(theme['updated_at'], str):
+        theme['updated_at'] = datetime.fromisoformat(theme['updated_at'])
+    
+    return ThemeSettings(**theme)
+
+@router.put("/theme", response_model=ThemeSettings)
+async def update_theme(theme_data: ThemeSettingsUpdate, admin: User = Depends(require_admin), db: AsyncIOMotorDatabase = Depends(get_db)):
+    update_fields = {k: v for k, v in theme_data.model_dump().items() if v is not None}
+    update_fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+    
+    await db.theme_settings.update_one({}, {"$set": update_fields}, upsert=True)
+    await invalidation_bus.publish("theme")
+    
+    theme = await db.theme_settings.find_one({}, {"_id": 0})
+    if isinstance(theme['updated_at'], str):
+        theme['updated_at'] = datetime.fromisoformat(theme['updated_at'])
+    
+    return ThemeSettings(**theme)
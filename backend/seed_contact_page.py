@@ -1,12 +1,12 @@
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
+from database import DB_NAME, create_client
+from ids import to_document
 from datetime import datetime, timezone
-import os
 import uuid
 
 async def seed_contact_page():
-    client = AsyncIOMotorClient(os.environ.get('MONGO_URL', 'mongodb://localhost:27017'))
-    db = client['ellavera_beauty']
+    client = create_client()
+    db = client[DB_NAME]
     
     print("🌱 Seeding contact page content...")
     
@@ -70,7 +70,7 @@ async def seed_contact_page():
     ]
     
     # Insert contact page sections
-    await db.page_sections.insert_many(contact_sections)
+    await db.page_sections.insert_many([to_document(doc) for doc in contact_sections])
     
     print(f"✅ Created {len(contact_sections)} contact page sections")
     print("✨ Contact page seeding completed!")
@@ -1,14 +1,14 @@
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
+from content import article_content
+from database import DB_NAME, create_client
+from ids import to_document
 from passlib.context import CryptContext
-import os
 from datetime import datetime, timezone
 import uuid
 
 # MongoDB connection
-mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
-client = AsyncIOMotorClient(mongo_url)
-db = client['ellavera_beauty']
+client = create_client()
+db = client[DB_NAME]
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -32,7 +32,7 @@ async def seed_data():
         "is_admin": True,
         "created_at": datetime.now(timezone.utc).isoformat()
     }
-    await db.users.insert_one(admin)
+    await db.users.insert_one(to_document(admin))
     print("✅ Admin user created (email: admin@ellavera.com, password: admin123)")
     
     # Create categories
@@ -42,7 +42,7 @@ async def seed_data():
         {"id": str(uuid.uuid4()), "name": "Hair Care", "slug": "hair-care", "description": "Professional hair care products", "created_at": datetime.now(timezone.utc).isoformat()},
         {"id": str(uuid.uuid4()), "name": "Fragrance", "slug": "fragrance", "description": "Signature fragrances", "created_at": datetime.now(timezone.utc).isoformat()},
     ]
-    await db.categories.insert_many(categories)
+    await db.categories.insert_many([to_document(doc) for doc in categories])
     print(f"✅ Created {len(categories)} categories")
     
     # Create sample products
@@ -52,6 +52,8 @@ async def seed_data():
             "name": "Hydrating Face Serum",
             "slug": "hydrating-face-serum",
             "category_id": categories[0]["id"],
+            "category_name": categories[0]["name"],
+            "category_slug": categories[0]["slug"],
             "description": "A luxurious, lightweight serum that deeply hydrates and revitalizes your skin. Formulated with premium ingredients for a radiant complexion.",
             "benefits": "Deeply hydrates, reduces fine lines, improves skin texture, and provides a natural glow. Suitable for all skin types.",
             "key_ingredients": "Hyaluronic Acid, Vitamin C, Niacinamide, Peptides, Natural botanical extracts",
@@ -67,6 +69,8 @@ async def seed_data():
             "name": "Nourishing Body Lotion",
             "slug": "nourishing-body-lotion",
             "category_id": categories[1]["id"],
+            "category_name": categories[1]["name"],
+            "category_slug": categories[1]["slug"],
             "description": "Rich, creamy body lotion that provides long-lasting moisture and leaves your skin feeling silky smooth.",
             "benefits": "24-hour hydration, fast-absorbing, non-greasy formula, enriched with natural oils",
             "key_ingredients": "Shea Butter, Coconut Oil, Vitamin E, Aloe Vera, Essential Oils",
@@ -82,6 +86,8 @@ async def seed_data():
             "name": "Revitalizing Shampoo",
             "slug": "revitalizing-shampoo",
             "category_id": categories[2]["id"],
+            "category_name": categories[2]["name"],
+            "category_slug": categories[2]["slug"],
             "description": "Professional-grade shampoo that cleanses, strengthens, and adds shine to your hair.",
             "benefits": "Gentle cleansing, strengthens hair, adds volume, suitable for daily use",
             "key_ingredients": "Keratin, Argan Oil, Biotin, Panthenol, Natural plant extracts",
@@ -93,7 +99,7 @@ async def seed_data():
             "updated_at": datetime.now(timezone.utc).isoformat()
         }
     ]
-    await db.products.insert_many(products)
+    await db.products.insert_many([to_document(doc) for doc in products])
     print(f"✅ Created {len(products)} sample products")
     
     # Create sample articles
@@ -102,19 +108,20 @@ async def seed_data():
             "id": str(uuid.uuid4()),
             "title": "The Future of Clean Beauty: Trends in 2025",
             "slug": "future-of-clean-beauty-2025",
-            "content": "The beauty industry is experiencing a transformative shift towards clean, sustainable, and transparent formulations. As consumers become more conscious of what they put on their skin, brands are responding with innovative solutions that prioritize both efficacy and environmental responsibility.\n\nKey trends shaping the industry include:\n\n1. Biotechnology in Beauty: Lab-grown ingredients that are more sustainable and effective than traditional sources.\n\n2. Waterless Formulations: Concentrated products that reduce water waste and packaging needs.\n\n3. Microbiome-Friendly Products: Formulations that support the skin's natural ecosystem.\n\n4. Zero-Waste Packaging: Refillable, recyclable, and biodegradable packaging solutions.\n\n5. Personalized Skincare: AI-powered formulations tailored to individual skin needs.\n\nAt Ellavera Beauty, we're committed to staying ahead of these trends while maintaining our high standards for quality and safety. We work closely with brands to develop products that meet the demands of modern consumers while respecting our planet.",
-            "excerpt": "Discover the key trends shaping the clean beauty industry in 2025 and how they're transforming cosmetic manufacturing.",
+            **article_content(
+                "The beauty industry is experiencing a transformative shift towards clean, sustainable, and transparent formulations. As consumers become more conscious of what they put on their skin, brands are responding with innovative solutions that prioritize both efficacy and environmental responsibility.\n\nKey trends shaping the industry include:\n\n1. Biotechnology in Beauty: Lab-grown ingredients that are more sustainable and effective than traditional sources.\n\n2. Waterless Formulations: Concentrated products that reduce water waste and packaging needs.\n\n3. Microbiome-Friendly Products: Formulations that support the skin's natural ecosystem.\n\n4. Zero-Waste Packaging: Refillable, recyclable, and biodegradable packaging solutions.\n\n5. Personalized Skincare: AI-powered formulations tailored to individual skin needs.\n\nAt Ellavera Beauty, we're committed to staying ahead of these trends while maintaining our high standards for quality and safety. We work closely with brands to develop products that meet the demands of modern consumers while respecting our planet.",
+                "Discover the key trends shaping the clean beauty industry in 2025 and how they're transforming cosmetic manufacturing."
+            ),
             "cover_image": "https://images.unsplash.com/photo-1596755389378-c31d21fd1273?w=1200",
             "category": "Industry Trends",
             "meta_title": "Future of Clean Beauty 2025 | Ellavera Beauty",
             "meta_description": "Explore the latest trends in clean beauty manufacturing and sustainable cosmetics for 2025.",
-            "read_time": 5,
             "published": True,
             "created_at": datetime.now(timezone.utc).isoformat(),
             "updated_at": datetime.now(timezone.utc).isoformat()
         }
     ]
-    await db.articles.insert_many(articles)
+    await db.articles.insert_many([to_document(doc) for doc in articles])
     print(f"✅ Created {len(articles)} sample articles")
     
     # Create sample clients
@@ -147,7 +154,7 @@ async def seed_data():
             "created_at": datetime.now(timezone.utc).isoformat()
         }
     ]
-    await db.clients.insert_many(clients)
+    await db.clients.insert_many([to_document(doc) for doc in clients])
     print(f"✅ Created {len(clients)} sample clients")
     
     # Create theme settings
@@ -1,12 +1,12 @@
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
+from database import DB_NAME, create_client
+from ids import to_document
 from datetime import datetime, timezone
-import os
 import uuid
 
 async def seed_page_content():
-    client = AsyncIOMotorClient(os.environ.get('MONGO_URL', 'mongodb://localhost:27017'))
-    db = client['ellavera_beauty']
+    client = create_client()
+    db = client[DB_NAME]
     
     print("🌱 Seeding page content...")
     
@@ -185,7 +185,7 @@ async def seed_page_content():
     # Insert all sections
     all_sections = homepage_sections + about_sections
     if all_sections:
-        await db.page_sections.insert_many(all_sections)
+        await db.page_sections.insert_many([to_document(doc) for doc in all_sections])
     
     print(f"✅ Created {len(homepage_sections)} homepage sections")
     print(f"✅ Created {len(about_sections)} about page sections")
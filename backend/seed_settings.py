@@ -1,11 +1,10 @@
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
+from database import DB_NAME, create_client
 from datetime import datetime, timezone
-import os
 
 async def seed_settings():
-    client = AsyncIOMotorClient(os.environ.get('MONGO_URL', 'mongodb://localhost:27017'))
-    db = client['ellavera_beauty']
+    client = create_client()
+    db = client[DB_NAME]
     
     await db.site_settings.delete_many({})
     
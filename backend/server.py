@@ -1,1630 +1,50 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Form, Query
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import StreamingResponse
-from dotenv import load_dotenv
-from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
+"""ASGI entry point: ``create_app`` builds the API from the routers package.
+
+The Mongo client is opened in the lifespan handler rather than at import,
+so every worker process owns its connection pool. ``APP_ROUTERS`` chooses
+the routers a process mounts (see routers/__init__.py) and only the
+background services those routers need are started. Development runs
+``uvicorn server:app --reload``; gunicorn.conf.py is the multi-worker
+production profile.
+"""
+import functools
 import logging
-from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
-import uuid
-from datetime import datetime, timezone, timedelta
-import jwt
-from passlib.context import CryptContext
-from emergentintegrations.llm.chat import LlmChat, UserMessage
-from emergentintegrations.llm.openai.image_generation import OpenAIImageGeneration
-import base64
-import asyncio
-import json
-import csv
-import io
-import zipfile
-
-ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / '.env')
-
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
-# JWT Configuration - Require JWT_SECRET in production, use secure default only for development
-JWT_SECRET = os.environ.get('JWT_SECRET')
-if not JWT_SECRET:
-    import secrets
-    JWT_SECRET = secrets.token_hex(32)  # Generate secure random secret if not set
-    logging.warning("JWT_SECRET not set in environment, using generated secret. Set JWT_SECRET in production!")
-JWT_ALGORITHM = os.environ.get('JWT_ALGORITHM', 'HS256')
-JWT_EXPIRATION = int(os.environ.get('JWT_EXPIRATION_HOURS', '24'))
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-security = HTTPBearer()
-
-# AI Configuration
-EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
-
-# Create the main app without a prefix
-app = FastAPI()
-
-# Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
-
-# ============= AUTH MODELS =============
-class UserCreate(BaseModel):
-    email: EmailStr
-    password: str
-    full_name: str
-
-class UserLogin(BaseModel):
-    email: EmailStr
-    password: str
-
-class User(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    email: str
-    full_name: str
-    is_admin: bool = False
-    created_at: datetime
-
-class TokenResponse(BaseModel):
-    access_token: str
-    token_type: str = "bearer"
-    user: User
-
-# ============= PRODUCT MODELS =============
-class ProductCategory(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    name: str
-    slug: str
-    description: Optional[str] = None
-    created_at: datetime
-
-class ProductCategoryCreate(BaseModel):
-    name: str
-    description: Optional[str] = None
-
-class Product(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    name: str
-    slug: str
-    category_id: str
-    category_name: Optional[str] = None
-    description: str
-    benefits: Optional[str] = None
-    key_ingredients: Optional[str] = None
-    packaging_options: Optional[str] = None
-    images: List[str] = []
-    documents: List[dict] = []  # {name, url, type}
-    featured: bool = False
-    created_at: datetime
-    updated_at: datetime
-
-class ProductCreate(BaseModel):
-    name: str
-    category_id: str
-    description: str
-    benefits: Optional[str] = None
-    key_ingredients: Optional[str] = None
-    packaging_options: Optional[str] = None
-    featured: bool = False
-
-# ============= ARTICLE MODELS =============
-class Article(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    title: str
-    slug: str
-    content: str
-    excerpt: str
-    cover_image: Optional[str] = None
-    category: str
-    meta_title: Optional[str] = None
-    meta_description: Optional[str] = None
-    read_time: int = 5
-    published: bool = False
-    created_at: datetime
-    updated_at: datetime
-
-class ArticleCreate(BaseModel):
-    title: str
-    content: str
-    excerpt: str
-    cover_image: Optional[str] = None
-    category: str
-    meta_title: Optional[str] = None
-    meta_description: Optional[str] = None
-    read_time: int = 5
-    published: bool = False
-
-# ============= CLIENT MODELS =============
-class Client(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    name: str
-    logo_url: str
-    created_at: datetime
-
-class ClientCreate(BaseModel):
-    name: str
-    logo_url: str
-
-# ============= REVIEW MODELS =============
-class Review(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    customer_name: str
-    review_text: str
-    rating: int = 5
-    position: Optional[str] = None
-    company: Optional[str] = None
-    photo_url: Optional[str] = None
-    created_at: datetime
-
-class ReviewCreate(BaseModel):
-    customer_name: str
-    review_text: str
-    rating: int = 5
-    position: Optional[str] = None
-    company: Optional[str] = None
-    photo_url: Optional[str] = None
-
-# ============= CATEGORY MODELS =============
-class Category(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    name: str
-    slug: str
-    type: str  # 'product' or 'article'
-    description: Optional[str] = None
-    order: int = 0
-    created_at: datetime
-    updated_at: datetime
-
-class CategoryCreate(BaseModel):
-    name: str
-    type: str  # 'product' or 'article'
-    description: Optional[str] = None
-    order: int = 0
-
-# ============= GALLERY MODELS =============
-class GalleryItem(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    title: str
-    description: Optional[str] = None
-    image_url: str
-    category: Optional[str] = None
-    featured: bool = False
-    order: int = 0
-    created_at: datetime
-    updated_at: datetime
-
-class GalleryItemCreate(BaseModel):
-    title: str
-    description: Optional[str] = None
-    image_url: str
-    category: Optional[str] = None
-    featured: bool = False
-    order: int = 0
-
-# ============= SERVICE MODELS =============
-class Service(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    name: str
-    slug: str
-    short_description: str
-    description: str
-    icon: str = "Sparkles"
-    image_url: Optional[str] = None
-    features: List[str] = []
-    benefits: Optional[str] = None
-    process_steps: Optional[str] = None
-    featured: bool = False
-    order: int = 0
-    created_at: datetime
-    updated_at: datetime
-
-class ServiceCreate(BaseModel):
-    name: str
-    short_description: str
-    description: str
-    icon: str = "Sparkles"
-    image_url: Optional[str] = None
-    features: List[str] = []
-    benefits: Optional[str] = None
-    process_steps: Optional[str] = None
-    featured: bool = False
-    order: int = 0
-
-# ============= THEME MODELS =============
-class ThemeSettings(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    primary_color: str = "#06b6d4"
-    accent_color: str = "#0891b2"
-    background_color: str = "#ffffff"
-    text_color: str = "#0f172a"
-    heading_font: str = "Playfair Display"
-    body_font: str = "Inter"
-    theme_mode: str = "light"
-    updated_at: datetime
-
-class ThemeSettingsUpdate(BaseModel):
-    primary_color: Optional[str] = None
-    accent_color: Optional[str] = None
-    background_color: Optional[str] = None
-    text_color: Optional[str] = None
-    heading_font: Optional[str] = None
-    body_font: Optional[str] = None
-    theme_mode: Optional[str] = None
-
-# ============= SITE SETTINGS MODELS =============
-class SiteSettings(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    site_name: str = "Ellavera Beauty"
-    site_tagline: str = "Premium Cosmetic Manufacturing"
-    logo_url: Optional[str] = None
-    favicon_url: Optional[str] = None
-    logo_text: str = "Ellavera Beauty"
-    footer_text: str = "Premium cosmetic manufacturing solutions for your brand."
-    footer_copyright: Optional[str] = None
-    footer_links_title: str = "Quick Links"
-    footer_services_title: str = "Our Services"
-    footer_contact_title: str = "Contact Us"
-    footer_services: List[str] = []
-    contact_email: str = "info@ellavera.com"
-    contact_phone: str = "+62 123 456 7890"
-    contact_address: str = "Jakarta, Indonesia"
-    whatsapp_number: str = "6281234567890"
-    whatsapp_message: str = "Hello! I'm interested in your services."
-    google_maps_url: str = "https://www.google.com/maps/embed?pb=!1m18!1m12!1m3!1d253840.65833061103!2d106.68942995!3d-6.229386599999999!2m3!1f0!2f0!3f0!3m2!1i1024!2i768!4f13.1!3m3!1m2!1s0x2e69f3e945e34b9d%3A0x5371bf0fdad786a2!2sJakarta%2C%20Indonesia!5e0!3m2!1sen!2s!4v1620000000000!5m2!1sen!2s"
-    facebook_url: str = "#"
-    instagram_url: str = "#"
-    twitter_url: str = "#"
-    linkedin_url: Optional[str] = None
-    youtube_url: Optional[str] = None
-    # Page titles and subtitles
-    page_titles: dict = {
-        "products": {"title": "Our Products", "subtitle": "Discover our range of quality products"},
-        "services": {"title": "Our Services", "subtitle": "Professional solutions for your needs"},
-        "articles": {"title": "Articles & News", "subtitle": "Latest updates and insights"},
-        "gallery": {"title": "Gallery", "subtitle": "See our work and facilities"},
-        "clients": {"title": "Our Clients", "subtitle": "Trusted by leading brands"},
-        "contact": {"title": "Contact Us", "subtitle": "Get in touch with our team"},
-        "about": {"title": "About Us", "subtitle": "Learn more about our company"}
-    }
-    updated_at: datetime
-
-class SiteSettingsUpdate(BaseModel):
-    site_name: Optional[str] = None
-    site_tagline: Optional[str] = None
-    logo_url: Optional[str] = None
-    favicon_url: Optional[str] = None
-    logo_text: Optional[str] = None
-    footer_text: Optional[str] = None
-    footer_copyright: Optional[str] = None
-    footer_links_title: Optional[str] = None
-    footer_services_title: Optional[str] = None
-    footer_contact_title: Optional[str] = None
-    footer_services: Optional[List[str]] = None
-    contact_email: Optional[str] = None
-    contact_phone: Optional[str] = None
-    contact_address: Optional[str] = None
-    whatsapp_number: Optional[str] = None
-    whatsapp_message: Optional[str] = None
-    google_maps_url: Optional[str] = None
-    facebook_url: Optional[str] = None
-    instagram_url: Optional[str] = None
-    linkedin_url: Optional[str] = None
-    youtube_url: Optional[str] = None
-    twitter_url: Optional[str] = None
-    page_titles: Optional[dict] = None
-
-# ============= CONTACT MODELS =============
-class ContactLead(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    name: str
-    email: str
-    phone: Optional[str] = None
-    company: Optional[str] = None
-    message: str
-    created_at: datetime
-
-class ContactLeadCreate(BaseModel):
-    name: str
-    email: EmailStr
-    phone: Optional[str] = None
-    company: Optional[str] = None
-    message: str
-
-# ============= PAGE SECTION MODELS =============
-class PageSection(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str
-    page_name: str
-    section_name: str
-    section_type: str  # hero, features, timeline, testimonials, etc.
-    content: dict
-    order: int
-    visible: bool = True
-    created_at: datetime
-    updated_at: datetime
-
-class PageSectionCreate(BaseModel):
-    page_name: str
-    section_name: str
-    section_type: str
-    content: dict
-    order: int
-    visible: bool = True
-
-# ============= AI MODELS =============
-class AIContentGenerateRequest(BaseModel):
-    prompt: str
-    content_type: str  # product_description, article, benefits, etc.
-
-class AIImageGenerateRequest(BaseModel):
-    prompt: str
-
-# ============= AUTH FUNCTIONS =============
-def create_access_token(data: dict) -> str:
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
-
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    try:
-        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-async def get_current_user(token_data: dict = Depends(verify_token)) -> User:
-    user = await db.users.find_one({"id": token_data.get("sub")}, {"_id": 0})
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    if isinstance(user['created_at'], str):
-        user['created_at'] = datetime.fromisoformat(user['created_at'])
-    return User(**user)
-
-async def require_admin(current_user: User = Depends(get_current_user)) -> User:
-    if not current_user.is_admin:
-        raise HTTPException(status_code=403, detail="Admin access required")
-    return current_user
-
-# ============= AUTH ROUTES =============
-@api_router.post("/auth/register", response_model=TokenResponse)
-async def register(user_data: UserCreate):
-    # Check if user exists
-    existing = await db.users.find_one({"email": user_data.email})
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Create user
-    user_id = str(uuid.uuid4())
-    hashed_password = pwd_context.hash(user_data.password)
-    
-    user = {
-        "id": user_id,
-        "email": user_data.email,
-        "full_name": user_data.full_name,
-        "password": hashed_password,
-        "is_admin": False,
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.users.insert_one(user)
-    
-    # Create token
-    token = create_access_token({"sub": user_id})
-    
-    user.pop("password")
-    user['created_at'] = datetime.fromisoformat(user['created_at'])
-    return TokenResponse(access_token=token, user=User(**user))
-
-@api_router.post("/auth/login", response_model=TokenResponse)
-async def login(credentials: UserLogin):
-    user = await db.users.find_one({"email": credentials.email})
-    if not user or not pwd_context.verify(credentials.password, user["password"]):
-        raise HTTPException(status_code=401, detail="Invalid email or password")
-    
-    token = create_access_token({"sub": user["id"]})
-    
-    user.pop("password")
-    if isinstance(user['created_at'], str):
-        user['created_at'] = datetime.fromisoformat(user['created_at'])
-    return TokenResponse(access_token=token, user=User(**user))
-
-@api_router.get("/auth/me", response_model=User)
-async def get_me(current_user: User = Depends(get_current_user)):
-    return current_user
-
-# ============= PRODUCT ROUTES =============
-@api_router.get("/products", response_model=List[Product])
-async def get_products(category_id: Optional[str] = None, featured: Optional[bool] = None):
-    query = {}
-    if category_id:
-        query["category_id"] = category_id
-    if featured is not None:
-        query["featured"] = featured
-    
-    products = await db.products.find(query, {"_id": 0}).to_list(1000)
-    
-    # Batch fetch all categories to avoid N+1 query problem
-    category_ids = list(set(p.get('category_id') for p in products if p.get('category_id')))
-    categories_list = await db.categories.find({"id": {"$in": category_ids}}, {"_id": 0, "id": 1, "name": 1}).to_list(1000) if category_ids else []
-    categories_dict = {cat['id']: cat['name'] for cat in categories_list}
-    
-    for prod in products:
-        if isinstance(prod['created_at'], str):
-            prod['created_at'] = datetime.fromisoformat(prod['created_at'])
-        if isinstance(prod['updated_at'], str):
-            prod['updated_at'] = datetime.fromisoformat(prod['updated_at'])
-        
-        # Add category name from batch-fetched dict
-        prod['category_name'] = categories_dict.get(prod.get('category_id'))
-    
-    return products
-
-@api_router.get("/products/{product_id}", response_model=Product)
-async def get_product(product_id: str):
-    product = await db.products.find_one({"id": product_id}, {"_id": 0})
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    
-    if isinstance(product['created_at'], str):
-        product['created_at'] = datetime.fromisoformat(product['created_at'])
-    if isinstance(product['updated_at'], str):
-        product['updated_at'] = datetime.fromisoformat(product['updated_at'])
-    
-    # Add category name
-    if product.get('category_id'):
-        category = await db.categories.find_one({"id": product['category_id']}, {"_id": 0})
-        product['category_name'] = category['name'] if category else None
-    
-    return Product(**product)
-
-@api_router.post("/products", response_model=Product)
-async def create_product(product_data: ProductCreate, admin: User = Depends(require_admin)):
-    product_id = str(uuid.uuid4())
-    slug = product_data.name.lower().replace(" ", "-")
-    
-    product = {
-        "id": product_id,
-        "name": product_data.name,
-        "slug": slug,
-        "category_id": product_data.category_id,
-        "description": product_data.description,
-        "benefits": product_data.benefits,
-        "key_ingredients": product_data.key_ingredients,
-        "packaging_options": product_data.packaging_options,
-        "images": [],
-        "documents": [],
-        "featured": product_data.featured,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.products.insert_one(product)
-    product['created_at'] = datetime.fromisoformat(product['created_at'])
-    product['updated_at'] = datetime.fromisoformat(product['updated_at'])
-    
-    # Add category name
-    category = await db.categories.find_one({"id": product['category_id']}, {"_id": 0})
-    product['category_name'] = category['name'] if category else None
-    
-    return Product(**product)
-
-@api_router.put("/products/{product_id}", response_model=Product)
-async def update_product(product_id: str, product_data: ProductCreate, admin: User = Depends(require_admin)):
-    existing = await db.products.find_one({"id": product_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Product not found")
-    
-    slug = product_data.name.lower().replace(" ", "-")
-    update_data = {
-        "name": product_data.name,
-        "slug": slug,
-        "category_id": product_data.category_id,
-        "description": product_data.description,
-        "benefits": product_data.benefits,
-        "key_ingredients": product_data.key_ingredients,
-        "packaging_options": product_data.packaging_options,
-        "featured": product_data.featured,
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.products.update_one({"id": product_id}, {"$set": update_data})
-    
-    product = await db.products.find_one({"id": product_id}, {"_id": 0})
-    if isinstance(product['created_at'], str):
-        product['created_at'] = datetime.fromisoformat(product['created_at'])
-    if isinstance(product['updated_at'], str):
-        product['updated_at'] = datetime.fromisoformat(product['updated_at'])
-    
-    # Add category name
-    category = await db.categories.find_one({"id": product['category_id']}, {"_id": 0})
-    product['category_name'] = category['name'] if category else None
-    
-    return Product(**product)
-
-@api_router.delete("/products/{product_id}")
-async def delete_product(product_id: str, admin: User = Depends(require_admin)):
-    result = await db.products.delete_one({"id": product_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return {"message": "Product deleted successfully"}
-
-@api_router.post("/products/{product_id}/images")
-async def add_product_image(product_id: str, image_url: str = Form(...), admin: User = Depends(require_admin)):
-    product = await db.products.find_one({"id": product_id})
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    
-    images = product.get('images', [])
-    images.append(image_url)
-    
-    await db.products.update_one({"id": product_id}, {"$set": {"images": images}})
-    return {"message": "Image added successfully", "images": images}
-
-@api_router.post("/products/{product_id}/documents")
-async def add_product_document(
-    product_id: str,
-    name: str = Form(...),
-    url: str = Form(...),
-    doc_type: str = Form(...),
-    admin: User = Depends(require_admin)
-):
-    product = await db.products.find_one({"id": product_id})
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    
-    documents = product.get('documents', [])
-    doc_id = str(uuid.uuid4())
-    documents.append({
-        "id": doc_id,
-        "name": name,
-        "url": url,
-        "type": doc_type,
-        "uploaded_at": datetime.now(timezone.utc).isoformat()
-    })
-    
-    await db.products.update_one({"id": product_id}, {"$set": {"documents": documents}})
-    return {"message": "Document added successfully", "documents": documents}
-
-@api_router.delete("/products/{product_id}/documents/{doc_id}")
-async def delete_product_document(
-    product_id: str,
-    doc_id: str,
-    admin: User = Depends(require_admin)
-):
-    product = await db.products.find_one({"id": product_id})
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    
-    documents = product.get('documents', [])
-    documents = [doc for doc in documents if doc.get('id') != doc_id]
-    
-    await db.products.update_one({"id": product_id}, {"$set": {"documents": documents}})
-    return {"message": "Document deleted successfully", "documents": documents}
-
-@api_router.post("/upload-file")
-async def upload_file(file: UploadFile = File(...), admin: User = Depends(require_admin)):
-    """Upload file and return base64 data URL"""
-    try:
-        # Read file content
-        contents = await file.read()
-        
-        # Convert to base64
-        file_base64 = base64.b64encode(contents).decode('utf-8')
-        
-        # Get file extension
-        file_ext = file.filename.split('.')[-1].lower() if '.' in file.filename else 'pdf'
-        
-        # Create data URL based on file type
-        mime_types = {
-            'pdf': 'application/pdf',
-            'doc': 'application/msword',
-            'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'xls': 'application/vnd.ms-excel',
-            'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'txt': 'text/plain',
-            'png': 'image/png',
-            'jpg': 'image/jpeg',
-            'jpeg': 'image/jpeg',
-            'gif': 'image/gif',
-            'webp': 'image/webp',
-            'svg': 'image/svg+xml'
-        }
-        
-        mime_type = mime_types.get(file_ext, 'application/octet-stream')
-        data_url = f"data:{mime_type};base64,{file_base64}"
-        
-        return {
-            "success": True,
-            "filename": file.filename,
-            "data_url": data_url,
-            "size": len(contents),
-            "type": "image" if file_ext in ['png', 'jpg', 'jpeg', 'gif', 'webp'] else "document"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
-
-@api_router.post("/upload-image")
-async def upload_image(file: UploadFile = File(...), admin: User = Depends(require_admin)):
-    """Upload image specifically and return base64 data URL"""
-    try:
-        # Validate file type
-        file_ext = file.filename.split('.')[-1].lower() if '.' in file.filename else ''
-        allowed_extensions = ['png', 'jpg', 'jpeg', 'gif', 'webp']
-        
-        if file_ext not in allowed_extensions:
-            raise HTTPException(status_code=400, detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}")
-        
-        # Read file content
-        contents = await file.read()
-        
-        # Check file size (max 2MB for images)
-        if len(contents) > 2 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="Image size must be less than 2MB")
-        
-        # Convert to base64
-        file_base64 = base64.b64encode(contents).decode('utf-8')
-        
-        # Create data URL
-        mime_types = {
-            'png': 'image/png',
-            'jpg': 'image/jpeg',
-            'jpeg': 'image/jpeg',
-            'gif': 'image/gif',
-            'webp': 'image/webp'
-        }
-        
-        mime_type = mime_types.get(file_ext, 'image/jpeg')
-        data_url = f"data:{mime_type};base64,{file_base64}"
-        
-        return {
-            "success": True,
-            "filename": file.filename,
-            "data_url": data_url,
-            "size": len(contents)
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Image upload failed: {str(e)}")
-
-# ============= ARTICLE ROUTES =============
-@api_router.get("/articles", response_model=List[Article])
-async def get_articles(category: Optional[str] = None, published: Optional[bool] = None):
-    query = {}
-    if category:
-        query["category"] = category
-    if published is not None:
-        query["published"] = published
-    
-    articles = await db.articles.find(query, {"_id": 0}).to_list(1000)
-    for article in articles:
-        if isinstance(article['created_at'], str):
-            article['created_at'] = datetime.fromisoformat(article['created_at'])
-        if isinstance(article['updated_at'], str):
-            article['updated_at'] = datetime.fromisoformat(article['updated_at'])
-    
-    return articles
-
-@api_router.get("/articles/{article_id}", response_model=Article)
-async def get_article(article_id: str):
-    article = await db.articles.find_one({"id": article_id}, {"_id": 0})
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-    
-    if isinstance(article['created_at'], str):
-        article['created_at'] = datetime.fromisoformat(article['created_at'])
-    if isinstance(article['updated_at'], str):
-        article['updated_at'] = datetime.fromisoformat(article['updated_at'])
-    
-    return Article(**article)
-
-@api_router.post("/articles", response_model=Article)
-async def create_article(article_data: ArticleCreate, admin: User = Depends(require_admin)):
-    article_id = str(uuid.uuid4())
-    slug = article_data.title.lower().replace(" ", "-")
-    
-    article = {
-        "id": article_id,
-        "title": article_data.title,
-        "slug": slug,
-        "content": article_data.content,
-        "excerpt": article_data.excerpt,
-        "cover_image": article_data.cover_image,
-        "category": article_data.category,
-        "meta_title": article_data.meta_title,
-        "meta_description": article_data.meta_description,
-        "read_time": article_data.read_time,
-        "published": article_data.published,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.articles.insert_one(article)
-    article['created_at'] = datetime.fromisoformat(article['created_at'])
-    article['updated_at'] = datetime.fromisoformat(article['updated_at'])
-    return Article(**article)
-
-@api_router.put("/articles/{article_id}", response_model=Article)
-async def update_article(article_id: str, article_data: ArticleCreate, admin: User = Depends(require_admin)):
-    existing = await db.articles.find_one({"id": article_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Article not found")
-    
-    slug = article_data.title.lower().replace(" ", "-")
-    update_data = {
-        "title": article_data.title,
-        "slug": slug,
-        "content": article_data.content,
-        "excerpt": article_data.excerpt,
-        "cover_image": article_data.cover_image,
-        "category": article_data.category,
-        "meta_title": article_data.meta_title,
-        "meta_description": article_data.meta_description,
-        "read_time": article_data.read_time,
-        "published": article_data.published,
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.articles.update_one({"id": article_id}, {"$set": update_data})
-    
-    article = await db.articles.find_one({"id": article_id}, {"_id": 0})
-    if isinstance(article['created_at'], str):
-        article['created_at'] = datetime.fromisoformat(article['created_at'])
-    if isinstance(article['updated_at'], str):
-        article['updated_at'] = datetime.fromisoformat(article['updated_at'])
-    
-    return Article(**article)
-
-@api_router.delete("/articles/{article_id}")
-async def delete_article(article_id: str, admin: User = Depends(require_admin)):
-    result = await db.articles.delete_one({"id": article_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Article not found")
-    return {"message": "Article deleted successfully"}
-
-# ============= CLIENT ROUTES =============
-@api_router.get("/clients", response_model=List[Client])
-async def get_clients():
-    clients = await db.clients.find({}, {"_id": 0}).to_list(1000)
-    for client in clients:
-        if isinstance(client['created_at'], str):
-            client['created_at'] = datetime.fromisoformat(client['created_at'])
-    return clients
-
-@api_router.post("/clients", response_model=Client)
-async def create_client(client_data: ClientCreate, admin: User = Depends(require_admin)):
-    client_id = str(uuid.uuid4())
-    
-    client = {
-        "id": client_id,
-        "name": client_data.name,
-        "logo_url": client_data.logo_url,
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.clients.insert_one(client)
-    client['created_at'] = datetime.fromisoformat(client['created_at'])
-    return Client(**client)
-
-@api_router.delete("/clients/{client_id}")
-async def delete_client(client_id: str, admin: User = Depends(require_admin)):
-    result = await db.clients.delete_one({"id": client_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Client not found")
-    return {"message": "Client deleted successfully"}
-
-
-# ============= REVIEW ROUTES =============
-@api_router.get("/reviews", response_model=List[Review])
-async def get_reviews():
-    reviews = await db.reviews.find({}, {"_id": 0}).to_list(1000)
-    for review in reviews:
-        if isinstance(review['created_at'], str):
-            review['created_at'] = datetime.fromisoformat(review['created_at'])
-    return reviews
-
-@api_router.post("/reviews", response_model=Review)
-async def create_review(review_data: ReviewCreate, admin: User = Depends(require_admin)):
-    review_id = str(uuid.uuid4())
-    
-    review = {
-        "id": review_id,
-        "customer_name": review_data.customer_name,
-        "review_text": review_data.review_text,
-        "rating": review_data.rating,
-        "position": review_data.position,
-        "company": review_data.company,
-        "photo_url": review_data.photo_url,
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.reviews.insert_one(review)
-    review['created_at'] = datetime.fromisoformat(review['created_at'])
-    return Review(**review)
-
-@api_router.put("/reviews/{review_id}", response_model=Review)
-async def update_review(review_id: str, review_data: ReviewCreate, admin: User = Depends(require_admin)):
-    existing = await db.reviews.find_one({"id": review_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Review not found")
-    
-    update_data = {
-        "customer_name": review_data.customer_name,
-        "review_text": review_data.review_text,
-        "rating": review_data.rating,
-        "position": review_data.position,
-        "company": review_data.company,
-        "photo_url": review_data.photo_url
-    }
-    
-    await db.reviews.update_one({"id": review_id}, {"$set": update_data})
-    
-    review = await db.reviews.find_one({"id": review_id}, {"_id": 0})
-    if isinstance(review['created_at'], str):
-        review['created_at'] = datetime.fromisoformat(review['created_at'])
-    
-    return Review(**review)
-
-@api_router.delete("/reviews/{review_id}")
-async def delete_review(review_id: str, admin: User = Depends(require_admin)):
-    result = await db.reviews.delete_one({"id": review_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Review not found")
-    return {"message": "Review deleted successfully"}
-
-# ============= CATEGORY ROUTES =============
-@api_router.get("/categories")
-async def get_categories(category_type: Optional[str] = Query(None, alias="type")):
-    query = {}
-    if category_type:
-        query["type"] = category_type
-    
-    categories = await db.categories.find(query, {"_id": 0}).sort("order", 1).to_list(1000)
-    
-    result = []
-    for cat in categories:
-        if isinstance(cat.get('created_at'), str):
-            cat['created_at'] = datetime.fromisoformat(cat['created_at'])
-        if isinstance(cat.get('updated_at'), str):
-            cat['updated_at'] = datetime.fromisoformat(cat['updated_at'])
-        result.append({
-            "id": cat["id"],
-            "name": cat["name"],
-            "slug": cat["slug"],
-            "type": cat.get("type", ""),
-            "description": cat.get("description"),
-            "order": cat.get("order", 0),
-            "created_at": cat["created_at"],
-            "updated_at": cat.get("updated_at", cat["created_at"])
-        })
-    return result
-
-@api_router.get("/categories/{category_id}", response_model=Category)
-async def get_category(category_id: str):
-    category = await db.categories.find_one({"id": category_id}, {"_id": 0})
-    if not category:
-        category = await db.categories.find_one({"slug": category_id}, {"_id": 0})
-    if not category:
-        raise HTTPException(status_code=404, detail="Category not found")
-    
-    if isinstance(category.get('created_at'), str):
-        category['created_at'] = datetime.fromisoformat(category['created_at'])
-    if isinstance(category.get('updated_at'), str):
-        category['updated_at'] = datetime.fromisoformat(category['updated_at'])
-    
-    return Category(**category)
-
-@api_router.post("/categories", response_model=Category)
-async def create_category(cat_data: CategoryCreate, admin: User = Depends(require_admin)):
-    category_id = str(uuid.uuid4())
-    slug = cat_data.name.lower().replace(" ", "-")
-    
-    # Check if slug already exists for this type
-    existing = await db.categories.find_one({"slug": slug, "type": cat_data.type})
-    if existing:
-        raise HTTPException(status_code=400, detail="Category with this name already exists")
-    
-    category = {
-        "id": category_id,
-        "name": cat_data.name,
-        "slug": slug,
-        "type": cat_data.type,
-        "description": cat_data.description,
-        "order": cat_data.order,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.categories.insert_one(category)
-    category['created_at'] = datetime.fromisoformat(category['created_at'])
-    category['updated_at'] = datetime.fromisoformat(category['updated_at'])
-    
-    return Category(**category)
-
-@api_router.put("/categories/{category_id}", response_model=Category)
-async def update_category(category_id: str, cat_data: CategoryCreate, admin: User = Depends(require_admin)):
-    existing = await db.categories.find_one({"id": category_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Category not found")
-    
-    slug = cat_data.name.lower().replace(" ", "-")
-    
-    update_data = {
-        "name": cat_data.name,
-        "slug": slug,
-        "description": cat_data.description,
-        "order": cat_data.order,
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.categories.update_one({"id": category_id}, {"$set": update_data})
-    
-    category = await db.categories.find_one({"id": category_id}, {"_id": 0})
-    if isinstance(category.get('created_at'), str):
-        category['created_at'] = datetime.fromisoformat(category['created_at'])
-    if isinstance(category.get('updated_at'), str):
-        category['updated_at'] = datetime.fromisoformat(category['updated_at'])
-    
-    return Category(**category)
-
-@api_router.delete("/categories/{category_id}")
-async def delete_category(category_id: str, admin: User = Depends(require_admin)):
-    result = await db.categories.delete_one({"id": category_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Category not found")
-    return {"message": "Category deleted successfully"}
-
-# ============= GALLERY ROUTES =============
-@api_router.get("/gallery", response_model=List[GalleryItem])
-async def get_gallery(category: Optional[str] = None, featured: Optional[bool] = None):
-    query = {}
-    if category:
-        query["category"] = category
-    if featured is not None:
-        query["featured"] = featured
-    
-    items = await db.gallery.find(query, {"_id": 0}).sort("order", 1).to_list(1000)
-    for item in items:
-        if isinstance(item.get('created_at'), str):
-            item['created_at'] = datetime.fromisoformat(item['created_at'])
-        if isinstance(item.get('updated_at'), str):
-            item['updated_at'] = datetime.fromisoformat(item['updated_at'])
-    return items
-
-@api_router.get("/gallery/categories")
-async def get_gallery_categories():
-    categories = await db.gallery.distinct("category")
-    return [c for c in categories if c]
-
-@api_router.get("/gallery/{item_id}", response_model=GalleryItem)
-async def get_gallery_item(item_id: str):
-    item = await db.gallery.find_one({"id": item_id}, {"_id": 0})
-    if not item:
-        raise HTTPException(status_code=404, detail="Gallery item not found")
-    
-    if isinstance(item.get('created_at'), str):
-        item['created_at'] = datetime.fromisoformat(item['created_at'])
-    if isinstance(item.get('updated_at'), str):
-        item['updated_at'] = datetime.fromisoformat(item['updated_at'])
-    
-    return GalleryItem(**item)
-
-@api_router.post("/gallery", response_model=GalleryItem)
-async def create_gallery_item(item_data: GalleryItemCreate, admin: User = Depends(require_admin)):
-    item_id = str(uuid.uuid4())
-    
-    item = {
-        "id": item_id,
-        "title": item_data.title,
-        "description": item_data.description,
-        "image_url": item_data.image_url,
-        "category": item_data.category,
-        "featured": item_data.featured,
-        "order": item_data.order,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.gallery.insert_one(item)
-    item['created_at'] = datetime.fromisoformat(item['created_at'])
-    item['updated_at'] = datetime.fromisoformat(item['updated_at'])
-    
-    return GalleryItem(**item)
-
-@api_router.put("/gallery/{item_id}", response_model=GalleryItem)
-async def update_gallery_item(item_id: str, item_data: GalleryItemCreate, admin: User = Depends(require_admin)):
-    existing = await db.gallery.find_one({"id": item_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Gallery item not found")
-    
-    update_data = {
-        "title": item_data.title,
-        "description": item_data.description,
-        "image_url": item_data.image_url,
-        "category": item_data.category,
-        "featured": item_data.featured,
-        "order": item_data.order,
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.gallery.update_one({"id": item_id}, {"$set": update_data})
-    
-    item = await db.gallery.find_one({"id": item_id}, {"_id": 0})
-    if isinstance(item.get('created_at'), str):
-        item['created_at'] = datetime.fromisoformat(item['created_at'])
-    if isinstance(item.get('updated_at'), str):
-        item['updated_at'] = datetime.fromisoformat(item['updated_at'])
-    
-    return GalleryItem(**item)
-
-@api_router.delete("/gallery/{item_id}")
-async def delete_gallery_item(item_id: str, admin: User = Depends(require_admin)):
-    result = await db.gallery.delete_one({"id": item_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Gallery item not found")
-    return {"message": "Gallery item deleted successfully"}
-
-# ============= SERVICE ROUTES =============
-@api_router.get("/services", response_model=List[Service])
-async def get_services(featured: Optional[bool] = None):
-    query = {}
-    if featured is not None:
-        query["featured"] = featured
-    
-    services = await db.services.find(query, {"_id": 0}).sort("order", 1).to_list(1000)
-    for service in services:
-        if isinstance(service.get('created_at'), str):
-            service['created_at'] = datetime.fromisoformat(service['created_at'])
-        if isinstance(service.get('updated_at'), str):
-            service['updated_at'] = datetime.fromisoformat(service['updated_at'])
-    return services
-
-@api_router.get("/services/{service_id}", response_model=Service)
-async def get_service(service_id: str):
-    service = await db.services.find_one({"id": service_id}, {"_id": 0})
-    if not service:
-        # Try finding by slug
-        service = await db.services.find_one({"slug": service_id}, {"_id": 0})
-    if not service:
-        raise HTTPException(status_code=404, detail="Service not found")
-    
-    if isinstance(service.get('created_at'), str):
-        service['created_at'] = datetime.fromisoformat(service['created_at'])
-    if isinstance(service.get('updated_at'), str):
-        service['updated_at'] = datetime.fromisoformat(service['updated_at'])
-    
-    return Service(**service)
-
-@api_router.post("/services", response_model=Service)
-async def create_service(service_data: ServiceCreate, admin: User = Depends(require_admin)):
-    service_id = str(uuid.uuid4())
-    slug = service_data.name.lower().replace(" ", "-")
-    
-    service = {
-        "id": service_id,
-        "name": service_data.name,
-        "slug": slug,
-        "short_description": service_data.short_description,
-        "description": service_data.description,
-        "icon": service_data.icon,
-        "image_url": service_data.image_url,
-        "features": service_data.features,
-        "benefits": service_data.benefits,
-        "process_steps": service_data.process_steps,
-        "featured": service_data.featured,
-        "order": service_data.order,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.services.insert_one(service)
-    service['created_at'] = datetime.fromisoformat(service['created_at'])
-    service['updated_at'] = datetime.fromisoformat(service['updated_at'])
-    
-    return Service(**service)
-
-@api_router.put("/services/{service_id}", response_model=Service)
-async def update_service(service_id: str, service_data: ServiceCreate, admin: User = Depends(require_admin)):
-    existing = await db.services.find_one({"id": service_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Service not found")
-    
-    slug = service_data.name.lower().replace(" ", "-")
-    
-    update_data = {
-        "name": service_data.name,
-        "slug": slug,
-        "short_description": service_data.short_description,
-        "description": service_data.description,
-        "icon": service_data.icon,
-        "image_url": service_data.image_url,
-        "features": service_data.features,
-        "benefits": service_data.benefits,
-        "process_steps": service_data.process_steps,
-        "featured": service_data.featured,
-        "order": service_data.order,
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.services.update_one({"id": service_id}, {"$set": update_data})
-    
-    service = await db.services.find_one({"id": service_id}, {"_id": 0})
-    if isinstance(service.get('created_at'), str):
-        service['created_at'] = datetime.fromisoformat(service['created_at'])
-    if isinstance(service.get('updated_at'), str):
-        service['updated_at'] = datetime.fromisoformat(service['updated_at'])
-    
-    return Service(**service)
-
-@api_router.delete("/services/{service_id}")
-async def delete_service(service_id: str, admin: User = Depends(require_admin)):
-    result = await db.services.delete_one({"id": service_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Service not found")
-    return {"message": "Service deleted successfully"}
-
-# ============= THEME ROUTES =============
-@api_router.get("/theme", response_model=ThemeSettings)
-async def get_theme():
-    theme = await db.theme_settings.find_one({}, {"_id": 0})
-    if not theme:
-        # Return default theme
-        default_theme = {
-            "primary_color": "#06b6d4",
-            "accent_color": "#0891b2",
-            "background_color": "#ffffff",
-            "text_color": "#0f172a",
-            "heading_font": "Playfair Display",
-            "body_font": "Inter",
-            "theme_mode": "light",
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }
-        await db.theme_settings.insert_one(default_theme)
-        theme = default_theme
-    
-    if isinstance(theme['updated_at'], str):
-        theme['updated_at'] = datetime.fromisoformat(theme['updated_at'])
-    
-    return ThemeSettings(**theme)
-
-@api_router.put("/theme", response_model=ThemeSettings)
-async def update_theme(theme_data: ThemeSettingsUpdate, admin: User = Depends(require_admin)):
-    update_fields = {k: v for k, v in theme_data.model_dump().items() if v is not None}
-    update_fields["updated_at"] = datetime.now(timezone.utc).isoformat()
-    
-    await db.theme_settings.update_one({}, {"$set": update_fields}, upsert=True)
-    
-    theme = await db.theme_settings.find_one({}, {"_id": 0})
-    if isinstance(theme['updated_at'], str):
-        theme['updated_at'] = datetime.fromisoformat(theme['updated_at'])
-    
-    return ThemeSettings(**theme)
-
-# ============= CONTACT ROUTES =============
-@api_router.post("/contact", response_model=ContactLead)
-async def create_contact_lead(lead_data: ContactLeadCreate):
-    lead_id = str(uuid.uuid4())
-    
-    lead = {
-        "id": lead_id,
-        "name": lead_data.name,
-        "email": lead_data.email,
-        "phone": lead_data.phone,
-        "company": lead_data.company,
-        "message": lead_data.message,
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.contact_leads.insert_one(lead)
-    lead['created_at'] = datetime.fromisoformat(lead['created_at'])
-    return ContactLead(**lead)
-
-@api_router.get("/contact/leads", response_model=List[ContactLead])
-async def get_contact_leads(admin: User = Depends(require_admin)):
-    leads = await db.contact_leads.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    for lead in leads:
-        if isinstance(lead['created_at'], str):
-            lead['created_at'] = datetime.fromisoformat(lead['created_at'])
-    return leads
-
-# ============= PAGE SECTION ROUTES =============
-@api_router.get("/pages/{page_name}/sections", response_model=List[PageSection])
-async def get_page_sections(page_name: str):
-    sections = await db.page_sections.find({"page_name": page_name}, {"_id": 0}).sort("order", 1).to_list(1000)
-    for section in sections:
-        if isinstance(section['created_at'], str):
-            section['created_at'] = datetime.fromisoformat(section['created_at'])
-        if isinstance(section['updated_at'], str):
-            section['updated_at'] = datetime.fromisoformat(section['updated_at'])
-    return sections
-
-@api_router.post("/pages/sections", response_model=PageSection)
-async def create_page_section(section_data: PageSectionCreate, admin: User = Depends(require_admin)):
-    section_id = str(uuid.uuid4())
-    
-    section = {
-        "id": section_id,
-        "page_name": section_data.page_name,
-        "section_name": section_data.section_name,
-        "section_type": section_data.section_type,
-        "content": section_data.content,
-        "order": section_data.order,
-        "visible": section_data.visible,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.page_sections.insert_one(section)
-    section['created_at'] = datetime.fromisoformat(section['created_at'])
-    section['updated_at'] = datetime.fromisoformat(section['updated_at'])
-    return PageSection(**section)
-
-@api_router.put("/pages/sections/{section_id}", response_model=PageSection)
-async def update_page_section(section_id: str, section_data: PageSectionCreate, admin: User = Depends(require_admin)):
-    existing = await db.page_sections.find_one({"id": section_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Section not found")
-    
-    update_data = {
-        "page_name": section_data.page_name,
-        "section_name": section_data.section_name,
-        "section_type": section_data.section_type,
-        "content": section_data.content,
-        "order": section_data.order,
-        "visible": section_data.visible,
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.page_sections.update_one({"id": section_id}, {"$set": update_data})
-    
-    section = await db.page_sections.find_one({"id": section_id}, {"_id": 0})
-    if isinstance(section['created_at'], str):
-        section['created_at'] = datetime.fromisoformat(section['created_at'])
-    if isinstance(section['updated_at'], str):
-        section['updated_at'] = datetime.fromisoformat(section['updated_at'])
-    
-    return PageSection(**section)
-
-@api_router.delete("/pages/sections/{section_id}")
-async def delete_page_section(section_id: str, admin: User = Depends(require_admin)):
-    result = await db.page_sections.delete_one({"id": section_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Section not found")
-    return {"message": "Section deleted successfully"}
-
-# ============= SITE SETTINGS ROUTES =============
-@api_router.get("/settings", response_model=SiteSettings)
-async def get_settings():
-    settings = await db.site_settings.find_one({}, {"_id": 0})
-    if not settings:
-        # Return default settings
-        default_settings = {
-            "site_name": "Ellavera Beauty",
-            "site_tagline": "Premium Cosmetic Manufacturing",
-            "logo_text": "Ellavera Beauty",
-            "footer_text": "Premium cosmetic manufacturing solutions for your brand. We create beauty products that inspire confidence.",
-            "contact_email": "info@ellavera.com",
-            "contact_phone": "+62 123 456 7890",
-            "contact_address": "Jakarta, Indonesia",
-            "whatsapp_number": "6281234567890",
-            "whatsapp_message": "Hello Ellavera Beauty! I'm interested in your cosmetic manufacturing services.",
-            "google_maps_url": "https://www.google.com/maps/embed?pb=!1m18!1m12!1m3!1d253840.65833061103!2d106.68942995!3d-6.229386599999999!2m3!1f0!2f0!3f0!3m2!1i1024!2i768!4f13.1!3m3!1m2!1s0x2e69f3e945e34b9d%3A0x5371bf0fdad786a2!2sJakarta%2C%20Indonesia!5e0!3m2!1sen!2s!4v1620000000000!5m2!1sen!2s",
-            "facebook_url": "#",
-            "instagram_url": "#",
-            "twitter_url": "#",
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }
-        await db.site_settings.insert_one(default_settings)
-        settings = default_settings
-    
-    if isinstance(settings['updated_at'], str):
-        settings['updated_at'] = datetime.fromisoformat(settings['updated_at'])
-    
-    return SiteSettings(**settings)
-
-@api_router.put("/settings", response_model=SiteSettings)
-async def update_settings(settings_data: SiteSettingsUpdate, admin: User = Depends(require_admin)):
-    update_fields = {k: v for k, v in settings_data.model_dump().items() if v is not None}
-    update_fields["updated_at"] = datetime.now(timezone.utc).isoformat()
-    
-    await db.site_settings.update_one({}, {"$set": update_fields}, upsert=True)
-    
-    settings = await db.site_settings.find_one({}, {"_id": 0})
-    if isinstance(settings['updated_at'], str):
-        settings['updated_at'] = datetime.fromisoformat(settings['updated_at'])
-    
-    return SiteSettings(**settings)
-
-# ============= AI ROUTES =============
-@api_router.post("/ai/generate-content")
-async def generate_content(request: AIContentGenerateRequest, admin: User = Depends(require_admin)):
-    if not EMERGENT_LLM_KEY:
-        raise HTTPException(status_code=500, detail="AI service not configured")
-    
-    try:
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=str(uuid.uuid4()),
-            system_message=f"You are a professional cosmetic product copywriter. Generate {request.content_type} content that is elegant, premium, and compelling."
-        ).with_model("openai", "gpt-5.1")
-        
-        user_message = UserMessage(text=request.prompt)
-        response = await chat.send_message(user_message)
-        
-        return {"content": response}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"AI generation failed: {str(e)}")
-
-@api_router.post("/ai/generate-image")
-async def generate_image(request: AIImageGenerateRequest, admin: User = Depends(require_admin)):
-    if not EMERGENT_LLM_KEY:
-        raise HTTPException(status_code=500, detail="AI service not configured")
-    
-    try:
-        image_gen = OpenAIImageGeneration(api_key=EMERGENT_LLM_KEY)
-        images = await image_gen.generate_images(
-            prompt=request.prompt,
-            model="gpt-image-1",
-            number_of_images=1
-        )
-        
-        if images and len(images) > 0:
-            image_base64 = base64.b64encode(images[0]).decode('utf-8')
-            return {"image_base64": image_base64}
-        else:
-            raise HTTPException(status_code=500, detail="No image was generated")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Image generation failed: {str(e)}")
-
-# ============= BACKUP ROUTES =============
-def generate_sql_insert(table_name: str, documents: list) -> str:
-    """Generate SQL INSERT statements from documents"""
-    if not documents:
-        return f"-- No data in {table_name}\n"
-    
-    lines = [f"-- Table: {table_name}", f"-- Records: {len(documents)}\n"]
-    
-    # Get all unique keys
-    all_keys = set()
-    for doc in documents:
-        all_keys.update(doc.keys())
-    columns = sorted(list(all_keys))
-    
-    # Generate INSERT statements
-    for doc in documents:
-        values = []
-        for col in columns:
-            val = doc.get(col)
-            if val is None:
-                values.append("NULL")
-            elif isinstance(val, bool):
-                values.append("1" if val else "0")
-            elif isinstance(val, (int, float)):
-                values.append(str(val))
-            elif isinstance(val, datetime):
-                values.append(f"'{val.isoformat()}'")
-            elif isinstance(val, (list, dict)):
-                # Store as JSON string
-                json_str = json.dumps(val, ensure_ascii=False).replace("'", "''")
-                values.append(f"'{json_str}'")
-            else:
-                # Escape single quotes
-                str_val = str(val).replace("'", "''")
-                values.append(f"'{str_val}'")
-        
-        cols_str = ", ".join([f"`{c}`" for c in columns])
-        vals_str = ", ".join(values)
-        lines.append(f"INSERT INTO `{table_name}` ({cols_str}) VALUES ({vals_str});")
-    
-    return "\n".join(lines) + "\n\n"
-
-@api_router.get("/admin/backup")
-async def backup_data(
-    format: str = Query("json", enum=["json", "csv", "sql"]), 
-    include_media: bool = Query(False, description="Extract and include media files separately"),
-    admin: User = Depends(require_admin)
-):
-    """Export all data from database in JSON, CSV, or SQL format (ZIP file)"""
-    
-    collections_to_backup = [
-        ("products", db.products),
-        ("articles", db.articles),
-        ("clients", db.clients),
-        ("reviews", db.reviews),
-        ("services", db.services),
-        ("gallery_items", db.gallery_items),
-        ("categories", db.categories),
-        ("page_sections", db.page_sections),
-        ("contact_leads", db.contact_leads),
-        ("users", db.users),
-    ]
-    
-    try:
-        # Create a ZIP file in memory
-        zip_buffer = io.BytesIO()
-        media_count = 0
-        
-        def extract_base64_images(obj, path=""):
-            """Recursively extract base64 images from object and return list of (filename, data)"""
-            images = []
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    if isinstance(value, str) and value.startswith("data:image"):
-                        # Extract base64 image
-                        try:
-                            mime_match = value.split(";")[0].split(":")[1] if ":" in value else "image/png"
-                            ext = mime_match.split("/")[1] if "/" in mime_match else "png"
-                            if ext == "jpeg":
-                                ext = "jpg"
-                            b64_data = value.split(",")[1] if "," in value else value
-                            images.append((f"{path}_{key}.{ext}", base64.b64decode(b64_data)))
-                        except:
-                            pass
-                    elif isinstance(value, (dict, list)):
-                        images.extend(extract_base64_images(value, f"{path}_{key}"))
-            elif isinstance(obj, list):
-                for idx, item in enumerate(obj):
-                    images.extend(extract_base64_images(item, f"{path}_{idx}"))
-            return images
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for collection_name, collection in collections_to_backup:
-                # Fetch all documents from collection
-                documents = await collection.find({}, {"_id": 0}).to_list(10000)
-                
-                # Extract media files if requested
-                if include_media:
-                    for idx, doc in enumerate(documents):
-                        doc_id = doc.get("id", str(idx))
-                        images = extract_base64_images(doc, f"{collection_name}/{doc_id}")
-                        for filename, img_data in images:
-                            zip_file.writestr(f"media/{filename}", img_data)
-                            media_count += 1
-                
-                if format == "json":
-                    # Convert datetime objects to ISO strings for JSON serialization
-                    for doc in documents:
-                        for key, value in doc.items():
-                            if isinstance(value, datetime):
-                                doc[key] = value.isoformat()
-                    
-                    content = json.dumps(documents, indent=2, ensure_ascii=False)
-                    zip_file.writestr(f"{collection_name}.json", content)
-                
-                elif format == "csv":
-                    if documents:
-                        output = io.StringIO()
-                        # Get all unique keys from all documents
-                        all_keys = set()
-                        for doc in documents:
-                            all_keys.update(doc.keys())
-                        fieldnames = sorted(list(all_keys))
-                        
-                        writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction='ignore')
-                        writer.writeheader()
-                        
-                        for doc in documents:
-                            # Convert complex types to strings
-                            row = {}
-                            for key, value in doc.items():
-                                if isinstance(value, (list, dict)):
-                                    row[key] = json.dumps(value, ensure_ascii=False)
-                                elif isinstance(value, datetime):
-                                    row[key] = value.isoformat()
-                                else:
-                                    row[key] = value
-                            writer.writerow(row)
-                        
-                        zip_file.writestr(f"{collection_name}.csv", output.getvalue())
-                
-                elif format == "sql":
-                    sql_content = generate_sql_insert(collection_name, documents)
-                    zip_file.writestr(f"{collection_name}.sql", sql_content)
-            
-            # Also backup settings
-            settings = await db.settings.find_one({}, {"_id": 0})
-            if settings:
-                if format == "json":
-                    for key, value in settings.items():
-                        if isinstance(value, datetime):
-                            settings[key] = value.isoformat()
-                    zip_file.writestr("settings.json", json.dumps(settings, indent=2, ensure_ascii=False))
-                elif format == "csv":
-                    for key, value in settings.items():
-                        if isinstance(value, datetime):
-                            settings[key] = value.isoformat()
-                    output = io.StringIO()
-                    writer = csv.DictWriter(output, fieldnames=list(settings.keys()))
-                    writer.writeheader()
-                    writer.writerow(settings)
-                    zip_file.writestr("settings.csv", output.getvalue())
-                elif format == "sql":
-                    sql_content = generate_sql_insert("settings", [settings])
-                    zip_file.writestr("settings.sql", sql_content)
-            
-            # Backup theme
-            theme = await db.theme.find_one({}, {"_id": 0})
-            if theme:
-                if format == "json":
-                    for key, value in theme.items():
-                        if isinstance(value, datetime):
-                            theme[key] = value.isoformat()
-                    zip_file.writestr("theme.json", json.dumps(theme, indent=2, ensure_ascii=False))
-                elif format == "csv":
-                    for key, value in theme.items():
-                        if isinstance(value, datetime):
-                            theme[key] = value.isoformat()
-                    output = io.StringIO()
-                    writer = csv.DictWriter(output, fieldnames=list(theme.keys()))
-                    writer.writeheader()
-                    writer.writerow(theme)
-                    zip_file.writestr("theme.csv", output.getvalue())
-                elif format == "sql":
-                    sql_content = generate_sql_insert("theme", [theme])
-                    zip_file.writestr("theme.sql", sql_content)
-        
-        zip_buffer.seek(0)
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"backup_{timestamp}.zip"
-        
-        return StreamingResponse(
-            zip_buffer,
-            media_type="application/zip",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Backup failed: {str(e)}")
-
-@api_router.get("/admin/backup/stats")
-async def backup_stats(admin: User = Depends(require_admin)):
-    """Get statistics about data that will be backed up"""
-    
-    stats = {
-        "products": await db.products.count_documents({}),
-        "articles": await db.articles.count_documents({}),
-        "clients": await db.clients.count_documents({}),
-        "reviews": await db.reviews.count_documents({}),
-        "services": await db.services.count_documents({}),
-        "gallery_items": await db.gallery_items.count_documents({}),
-        "categories": await db.categories.count_documents({}),
-        "page_sections": await db.page_sections.count_documents({}),
-        "contact_leads": await db.contact_leads.count_documents({}),
-        "users": await db.users.count_documents({}),
-    }
-    
-    stats["total"] = sum(stats.values())
-    
-    return stats
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
 
-# Include the router in the main app
-app.include_router(api_router)
+from fastapi import APIRouter, FastAPI, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pymongo.errors import PyMongoError
+from starlette.middleware.cors import CORSMiddleware
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+from cache import invalidation_bus
+from catalogue import catalogue
+from compression import CompressionMiddleware
+from database import DB_NAME, MONGO_URL, create_client, warmup
+from leads import lead_writer
+from media import media_store
+from metrics import MetricsMiddleware, METRICS_TOKEN, event_loop_monitor, mongo_listener, render_metrics
+from ordering import rebalancer
+from profiling import ProfilingMiddleware, get_profiling_settings, profiling_listener
+from ratelimit import RateLimitExceeded, rate_limiter
+from related import related_indexer
+from resilience import MongoUnavailable
+from routers import load_router, resolve_routers
+
+# Routers this process serves; e.g. "public" for read workers, "all" for a single process
+APP_ROUTERS = os.environ.get('APP_ROUTERS', 'all')
+
+# Public reads fetched once after startup so the first visitors hit warm caches, with their router
+WARMUP_PATHS = {
+    "/api/settings": "settings",
+    "/api/theme": "theme",
+    "/api/categories": "categories",
+    "/api/pages/home/sections": "pages",
+    "/api/products": "products",
+    "/api/products?featured=true": "products",
+    "/api/articles": "articles",
+}
 
 # Configure logging
 logging.basicConfig(
@@ -1633,6 +53,127 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+# ============= LIFESPAN =============
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    mounted = set(app.state.routers)
+    # Created here, after the worker process has forked, so pools are never shared
+    client = create_client(MONGO_URL, event_listeners=[mongo_listener, profiling_listener])
+    db = client[DB_NAME]
+    app.state.client = client
+    app.state.db = db
+
+    await invalidation_bus.start(db)
+    if mounted & {"products", "categories", "services", "gallery", "clients", "reviews"}:
+        await catalogue.start(db)
+    if mounted & {"media", "ai", "admin"}:
+        await media_store.start(db)
+    if mounted & {"auth", "contact"}:
+        await rate_limiter.start(db)
+    if "admin" in mounted:
+        try:
+            # Recently updated lists on the admin dashboard
+            await db.products.create_index([("updated_at", -1)])
+            await db.articles.create_index([("updated_at", -1)])
+        except PyMongoError as e:
+            logger.warning("Could not create updated_at indexes: %s", e)
+    if mounted & {"products", "articles"}:
+        # Product and article writes live in these routers
+        await related_indexer.start(db)
+    if "contact" in mounted:
+        await lead_writer.start(db)
+    if mounted & {"categories", "gallery", "services", "pages"}:
+        await rebalancer.start(db)
+    if "ai" in mounted:
+        from ai import ai_executor
+        from ai_batches import ai_batch_runner
+        from ai_jobs import ai_job_runner
+
+        await ai_executor.start(db)
+        await ai_job_runner.start(db)
+        await ai_batch_runner.start(db)
+    event_loop_monitor.start()
+    warmup.start(client, db, {
+        path: functools.partial(prime_path, app, path)
+        for path, router in WARMUP_PATHS.items() if router in mounted
+    })
+
+    yield
+
+    await warmup.stop()
+    if "ai" in mounted:
+        await ai_batch_runner.stop()
+        await ai_job_runner.stop()
+    if "contact" in mounted:
+        await lead_writer.stop()
+    await rebalancer.stop()
+    await related_indexer.stop()
+    await catalogue.stop()
+    await invalidation_bus.stop()
+    await event_loop_monitor.stop()
+    client.close()
+
+async def prime_path(app: FastAPI, path: str) -> None:
+    import httpx  # only needed once per worker, at warm-up
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as warm_client:
+        # Brotli and gzip bodies are cached per encoding, so ask for both
+        for encoding in ("br", "gzip"):
+            response = await warm_client.get(path, headers={"Accept-Encoding": encoding})
+            response.raise_for_status()
+
+# ============= METRICS =============
+async def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus scrape endpoint; each worker reports its own series"""
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# ============= RATE LIMITING =============
+async def rate_limit_exceeded(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many requests, try again later"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+# ============= MONGO OUTAGES =============
+async def mongo_unavailable(request: Request, exc: MongoUnavailable):
+    # Only reached when there is no earlier response to serve instead
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Service temporarily unavailable, try again later"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+# ============= APP FACTORY =============
+def create_app(routers: str = APP_ROUTERS) -> FastAPI:
+    """Build the app with the given routers; the database opens when the app starts"""
+    app = FastAPI(lifespan=lifespan)
+    app.state.routers = resolve_routers(routers)
+
+    # All routes live under /api
+    api_router = APIRouter(prefix="/api")
+    for name in app.state.routers:
+        api_router.include_router(load_router(name))
+    app.include_router(api_router)
+
+    app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded)
+    app.add_exception_handler(MongoUnavailable, mongo_unavailable)
+
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(ProfilingMiddleware, settings_loader=lambda: get_profiling_settings(app.state.db))
+    app.add_middleware(MetricsMiddleware)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    return app
+
+app = create_app()
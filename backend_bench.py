@@ -0,0 +1,671 @@
+"""Load and latency benchmark for the Ellavera Beauty API.
+
+Seeds a database with synthetic data (N products, M articles, K base64
+images), drives concurrent async load against every public and admin route
+and reports RPS, p50/p95/p99 latency and memory. Results are saved as JSON
+under bench_results/<commit>.json so runs can be compared across commits.
+
+Examples:
+    # In-process app on the in-memory store, no MongoDB needed
+    python backend_bench.py --products 500 --articles 200 --images 50
+
+    # In-process app on a local MongoDB
+    python backend_bench.py --mongo-url mongodb://localhost:27017
+
+    # Running server (seeded through --mongo-url), server RSS read from its pid
+    python backend_bench.py --base-url http://localhost:8001 --mongo-url mongodb://localhost:27017 --server-pid 1234
+
+    # Fail when p95 regressed more than 20% against a saved baseline
+    python backend_bench.py --compare bench_results/5ad68b2.json
+"""
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+ROOT_DIR = Path(__file__).parent
+BACKEND_DIR = ROOT_DIR / "backend"
+RESULTS_DIR = ROOT_DIR / "bench_results"
+
+ADMIN_EMAIL = "bench-admin@ellavera.com"
+ADMIN_PASSWORD = "bench-admin-password"
+
+WORDS = (
+    "hydrating serum botanical extract gentle formula radiant skin niacinamide peptide vitamin "
+    "moisture barrier repair soothing lightweight texture premium natural fragrance free cream "
+    "lotion cleanser toner mask essence sunscreen retinol hyaluronic ceramide glow brightening"
+).split()
+
+
+# ============= SYNTHETIC DATA =============
+class SyntheticData:
+    """Deterministic synthetic catalogue, sized by the command line"""
+
+    def __init__(self, products: int, articles: int, images: int, image_kb: int, leads: int, seed: int = 42):
+        self.rng = random.Random(seed)
+        self.counts = {"products": products, "articles": articles, "images": images, "image_kb": image_kb, "leads": leads}
+        self.images = [self._image(image_kb) for _ in range(images)]
+
+    def _image(self, size_kb: int) -> str:
+        payload = self.rng.randbytes(size_kb * 1024)
+        return "data:image/png;base64," + base64.b64encode(payload).decode("ascii")
+
+    def _text(self, words: int) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    def _timestamp(self, days_ago: int = 0) -> str:
+        return (datetime.now(timezone.utc) - timedelta(days=days_ago, seconds=self.rng.randint(0, 86400))).isoformat()
+
+    def _image_or_url(self, index: int) -> str:
+        if self.images and index % 2 == 0:
+            return self.images[index % len(self.images)]
+        return f"https://images.unsplash.com/photo-{index}?w=800"
+
+    def documents(self) -> Dict[str, List[dict]]:
+        import bcrypt
+
+        now = datetime.now(timezone.utc).isoformat()
+        users = [{
+            "id": str(uuid.uuid4()),
+            "email": ADMIN_EMAIL,
+            "full_name": "Benchmark Admin",
+            "password": bcrypt.hashpw(ADMIN_PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode(),
+            "is_admin": True,
+            "created_at": now
+        }]
+
+        categories = []
+        for i, name in enumerate(["Skincare", "Body Care", "Hair Care", "Fragrance", "Makeup", "Men Care"]):
+            categories.append({
+                "id": str(uuid.uuid4()), "name": name, "slug": name.lower().replace(" ", "-"),
+                "type": "product", "description": self._text(8), "order": i,
+                "created_at": now, "updated_at": now
+            })
+        for i, name in enumerate(["Industry Trends", "Formulation", "Regulation"]):
+            categories.append({
+                "id": str(uuid.uuid4()), "name": name, "slug": name.lower().replace(" ", "-"),
+                "type": "article", "description": self._text(8), "order": i,
+                "created_at": now, "updated_at": now
+            })
+        product_categories = [c for c in categories if c["type"] == "product"]
+
+        products = []
+        for i in range(self.counts["products"]):
+            category = self.rng.choice(product_categories)
+            name = f"{self._text(3)[:-1]} {i}"
+            products.append({
+                "id": str(uuid.uuid4()), "name": name, "slug": name.lower().replace(" ", "-"),
+                "category_id": category["id"], "category_name": category["name"], "category_slug": category["slug"],
+                "description": self._text(60), "benefits": self._text(25), "key_ingredients": self._text(10),
+                "packaging_options": self._text(12),
+                "images": [self._image_or_url(i + j) for j in range(self.rng.randint(1, 3))],
+                "documents": [], "featured": i % 5 == 0,
+                "created_at": self._timestamp(i % 365), "updated_at": self._timestamp(i % 30)
+            })
+
+        articles = []
+        article_categories = [c["name"] for c in categories if c["type"] == "article"]
+        for i in range(self.counts["articles"]):
+            title = f"{self._text(6)[:-1]} {i}"
+            articles.append({
+                "id": str(uuid.uuid4()), "title": title, "slug": title.lower().replace(" ", "-"),
+                "content": "\n\n".join(self._text(80) for _ in range(8)), "excerpt": self._text(25),
+                "cover_image": self._image_or_url(i), "category": self.rng.choice(article_categories),
+                "meta_title": title, "meta_description": self._text(20),
+                "published": i % 4 != 0, "created_at": self._timestamp(i % 365), "updated_at": self._timestamp(i % 30)
+            })
+
+        gallery = [{
+            "id": str(uuid.uuid4()), "title": self._text(4), "description": self._text(15),
+            "image_url": self._image_or_url(i), "category": self.rng.choice(["Factory", "Laboratory", "Events", "Products"]),
+            "featured": i % 4 == 0, "order": i, "created_at": now, "updated_at": now
+        } for i in range(max(10, self.counts["images"]))]
+
+        services = [{
+            "id": str(uuid.uuid4()), "name": f"Service {i}", "slug": f"service-{i}",
+            "short_description": self._text(12), "description": self._text(80), "icon": "Sparkles",
+            "image_url": self._image_or_url(i), "features": [self._text(4) for _ in range(4)],
+            "benefits": self._text(20), "process_steps": self._text(30), "featured": i < 4, "order": i,
+            "created_at": now, "updated_at": now
+        } for i in range(8)]
+
+        clients = [{
+            "id": str(uuid.uuid4()), "name": f"Client {i}", "logo_url": self._image_or_url(i), "created_at": now
+        } for i in range(20)]
+
+        reviews = [{
+            "id": str(uuid.uuid4()), "customer_name": f"Customer {i}", "review_text": self._text(30),
+            "rating": self.rng.randint(4, 5), "position": "Founder", "company": f"Brand {i}",
+            "photo_url": None, "created_at": now
+        } for i in range(20)]
+
+        page_sections = []
+        for page in ["home", "about", "contact"]:
+            for i, section_type in enumerate(["hero", "features", "timeline", "testimonials", "cta"]):
+                page_sections.append({
+                    "id": str(uuid.uuid4()), "page_name": page, "section_name": f"{page}-{section_type}",
+                    "section_type": section_type,
+                    "content": {"title": self._text(5), "subtitle": self._text(12),
+                                "items": [{"title": self._text(3), "description": self._text(15)} for _ in range(6)],
+                                "background": self._image_or_url(i)},
+                    "order": i, "visible": True, "created_at": now, "updated_at": now
+                })
+
+        contact_leads = [{
+            "id": str(uuid.uuid4()), "name": f"Lead {i}", "email": f"lead{i}@brand{i % 50}.com",
+            "phone": "+62 800 000 000", "company": f"Brand {i % 50}", "message": self._text(40),
+            "created_at": self._timestamp(i % 365)
+        } for i in range(self.counts["leads"])]
+
+        return {
+            "users": users,
+            "categories": categories,
+            "products": products,
+            "articles": articles,
+            "gallery": gallery,
+            "services": services,
+            "clients": clients,
+            "reviews": reviews,
+            "page_sections": page_sections,
+            "contact_leads": contact_leads,
+            "site_settings": [{"site_name": "Ellavera Beauty", "updated_at": now}],
+            "theme_settings": [{"primary_color": "#06b6d4", "updated_at": now}],
+            "media": [{
+                "id": str(uuid.uuid4()), "content_type": "image/png", "size": len(image), "sha256": str(i),
+                "source": "bench", "data": image, "created_at": now
+            } for i, image in enumerate(base64.b64decode(url.split(",", 1)[1]) for url in self.images)],
+        }
+
+
+async def seed_database(db, data: SyntheticData) -> Dict[str, List[dict]]:
+    sys.path.insert(0, str(BACKEND_DIR))
+    from content import article_content
+    from ids import KEYED_COLLECTIONS, to_document
+    from leads import ROLLUPS_COLLECTION, rebuild_rollups
+
+    documents = data.documents()
+    # Rendered the way the article routes store them
+    documents["articles"] = [{**doc, **article_content(doc["content"], doc["excerpt"])} for doc in documents["articles"]]
+    for name, docs in documents.items():
+        await db[name].delete_many({})
+        if docs:
+            # Stored the way the app stores them, with the id as the _id
+            encode = to_document if name in KEYED_COLLECTIONS else dict
+            await db[name].insert_many([encode(doc) for doc in docs])
+    # Seeded leads skip ingestion, so count them into the stats rollups directly
+    await db[ROLLUPS_COLLECTION].delete_many({})
+    await rebuild_rollups(db)
+    return documents
+
+
+# ============= LOAD SCENARIOS =============
+class Scenario:
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path: Callable[["BenchContext"], str],
+        body: Optional[Callable[["BenchContext"], dict]] = None,
+        admin: bool = False,
+        files: Optional[Callable[["BenchContext"], dict]] = None,
+        form: bool = False,
+        weight: float = 1.0,
+        expected: tuple = (200,),
+        route: Optional[str] = None
+    ):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.admin = admin
+        self.files = files
+        self.form = form
+        self.weight = weight
+        self.expected = expected
+        self.route = route
+
+
+class BenchContext:
+    """Ids of seeded documents, consumed by scenarios that need a target"""
+
+    def __init__(self, documents: Dict[str, List[dict]], rng: random.Random):
+        self.rng = rng
+        self.ids = {name: [d["id"] for d in docs if "id" in d] for name, docs in documents.items()}
+        self.product_categories = [c["id"] for c in documents["categories"] if c["type"] == "product"]
+        # Sections move within their page, so move scenarios stay on one
+        self.home_sections = [s["id"] for s in documents["page_sections"] if s["page_name"] == "home"]
+        # Item the last move body was picked for; bodies are built just before their paths
+        self.moving = str(uuid.uuid4())
+        # Article categories are referenced by name only, so deleting them is harmless
+        self.disposable: Dict[str, List[str]] = {
+            "categories": [c["id"] for c in documents["categories"] if c["type"] == "article"]
+        }
+
+    def pick(self, collection: str) -> str:
+        return self.rng.choice(self.ids[collection])
+
+    def take(self, collection: str) -> str:
+        pool = self.disposable.get(collection)
+        return pool.pop() if pool else str(uuid.uuid4())
+
+    def move_body(self, ids: List[str]) -> dict:
+        """Moves one of ids just after another; the path then names self.moving"""
+        self.moving, after_id = self.rng.sample(ids, 2)
+        return {"after_id": after_id}
+
+
+def product_body(ctx: BenchContext) -> dict:
+    return {"name": f"Bench Product {ctx.rng.randint(0, 10**9)}", "category_id": ctx.rng.choice(ctx.product_categories),
+            "description": "Benchmark product description " * 10, "benefits": "Benefits", "featured": False}
+
+
+def article_body(ctx: BenchContext) -> dict:
+    return {"title": f"Bench Article {ctx.rng.randint(0, 10**9)}", "content": "Benchmark article body. " * 200,
+            "excerpt": "Excerpt", "category": "Industry Trends", "published": True}
+
+
+def gallery_body(ctx: BenchContext) -> dict:
+    return {"title": "Bench Item", "image_url": "https://example.com/bench.jpg", "category": "Factory", "order": 0}
+
+
+def service_body(ctx: BenchContext) -> dict:
+    return {"name": f"Bench Service {ctx.rng.randint(0, 10**9)}", "short_description": "Short", "description": "Long " * 50}
+
+
+def review_body(ctx: BenchContext) -> dict:
+    return {"customer_name": "Bench Customer", "review_text": "Great partner " * 10, "rating": 5}
+
+
+def section_body(ctx: BenchContext) -> dict:
+    return {"page_name": "bench", "section_name": "bench", "section_type": "features",
+            "content": {"title": "Bench", "items": [{"title": "Item"}] * 5}, "order": 99}
+
+
+def category_body(ctx: BenchContext) -> dict:
+    return {"name": f"Bench Category {ctx.rng.randint(0, 10**9)}", "type": "product", "order": 99}
+
+
+SCENARIOS = [
+    # Public reads
+    Scenario("list_products", "GET", lambda c: "/api/products", weight=1.0),
+    Scenario("list_products_featured", "GET", lambda c: "/api/products?featured=true"),
+    Scenario("list_products_by_category", "GET", lambda c: f"/api/products?category_id={c.rng.choice(c.product_categories)}"),
+    Scenario("browse_products", "GET", lambda c: "/api/products/browse"),
+    Scenario("browse_products_by_category", "GET", lambda c: f"/api/products/browse?category_id={c.rng.choice(c.product_categories)}"),
+    Scenario("get_product", "GET", lambda c: f"/api/products/{c.pick('products')}"),
+    Scenario("related_products", "GET", lambda c: f"/api/products/{c.pick('products')}/related"),
+    Scenario("list_articles", "GET", lambda c: "/api/articles?published=true"),
+    Scenario("get_article", "GET", lambda c: f"/api/articles/{c.pick('articles')}"),
+    Scenario("related_articles", "GET", lambda c: f"/api/articles/{c.pick('articles')}/related"),
+    Scenario("list_clients", "GET", lambda c: "/api/clients"),
+    Scenario("list_reviews", "GET", lambda c: "/api/reviews"),
+    Scenario("list_categories", "GET", lambda c: "/api/categories?type=product"),
+    Scenario("get_category", "GET", lambda c: f"/api/categories/{c.pick('categories')}"),
+    Scenario("list_gallery", "GET", lambda c: "/api/gallery"),
+    Scenario("gallery_categories", "GET", lambda c: "/api/gallery/categories"),
+    Scenario("browse_gallery", "GET", lambda c: "/api/gallery/browse?featured=true"),
+    Scenario("get_gallery_item", "GET", lambda c: f"/api/gallery/{c.pick('gallery')}"),
+    Scenario("list_services", "GET", lambda c: "/api/services"),
+    Scenario("get_service", "GET", lambda c: f"/api/services/{c.pick('services')}"),
+    Scenario("get_theme", "GET", lambda c: "/api/theme"),
+    Scenario("get_settings", "GET", lambda c: "/api/settings"),
+    Scenario("home_sections", "GET", lambda c: "/api/pages/home/sections"),
+    Scenario("get_media", "GET", lambda c: f"/api/media/{c.pick('media') if c.ids['media'] else uuid.uuid4()}", expected=(200, 404)),
+    Scenario("submit_contact", "POST", lambda c: "/api/contact",
+             body=lambda c: {"name": "Bench", "email": "bench@example.com", "message": "Hello " * 20}),
+    Scenario("login", "POST", lambda c: "/api/auth/login", weight=0.2,
+             body=lambda c: {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}),
+    Scenario("register", "POST", lambda c: "/api/auth/register", weight=0.2,
+             body=lambda c: {"email": f"bench-{uuid.uuid4().hex}@example.com", "password": "secret", "full_name": "Bench"}),
+    # Admin reads
+    Scenario("me", "GET", lambda c: "/api/auth/me", admin=True),
+    Scenario("contact_leads", "GET", lambda c: "/api/contact/leads", admin=True),
+    Scenario("contact_lead_stats", "GET", lambda c: "/api/contact/leads/stats", admin=True),
+    Scenario("admin_summary", "GET", lambda c: "/api/admin/summary", admin=True),
+    Scenario("export_leads", "GET", lambda c: "/api/contact/leads/export", admin=True, weight=0.2),
+    Scenario("backup_stats", "GET", lambda c: "/api/admin/backup/stats", admin=True),
+    Scenario("backup_json", "GET", lambda c: "/api/admin/backup?format=json", admin=True, weight=0.1),
+    Scenario("backup_csv_media", "GET", lambda c: "/api/admin/backup?format=csv&include_media=true", admin=True, weight=0.1),
+    Scenario("backup_sql", "GET", lambda c: "/api/admin/backup?format=sql", admin=True, weight=0.1),
+    Scenario("profiling_status", "GET", lambda c: "/api/admin/profiling", admin=True, weight=0.2),
+    # Admin writes
+    Scenario("create_product", "POST", lambda c: "/api/products", body=product_body, admin=True),
+    Scenario("update_product", "PUT", lambda c: f"/api/products/{c.pick('products')}", body=product_body, admin=True),
+    Scenario("delete_product", "DELETE", lambda c: f"/api/products/{c.take('products')}", admin=True, expected=(200, 404)),
+    Scenario("add_product_image", "POST", lambda c: f"/api/products/{c.pick('products')}/images", admin=True, form=True,
+             body=lambda c: {"image_url": "https://example.com/bench.jpg"}),
+    Scenario("add_product_document", "POST", lambda c: f"/api/products/{c.pick('products')}/documents", admin=True, form=True,
+             body=lambda c: {"name": "Spec", "url": "https://example.com/spec.pdf", "doc_type": "pdf"}),
+    Scenario("delete_product_document", "DELETE", lambda c: f"/api/products/{c.pick('products')}/documents/{uuid.uuid4()}", admin=True, expected=(200, 404)),
+    Scenario("upload_file", "POST", lambda c: "/api/upload-file", admin=True, weight=0.5,
+             files=lambda c: {"file": ("spec.pdf", os.urandom(256 * 1024), "application/pdf")}),
+    Scenario("upload_image", "POST", lambda c: "/api/upload-image", admin=True, weight=0.5,
+             files=lambda c: {"file": ("photo.png", os.urandom(256 * 1024), "image/png")}),
+    Scenario("create_article", "POST", lambda c: "/api/articles", body=article_body, admin=True),
+    Scenario("update_article", "PUT", lambda c: f"/api/articles/{c.pick('articles')}", body=article_body, admin=True),
+    Scenario("delete_article", "DELETE", lambda c: f"/api/articles/{c.take('articles')}", admin=True, expected=(200, 404)),
+    Scenario("create_client", "POST", lambda c: "/api/clients", body=lambda c: {"name": "Bench", "logo_url": "https://example.com/l.png"}, admin=True),
+    Scenario("delete_client", "DELETE", lambda c: f"/api/clients/{c.take('clients')}", admin=True, expected=(200, 404)),
+    Scenario("create_review", "POST", lambda c: "/api/reviews", body=review_body, admin=True),
+    Scenario("update_review", "PUT", lambda c: f"/api/reviews/{c.pick('reviews')}", body=review_body, admin=True),
+    Scenario("delete_review", "DELETE", lambda c: f"/api/reviews/{c.take('reviews')}", admin=True, expected=(200, 404)),
+    Scenario("create_category", "POST", lambda c: "/api/categories", body=category_body, admin=True),
+    Scenario("update_category", "PUT", lambda c: f"/api/categories/{c.rng.choice(c.product_categories)}", admin=True,
+             body=lambda c: {"name": c.rng.choice(["Skincare", "Body Care", "Hair Care"]), "type": "product"}),
+    Scenario("delete_category", "DELETE", lambda c: f"/api/categories/{c.take('categories')}", admin=True, expected=(200, 404)),
+    Scenario("move_category", "POST", lambda c: f"/api/categories/{c.moving}/move", admin=True,
+             body=lambda c: c.move_body(c.product_categories)),
+    Scenario("create_gallery_item", "POST", lambda c: "/api/gallery", body=gallery_body, admin=True),
+    Scenario("update_gallery_item", "PUT", lambda c: f"/api/gallery/{c.pick('gallery')}", body=gallery_body, admin=True),
+    Scenario("delete_gallery_item", "DELETE", lambda c: f"/api/gallery/{c.take('gallery')}", admin=True, expected=(200, 404)),
+    Scenario("move_gallery_item", "POST", lambda c: f"/api/gallery/{c.moving}/move", admin=True,
+             body=lambda c: c.move_body(c.ids["gallery"])),
+    Scenario("create_service", "POST", lambda c: "/api/services", body=service_body, admin=True),
+    Scenario("update_service", "PUT", lambda c: f"/api/services/{c.pick('services')}", body=service_body, admin=True),
+    Scenario("delete_service", "DELETE", lambda c: f"/api/services/{c.take('services')}", admin=True, expected=(200, 404)),
+    Scenario("move_service", "POST", lambda c: f"/api/services/{c.moving}/move", admin=True,
+             body=lambda c: c.move_body(c.ids["services"])),
+    Scenario("update_theme", "PUT", lambda c: "/api/theme", body=lambda c: {"primary_color": "#06b6d4"}, admin=True),
+    Scenario("update_settings", "PUT", lambda c: "/api/settings", body=lambda c: {"site_tagline": "Bench"}, admin=True),
+    Scenario("create_section", "POST", lambda c: "/api/pages/sections", body=section_body, admin=True),
+    Scenario("update_section", "PUT", lambda c: f"/api/pages/sections/{c.pick('page_sections')}", admin=True,
+             body=lambda c: {**section_body(c), "page_name": "home"}),
+    Scenario("delete_section", "DELETE", lambda c: f"/api/pages/sections/{c.take('page_sections')}", admin=True, expected=(200, 404)),
+    Scenario("move_section", "POST", lambda c: f"/api/pages/sections/{c.moving}/move", admin=True,
+             body=lambda c: c.move_body(c.home_sections)),
+    Scenario("repair_product_categories", "POST", lambda c: "/api/admin/maintenance/product-categories", admin=True, weight=0.1),
+]
+
+AI_SCENARIOS = [
+    Scenario("ai_generate_content", "POST", lambda c: "/api/ai/generate-content", admin=True, weight=0.05,
+             body=lambda c: {"prompt": "Describe a hydrating serum", "content_type": "product_description"}),
+    Scenario("ai_generate_image", "POST", lambda c: "/api/ai/generate-image", admin=True, weight=0.05,
+             body=lambda c: {"prompt": "A minimalist serum bottle"}),
+    Scenario("ai_create_job", "POST", lambda c: "/api/ai/jobs", admin=True, weight=0.05, expected=(202,),
+             body=lambda c: {"kind": "content", "prompt": f"Describe serum {c.rng.randint(0, 9)}", "content_type": "product_description"}),
+    Scenario("ai_get_job", "GET", lambda c: f"/api/ai/jobs/{uuid.uuid4()}", admin=True, expected=(404,)),
+    Scenario("ai_job_events", "GET", lambda c: f"/api/ai/jobs/{uuid.uuid4()}/events", admin=True, expected=(404,)),
+    Scenario("ai_cancel_job", "DELETE", lambda c: f"/api/ai/jobs/{uuid.uuid4()}", admin=True, expected=(404,)),
+    Scenario("ai_create_batch", "POST", lambda c: "/api/ai/batches", admin=True, weight=0.05, expected=(202,),
+             body=lambda c: {"target": "products", "fields": ["benefits"], "category": c.rng.choice(c.product_categories)}),
+    Scenario("ai_list_batches", "GET", lambda c: "/api/ai/batches", admin=True),
+    Scenario("ai_get_batch", "GET", lambda c: f"/api/ai/batches/{uuid.uuid4()}", admin=True, expected=(404,)),
+    Scenario("ai_resume_batch", "POST", lambda c: f"/api/ai/batches/{uuid.uuid4()}/resume", admin=True, expected=(404,)),
+    Scenario("ai_cancel_batch", "DELETE", lambda c: f"/api/ai/batches/{uuid.uuid4()}", admin=True, expected=(404,)),
+]
+
+# Routes intentionally left out of the run: scrape/debug endpoints and the
+# profiling switch, which would change what every other scenario measures
+UNBENCHED_ROUTES = {"GET /metrics", "GET /api/health", "GET /api/health/ready", "PUT /api/admin/profiling", "GET /api/admin/profiling/profiles/{name}"}
+
+
+# ============= MEASUREMENT =============
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """Current resident set size; peak RSS when /proc is unavailable"""
+    status = Path(f"/proc/{pid or 'self'}/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    if pid is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return None
+
+
+class EllaveraBeautyBenchmark:
+    def __init__(self, client: httpx.AsyncClient, ctx: BenchContext, concurrency: int, requests: int, server_pid: Optional[int] = None):
+        self.client = client
+        self.ctx = ctx
+        self.concurrency = concurrency
+        self.requests = requests
+        self.server_pid = server_pid
+        self.token = None
+
+    async def login(self) -> None:
+        response = await self.client.post("/api/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        response.raise_for_status()
+        self.token = response.json()["access_token"]
+
+    async def run_scenario(self, scenario: Scenario) -> dict:
+        total = max(self.concurrency, int(self.requests * scenario.weight))
+        headers = {"Authorization": f"Bearer {self.token}"} if scenario.admin else {}
+        latencies: List[float] = []
+        errors: Dict[str, int] = {}
+        received = [0]
+        remaining = [total]
+
+        async def worker():
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                kwargs = {"headers": headers}
+                if scenario.files:
+                    kwargs["files"] = scenario.files(self.ctx)
+                elif scenario.body and scenario.form:
+                    kwargs["data"] = scenario.body(self.ctx)
+                elif scenario.body:
+                    kwargs["json"] = scenario.body(self.ctx)
+                start = time.perf_counter()
+                try:
+                    response = await self.client.request(scenario.method, scenario.path(self.ctx), **kwargs)
+                    body = response.content
+                    status = response.status_code
+                except httpx.HTTPError as e:
+                    errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                received[0] += len(body)
+                if status not in scenario.expected:
+                    errors[str(status)] = errors.get(str(status), 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        to_ms = 1000
+        return {
+            "method": scenario.method,
+            "requests": total,
+            "errors": errors,
+            "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies) * to_ms, 3) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * to_ms, 3),
+            "p95_ms": round(percentile(latencies, 95) * to_ms, 3),
+            "p99_ms": round(percentile(latencies, 99) * to_ms, 3),
+            "max_ms": round(latencies[-1] * to_ms, 3) if latencies else 0.0,
+            "avg_response_bytes": int(received[0] / len(latencies)) if latencies else 0,
+            "rss_mb": rss_mb(self.server_pid),
+        }
+
+
+def git_revision() -> str:
+    try:
+        sha = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True).strip()
+        dirty = subprocess.call(["git", "diff", "--quiet", "HEAD", "--", "backend"], cwd=ROOT_DIR) != 0
+        return f"{sha}-dirty" if dirty else sha
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def uncovered_routes(app, scenarios: List[Scenario]) -> List[str]:
+    """Routes of the app that no scenario exercises"""
+    import re
+
+    routes = []
+    for route in app.routes:
+        methods = getattr(route, "methods", None) or []
+        if not getattr(route, "include_in_schema", True):
+            continue
+        for method in methods:
+            if method in ("HEAD", "OPTIONS") or f"{method} {route.path}" in UNBENCHED_ROUTES:
+                continue
+            pattern = re.compile("^" + re.sub(r"\{[^}]+\}", "[^/]+", route.path) + r"(\?.*)?$")
+            if not any(s.method == method and pattern.match(s.route or "") for s in scenarios):
+                routes.append(f"{method} {route.path}")
+    return routes
+
+
+def compare(results: dict, baseline_path: Path, max_regression: float) -> int:
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\n📈 Comparison against {baseline_path.name} ({baseline['meta']['revision']})")
+    print(f"   {'scenario':32} {'p95 base':>10} {'p95 now':>10} {'change':>8}")
+    regressions = 0
+    for name, result in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if not base or not base["p95_ms"]:
+            continue
+        change = result["p95_ms"] / base["p95_ms"] - 1
+        marker = "❌" if change > max_regression else "  "
+        regressions += change > max_regression
+        print(f"{marker} {name:32} {base['p95_ms']:>10.2f} {result['p95_ms']:>10.2f} {change:>+7.1%}")
+    return 1 if regressions else 0
+
+
+# ============= ENTRYPOINT =============
+async def run(args) -> int:
+    os.environ.setdefault("JWT_SECRET", "bench-secret-not-for-production-use-0000")
+    data = SyntheticData(args.products, args.articles, args.images, args.image_kb, args.leads, seed=args.seed)
+    rng = random.Random(args.seed)
+    app = None
+
+    if args.base_url:
+        if not args.mongo_url:
+            print("--base-url needs --mongo-url to seed the server's database")
+            return 2
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        seed_client = AsyncIOMotorClient(args.mongo_url)
+        documents = await seed_database(seed_client[args.db_name], data)
+        seed_client.close()
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=120)
+        lifespan = None
+    else:
+        os.environ["MONGO_URL"] = args.mongo_url or "memory://"
+        os.environ["DB_NAME"] = args.db_name
+        # In-process runs use the local fake AI provider unless told otherwise
+        os.environ.setdefault("AI_PROVIDER", "fake")
+        # Every bench request comes from one client, so measure handlers rather than 429s
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+        sys.path.insert(0, str(BACKEND_DIR))
+        import server
+        from cache import invalidation_bus
+
+        app = server.app
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        documents = await seed_database(app.state.db, data)
+        # Seeding skips the write paths that invalidate caches and replicas, including what warm-up primed
+        await invalidation_bus.invalidate_all()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120)
+
+    ctx = BenchContext(documents, rng)
+    scenarios = SCENARIOS + (AI_SCENARIOS if args.include_ai else [])
+    if args.only:
+        scenarios = [s for s in scenarios if s.name in args.only.split(",")]
+
+    # Deletes consume documents that no read scenario depends on; once a pool
+    # runs dry they hit unknown ids, which is why deletes also accept 404
+    for collection in ("products", "articles", "clients", "reviews", "gallery", "services", "page_sections"):
+        ids = ctx.ids[collection]
+        keep = max(1, len(ids) // 2)
+        ctx.disposable[collection], ctx.ids[collection] = ids[keep:], ids[:keep]
+
+    bench = EllaveraBeautyBenchmark(client, ctx, args.concurrency, args.requests, args.server_pid)
+    print(f"🌱 Seeded {args.products} products, {args.articles} articles, {args.images} images of {args.image_kb} KB, {args.leads} leads")
+    await bench.login()
+
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.base_url or "in-process",
+            "store": "mongodb" if args.mongo_url else "memory",
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+        },
+        "dataset": data.counts,
+        "scenarios": {},
+    }
+
+    print(f"🚀 Running {len(scenarios)} scenarios at concurrency {args.concurrency}\n")
+    print(f"   {'scenario':32} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7} {'rss MB':>8}")
+    for scenario in scenarios:
+        scenario.route = scenario.path(ctx).split("?")[0]
+        result = await bench.run_scenario(scenario)
+        results["scenarios"][scenario.name] = result
+        rss = f"{result['rss_mb']:.1f}" if result["rss_mb"] is not None else "-"
+        marker = "❌" if result["errors"] else "✅"
+        print(f"{marker} {scenario.name:32} {result['rps']:>9.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+              f"{result['p99_ms']:>8.2f} {sum(result['errors'].values()):>7} {rss:>8}")
+
+    await client.aclose()
+    if app is not None:
+        missing = [r for r in uncovered_routes(app, scenarios) if args.include_ai or "/api/ai/" not in r]
+        if missing and not args.only:
+            print("\n⚠️  Routes without a scenario: " + ", ".join(missing))
+        await lifespan.__aexit__(None, None, None)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{results['meta']['revision']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\n💾 Results saved to {output}")
+
+    if args.compare:
+        return compare(results, Path(args.compare), args.max_regression)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--images", type=int, default=20, help="number of distinct base64 images")
+    parser.add_argument("--image-kb", type=int, default=64, help="size of each base64 image")
+    parser.add_argument("--leads", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario, scaled by its weight")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--base-url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--mongo-url", help="seed this MongoDB instead of the in-memory store")
+    parser.add_argument("--db-name", default="ellavera_bench")
+    parser.add_argument("--server-pid", type=int, help="pid of the server process, to report its RSS")
+    parser.add_argument("--include-ai", action="store_true", help="also hit the AI routes (in-process runs use AI_PROVIDER=fake by default)")
+    parser.add_argument("--only", help="comma separated scenario names")
+    parser.add_argument("--output", help="where to write the JSON results")
+    parser.add_argument("--compare", help="baseline JSON to compare p95 latencies against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 increase before failing")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if args.mongo_url and "bench" not in args.db_name:
+        parser.error("--db-name must contain 'bench', seeding wipes the collections it touches")
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Fault-injection check for public reads while MongoDB is slow or down.
+
+Runs the app in-process on the in-memory store, with short TTLs, timeouts
+and breaker windows, and injects latency or connection errors into reads
+from the store. It walks one scenario: healthy, then slow (stale responses
+while refreshing, breaker opens), then down (last good responses, 503 for
+cold keys, no request waits on Mongo), then recovered. It fails when any
+step does not behave as expected, so it can run in CI.
+
+Examples:
+    python backend_faults.py
+    python backend_faults.py --read-timeout 0.5 --reset 2
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+import httpx
+from pymongo.errors import ServerSelectionTimeoutError
+
+ROOT_DIR = Path(__file__).parent
+BACKEND_DIR = ROOT_DIR / "backend"
+
+PUBLIC_PATHS = ("/api/settings", "/api/theme", "/api/pages/home/sections", "/api/products")
+# Never loaded before the outage, so there is nothing stale to serve
+COLD_PATH = "/api/products?featured=false"
+
+
+class FaultInjector:
+    """Makes reads from the in-memory store slow or fail, as a struggling MongoDB would"""
+
+    def __init__(self):
+        self.mode = "ok"
+        self.delay = 0.0
+
+    async def before_read(self) -> None:
+        if self.mode == "slow":
+            await asyncio.sleep(self.delay)
+        elif self.mode == "down":
+            raise ServerSelectionTimeoutError("fault injection: no servers available")
+
+    def install(self) -> None:
+        import memory_db
+
+        for cls, name in ((memory_db.MemoryCollection, "find_one"), (memory_db.MemoryCursor, "to_list")):
+            original = getattr(cls, name)
+
+            async def read(*args, _original=original, **kwargs):
+                await self.before_read()
+                return await _original(*args, **kwargs)
+
+            setattr(cls, name, read)
+
+
+class Checks:
+    def __init__(self):
+        self.failed: List[str] = []
+
+    def expect(self, name: str, ok: bool, detail: str = "") -> None:
+        print(f"{'✅' if ok else '❌'} {name:<52} {detail}")
+        if not ok:
+            self.failed.append(name)
+
+
+async def get(client: httpx.AsyncClient, path: str):
+    started = time.perf_counter()
+    response = await client.get(path)
+    return response, time.perf_counter() - started
+
+
+async def seed(db) -> None:
+    from ids import to_document
+
+    now = datetime.now(timezone.utc).isoformat()
+    await db.products.insert_many([to_document({
+        "id": str(uuid.uuid4()), "name": f"Product {i}", "slug": f"product-{i}", "category_id": "c",
+        "description": "Seeded for the fault check", "featured": True, "created_at": now, "updated_at": now
+    }) for i in range(3)])
+    await db.page_sections.insert_one(to_document({
+        "id": str(uuid.uuid4()), "page_name": "home", "section_name": "hero", "section_type": "hero",
+        "content": {"title": "Hello"}, "order": 0, "visible": True, "created_at": now, "updated_at": now
+    }))
+
+
+async def run(args) -> int:
+    os.environ["MONGO_URL"] = "memory://"
+    os.environ["APP_ROUTERS"] = "public"
+    os.environ["CACHE_TTL_SECONDS"] = str(args.ttl)
+    os.environ["MONGO_READ_TIMEOUT_SECONDS"] = str(args.read_timeout)
+    os.environ["MONGO_BREAKER_FAILURES"] = str(args.failures)
+    os.environ["MONGO_BREAKER_RESET_SECONDS"] = str(args.reset)
+    os.environ.setdefault("CATALOGUE_REPLICA", "false")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    sys.path.insert(0, str(BACKEND_DIR))
+    import server
+    from cache import invalidation_bus
+    from resilience import mongo_breaker
+
+    # Poll failures during the outage are expected; keep the report readable
+    logging.getLogger("cache").setLevel(logging.ERROR)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    faults = FaultInjector()
+    faults.install()
+
+    app = server.app
+    lifespan = app.router.lifespan_context(app)
+    await lifespan.__aenter__()
+    await seed(app.state.db)
+    await invalidation_bus.invalidate_all()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://faults", timeout=30)
+    checks = Checks()
+    try:
+        print("🟢 Healthy")
+        for path in PUBLIC_PATHS:
+            response, _ = await get(client, path)
+            checks.expect(f"GET {path}", response.status_code == 200 and "warning" not in response.headers,
+                          f"{response.status_code}")
+
+        print(f"🐢 Slow: every read takes {args.delay}s, the read timeout is {args.read_timeout}s")
+        faults.mode, faults.delay = "slow", args.delay
+        await asyncio.sleep(args.ttl + 0.1)
+        for path in PUBLIC_PATHS:
+            response, elapsed = await get(client, path)
+            checks.expect(f"stale GET {path}",
+                          response.status_code == 200 and response.headers.get("warning", "").startswith("110")
+                          and elapsed < args.read_timeout,
+                          f"{response.status_code} {response.headers.get('warning')} in {elapsed * 1000:.0f} ms")
+        # The background refreshes time out, one failure each
+        await asyncio.sleep(args.read_timeout + 0.2)
+        checks.expect("breaker opens after consecutive timeouts", mongo_breaker.state == "open",
+                      f"{mongo_breaker.state} after {mongo_breaker.failures} failures")
+
+        print("🔴 Down: reads fail with server selection errors")
+        faults.mode = "down"
+        # A product write elsewhere: the cached list may no longer be current
+        await invalidation_bus.publish("products")
+        response, elapsed = await get(client, "/api/products")
+        checks.expect("invalidated GET /api/products serves last good",
+                      response.status_code == 200 and response.headers.get("warning", "").startswith("111"),
+                      f"{response.status_code} {response.headers.get('warning')} in {elapsed * 1000:.0f} ms")
+        response, elapsed = await get(client, COLD_PATH)
+        checks.expect(f"cold GET {COLD_PATH} fails fast",
+                      response.status_code == 503 and "retry-after" in response.headers and elapsed < args.read_timeout,
+                      f"{response.status_code} Retry-After {response.headers.get('retry-after')} in {elapsed * 1000:.0f} ms")
+        slowest = 0.0
+        for path in PUBLIC_PATHS:
+            response, elapsed = await get(client, path)
+            slowest = max(slowest, elapsed)
+        checks.expect("no request waits on Mongo while open", slowest < args.read_timeout,
+                      f"slowest {slowest * 1000:.0f} ms")
+
+        print("🟢 Recovered")
+        faults.mode = "ok"
+        await asyncio.sleep(args.reset + 0.1)
+        response, _ = await get(client, "/api/products")
+        checks.expect("probe read closes the breaker",
+                      response.status_code == 200 and "warning" not in response.headers and mongo_breaker.state == "closed",
+                      f"{response.status_code} breaker {mongo_breaker.state}")
+        response, _ = await get(client, COLD_PATH)
+        checks.expect(f"cold GET {COLD_PATH} loads again", response.status_code == 200, f"{response.status_code}")
+    finally:
+        await client.aclose()
+        await lifespan.__aexit__(None, None, None)
+
+    if checks.failed:
+        print(f"\n❌ {len(checks.failed)} checks failed")
+        return 1
+    print("\n✅ Public reads degrade to stale responses and recover")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ttl", type=float, default=0.5, help="Cache TTL in seconds")
+    parser.add_argument("--read-timeout", type=float, default=0.3, help="Read timeout in seconds")
+    parser.add_argument("--delay", type=float, default=2.0, help="Injected read latency in seconds while slow")
+    parser.add_argument("--failures", type=int, default=3, help="Consecutive failures that open the breaker")
+    parser.add_argument("--reset", type=float, default=1.0, help="Seconds the breaker stays open")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Import-time and memory report for a backend worker.
+
+Imports backend/server.py in a fresh interpreter with ``-X importtime``
+and reports total import time, peak RSS and the packages that cost the
+most. It fails when a module that should load lazily (AI SDKs and other
+large optional clients) is imported at startup, so it can run in CI.
+
+Examples:
+    python backend_import_report.py
+    python backend_import_report.py --top 40 --json import_report.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+BACKEND_DIR = ROOT_DIR / "backend"
+
+# Loaded on first use only; importing any of these at startup is a regression
+LAZY_PACKAGES = (
+    "emergentintegrations", "litellm", "openai", "google.genai", "google.generativeai",
+    "grpc", "boto3", "botocore", "s3transfer", "numpy", "pandas", "tiktoken", "httpx",
+)
+
+PROBE = (
+    "import resource, sys, time\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - started\n"
+    "print('REPORT', elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, ' '.join(sys.modules))\n"
+)
+
+
+def run_probe(module: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("JWT_SECRET", "import-report-secret-not-for-production-0000")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-4000:])
+        raise SystemExit(f"Importing {module} failed")
+    report_line = next(line for line in result.stdout.splitlines() if line.startswith("REPORT "))
+    _, elapsed, maxrss, modules = report_line.split(" ", 3)
+    return {
+        "seconds": float(elapsed),
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        "rss_mb": int(maxrss) / (1024 * 1024 if sys.platform == "darwin" else 1024),
+        "modules": modules.split(),
+        "importtime": parse_importtime(result.stderr),
+    }
+
+
+def parse_importtime(output: str) -> dict:
+    """Self time in microseconds per top-level package"""
+    per_package = defaultdict(int)
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        per_package[name.strip().split(".")[0]] += int(self_us)
+    return dict(per_package)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="server", help="backend module to import")
+    parser.add_argument("--top", type=int, default=25, help="packages to list")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_probe(args.module)
+    eager = sorted(
+        package for package in LAZY_PACKAGES
+        if any(module == package or module.startswith(package + ".") for module in report["modules"])
+    )
+
+    print(f"📦 import {args.module}: {report['seconds'] * 1000:.0f} ms, "
+          f"peak RSS {report['rss_mb']:.1f} MB, {len(report['modules'])} modules\n")
+    print(f"   {'package':32} {'self ms':>10}")
+    ranked = sorted(report["importtime"].items(), key=lambda item: item[1], reverse=True)
+    for package, self_us in ranked[:args.top]:
+        print(f"   {package:32} {self_us / 1000:>10.1f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "module": args.module,
+            "seconds": report["seconds"],
+            "rss_mb": report["rss_mb"],
+            "modules": len(report["modules"]),
+            "packages_ms": {package: self_us / 1000 for package, self_us in ranked},
+            "eager_lazy_packages": eager,
+        }, indent=2))
+
+    if eager:
+        print(f"\n❌ Imported at startup but should load lazily: {', '.join(eager)}")
+        raise SystemExit(1)
+    print("\n✅ No lazily loaded packages imported at startup")
+
+
+if __name__ == "__main__":
+    main()
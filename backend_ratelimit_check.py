@@ -0,0 +1,84 @@
+"""Check that the in-process rate limiter stays bounded under a flood of clients.
+
+Fills a MemoryBackend to MAX_KEYS with distinct IPs, then keeps the flood
+going while timing each request. It fails when the limiter grows past its
+cap, when a request at the cap costs more than a bounded multiple of one on
+an empty limiter (an inline scan of the buckets would), or when eviction
+drops a client that is still active instead of the longest idle one.
+
+Examples:
+    python backend_ratelimit_check.py
+    python backend_ratelimit_check.py --keys 20000 --samples 5000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT_DIR = Path(__file__).parent
+BACKEND_DIR = ROOT_DIR / "backend"
+
+
+class Checks:
+    def __init__(self):
+        self.failed: List[str] = []
+
+    def expect(self, name: str, ok: bool, detail: str = "") -> None:
+        print(f"{'✅' if ok else '❌'} {name:<52} {detail}")
+        if not ok:
+            self.failed.append(name)
+
+
+async def per_request(backend, rule, keys: List[str], now: float) -> float:
+    started = time.perf_counter()
+    for key in keys:
+        await backend.consume(key, rule, now)
+    return (time.perf_counter() - started) / len(keys)
+
+
+async def run(args) -> int:
+    sys.path.insert(0, str(BACKEND_DIR))
+    from ratelimit import CONTACT_PER_IP, MemoryBackend
+
+    class Backend(MemoryBackend):
+        MAX_KEYS = args.keys
+
+    rule = CONTACT_PER_IP
+    now = time.time()
+    checks = Checks()
+
+    empty = await per_request(Backend(), rule, [f"warm:{i}" for i in range(args.samples)], now)
+
+    backend = Backend()
+    await per_request(backend, rule, ["active"] + [f"flood:{i}" for i in range(args.keys)], now)
+    checks.expect("limiter fills to its cap", len(backend._buckets) == args.keys, f"{len(backend._buckets)} buckets")
+    # The active client keeps sending while the flood goes on
+    await backend.consume("active", rule, now + 1)
+    at_cap = await per_request(backend, rule, [f"more:{i}" for i in range(args.samples)], now + 2)
+    checks.expect("limiter stays at its cap", len(backend._buckets) == args.keys, f"{len(backend._buckets)} buckets")
+    checks.expect("requests at the cap take constant time", at_cap < empty * args.max_ratio,
+                  f"{at_cap * 1e6:.1f} µs vs {empty * 1e6:.1f} µs empty")
+    checks.expect("eviction keeps the active client", "active" in backend._buckets
+                  and "flood:0" not in backend._buckets)
+
+    if checks.failed:
+        print(f"\n❌ {len(checks.failed)} checks failed")
+        return 1
+    print("\n✅ The rate limiter stays bounded under a flood")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=100_000, help="Bucket cap to fill")
+    parser.add_argument("--samples", type=int, default=10_000, help="Requests timed at the cap")
+    parser.add_argument("--max-ratio", type=float, default=10.0,
+                        help="Slowest allowed request at the cap, as a multiple of one on an empty limiter")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
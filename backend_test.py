@@ -239,8 +239,8 @@ class EllaveraBeutyAPITester:
             200,
             data=ai_request
         )
-        if success and 'image_base64' in response:
-            print(f"   Generated image (base64 length): {len(response['image_base64'])}")
+        if success and 'image_url' in response:
+            print(f"   Generated image: {response['image_url']}")
         return success, response
 
     def test_get_homepage_sections(self):
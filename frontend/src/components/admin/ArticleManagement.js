@@ -8,7 +8,7 @@ import { Textarea } from '../ui/textarea';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from '../ui/dialog';
 import { Switch } from '../ui/switch';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '../ui/tabs';
-import { api } from '../../utils/api';
+import { api, runAIJob } from '../../utils/api';
 import { toast } from 'sonner';
 import LoadingSpinner from '../layout/LoadingSpinner';
 
@@ -31,7 +31,6 @@ const ArticleManagement = () => {
     category: '',
     meta_title: '',
     meta_description: '',
-    read_time: 5,
     published: false
   });
 
@@ -135,17 +134,25 @@ const ArticleManagement = () => {
     }
   };
 
-  const handleEdit = (article) => {
+  const handleEdit = async (summary) => {
+    // Lists leave out the body, so load the full article
+    let article;
+    try {
+      article = (await api.getArticle(summary.id)).data;
+    } catch (error) {
+      toast.error('Failed to load article');
+      return;
+    }
     setEditingArticle(article);
     setFormData({
       title: article.title,
       content: article.content,
-      excerpt: article.excerpt,
+      // A generated excerpt stays generated, following later content edits
+      excerpt: article.excerpt_generated ? '' : article.excerpt,
       cover_image: article.cover_image || '',
       category: article.category,
       meta_title: article.meta_title || '',
       meta_description: article.meta_description || '',
-      read_time: article.read_time,
       published: article.published
     });
     setIsDialogOpen(true);
@@ -160,7 +167,6 @@ const ArticleManagement = () => {
       category: '',
       meta_title: '',
       meta_description: '',
-      read_time: 5,
       published: false
     });
     setEditingArticle(null);
@@ -176,11 +182,15 @@ const ArticleManagement = () => {
     }
     setGenerating(true);
     try {
-      const response = await api.generateContent(
-        `Write a professional blog article about: "${formData.title}". Make it informative and engaging for the cosmetic industry.`,
-        'article'
+      const job = await runAIJob(
+        {
+          kind: 'content',
+          prompt: `Write a professional blog article about: "${formData.title}". Make it informative and engaging for the cosmetic industry.`,
+          content_type: 'article'
+        },
+        (text) => setFormData((current) => ({ ...current, content: text }))
       );
-      setFormData({ ...formData, content: response.data.content });
+      setFormData((current) => ({ ...current, content: job.result.content }));
       toast.success('Content generated!');
     } catch (error) {
       toast.error('Failed to generate content');
@@ -232,7 +242,7 @@ const ArticleManagement = () => {
               </div>
               <div>
                 <Label>Excerpt</Label>
-                <Textarea value={formData.excerpt} onChange={(e) => setFormData({ ...formData, excerpt: e.target.value })} required rows={2} data-testid="article-excerpt-input" />
+                <Textarea value={formData.excerpt} onChange={(e) => setFormData({ ...formData, excerpt: e.target.value })} rows={2} placeholder="Leave empty to use the start of the content" data-testid="article-excerpt-input" />
               </div>
               <div>
                 <div className="flex justify-between items-center mb-1">
@@ -242,7 +252,7 @@ const ArticleManagement = () => {
                     {generating ? 'Generating...' : 'AI Generate'}
                   </Button>
                 </div>
-                <Textarea value={formData.content} onChange={(e) => setFormData({ ...formData, content: e.target.value })} required rows={8} data-testid="article-content-input" />
+                <Textarea value={formData.content} onChange={(e) => setFormData({ ...formData, content: e.target.value })} required rows={8} placeholder="Markdown: ## Heading, **bold**, - list, [link](https://...)" data-testid="article-content-input" />
               </div>
               <div>
                 <Label>Cover Image</Label>
@@ -279,15 +289,9 @@ const ArticleManagement = () => {
                   </TabsContent>
                 </Tabs>
               </div>
-              <div className="grid grid-cols-2 gap-4">
-                <div>
-                  <Label>Meta Title</Label>
-                  <Input value={formData.meta_title} onChange={(e) => setFormData({ ...formData, meta_title: e.target.value })} data-testid="article-meta-title-input" />
-                </div>
-                <div>
-                  <Label>Read Time (minutes)</Label>
-                  <Input type="number" value={formData.read_time} onChange={(e) => setFormData({ ...formData, read_time: parseInt(e.target.value) })} data-testid="article-read-time-input" />
-                </div>
+              <div>
+                <Label>Meta Title</Label>
+                <Input value={formData.meta_title} onChange={(e) => setFormData({ ...formData, meta_title: e.target.value })} data-testid="article-meta-title-input" />
               </div>
               <div>
                 <Label>Meta Description</Label>
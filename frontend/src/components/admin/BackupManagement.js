@@ -63,7 +63,7 @@ const BackupManagement = () => {
     { label: 'Clients', count: stats.clients, icon: '🏢' },
     { label: 'Reviews', count: stats.reviews, icon: '⭐' },
     { label: 'Services', count: stats.services, icon: '🛠️' },
-    { label: 'Gallery Items', count: stats.gallery_items, icon: '🖼️' },
+    { label: 'Gallery Items', count: stats.gallery, icon: '🖼️' },
     { label: 'Categories', count: stats.categories, icon: '📁' },
     { label: 'Page Sections', count: stats.page_sections, icon: '📄' },
     { label: 'Contact Leads', count: stats.contact_leads, icon: '📧' },
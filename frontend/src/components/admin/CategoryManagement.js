@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
-import { Plus, Trash2, Edit, Tag, Package, Newspaper } from 'lucide-react';
+import { Plus, Trash2, Edit, Tag, Package, Newspaper, GripVertical } from 'lucide-react';
+import { DragDropContext, Droppable, Draggable } from '@hello-pangea/dnd';
 import { Button } from '../ui/button';
 import { Card } from '../ui/card';
 import { Input } from '../ui/input';
@@ -8,6 +9,7 @@ import { Textarea } from '../ui/textarea';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from '../ui/dialog';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '../ui/tabs';
 import { api } from '../../utils/api';
+import { nextOrder, reorder } from '../../utils/ordering';
 import { toast } from 'sonner';
 import LoadingSpinner from '../layout/LoadingSpinner';
 
@@ -56,7 +58,8 @@ const CategoryManagement = () => {
       const dataToSend = {
         ...formData,
         type: activeTab,
-        order: activeTab === 'product' ? productCategories.length : articleCategories.length
+        // Editing keeps the category's place; new ones go last
+        order: editingCategory ? editingCategory.order : nextOrder(activeTab === 'product' ? productCategories : articleCategories)
       };
 
       if (editingCategory) {
@@ -102,6 +105,24 @@ const CategoryManagement = () => {
     }
   };
 
+  const handleDragEnd = async (result, categories, setCategories) => {
+    if (!result.destination || result.destination.index === result.source.index) return;
+
+    const { items, position } = reorder(categories, result.source.index, result.destination.index);
+    const moved = categories[result.source.index];
+    setCategories(items);
+
+    // Save the move to backend: only the dragged category gets a new order key
+    try {
+      const response = await api.moveCategory(moved.id, position);
+      setCategories(items.map(category => category.id === moved.id ? response.data : category));
+      toast.success('Category order updated successfully');
+    } catch (error) {
+      toast.error('Failed to update category order');
+      fetchCategories(); // Revert on error
+    }
+  };
+
   const resetForm = () => {
     setEditingCategory(null);
     setFormData({
@@ -121,7 +142,7 @@ const CategoryManagement = () => {
 
   if (loading) return <LoadingSpinner />;
 
-  const CategoryList = ({ categories, type }) => (
+  const CategoryList = ({ categories, setCategories, type }) => (
     <div className="space-y-3">
       {categories.length === 0 ? (
         <Card className="p-8 text-center">
@@ -134,39 +155,57 @@ const CategoryManagement = () => {
         </Card>
       ) : (
         <>
-          {categories.map((category, index) => (
-            <Card key={category.id} className="p-4 flex items-center justify-between hover:shadow-md transition-shadow">
-              <div className="flex items-center gap-3">
-                <div className="w-10 h-10 bg-cyan-100 rounded-lg flex items-center justify-center">
-                  {type === 'product' ? (
-                    <Package size={20} className="text-cyan-600" />
-                  ) : (
-                    <Newspaper size={20} className="text-cyan-600" />
-                  )}
-                </div>
-                <div>
-                  <h4 className="font-semibold text-slate-800">{category.name}</h4>
-                  {category.description && (
-                    <p className="text-sm text-slate-500 line-clamp-1">{category.description}</p>
-                  )}
+          <DragDropContext onDragEnd={(result) => handleDragEnd(result, categories, setCategories)}>
+            <Droppable droppableId={`categories-${type}`}>
+              {(provided) => (
+                <div {...provided.droppableProps} ref={provided.innerRef} className="space-y-3">
+                  {categories.map((category, index) => (
+                    <Draggable key={category.id} draggableId={category.id} index={index}>
+                      {(provided, snapshot) => (
+                        <div ref={provided.innerRef} {...provided.draggableProps}>
+                          <Card className={`p-4 flex items-center justify-between transition-shadow ${snapshot.isDragging ? 'shadow-lg' : 'hover:shadow-md'}`}>
+                            <div className="flex items-center gap-3">
+                              <div {...provided.dragHandleProps} className="cursor-grab active:cursor-grabbing">
+                                <GripVertical className="text-slate-400" size={20} />
+                              </div>
+                              <div className="w-10 h-10 bg-cyan-100 rounded-lg flex items-center justify-center">
+                                {type === 'product' ? (
+                                  <Package size={20} className="text-cyan-600" />
+                                ) : (
+                                  <Newspaper size={20} className="text-cyan-600" />
+                                )}
+                              </div>
+                              <div>
+                                <h4 className="font-semibold text-slate-800">{category.name}</h4>
+                                {category.description && (
+                                  <p className="text-sm text-slate-500 line-clamp-1">{category.description}</p>
+                                )}
+                              </div>
+                            </div>
+                            <div className="flex items-center gap-2">
+                              <span className="text-xs text-slate-400 mr-2">#{index + 1}</span>
+                              <Button variant="outline" size="icon" onClick={() => handleEdit(category)} className="h-8 w-8">
+                                <Edit size={14} />
+                              </Button>
+                              <Button 
+                                variant="outline" 
+                                size="icon" 
+                                onClick={() => handleDelete(category.id, type)}
+                                className="h-8 w-8 text-red-600 hover:bg-red-50"
+                              >
+                                <Trash2 size={14} />
+                              </Button>
+                            </div>
+                          </Card>
+                        </div>
+                      )}
+                    </Draggable>
+                  ))}
+                  {provided.placeholder}
                 </div>
-              </div>
-              <div className="flex items-center gap-2">
-                <span className="text-xs text-slate-400 mr-2">#{index + 1}</span>
-                <Button variant="outline" size="icon" onClick={() => handleEdit(category)} className="h-8 w-8">
-                  <Edit size={14} />
-                </Button>
-                <Button 
-                  variant="outline" 
-                  size="icon" 
-                  onClick={() => handleDelete(category.id, type)}
-                  className="h-8 w-8 text-red-600 hover:bg-red-50"
-                >
-                  <Trash2 size={14} />
-                </Button>
-              </div>
-            </Card>
-          ))}
+              )}
+            </Droppable>
+          </DragDropContext>
           <Button 
             onClick={() => handleAddNew(type)} 
             variant="outline" 
@@ -202,11 +241,11 @@ const CategoryManagement = () => {
         </TabsList>
 
         <TabsContent value="product">
-          <CategoryList categories={productCategories} type="product" />
+          <CategoryList categories={productCategories} setCategories={setProductCategories} type="product" />
         </TabsContent>
 
         <TabsContent value="article">
-          <CategoryList categories={articleCategories} type="article" />
+          <CategoryList categories={articleCategories} setCategories={setArticleCategories} type="article" />
         </TabsContent>
       </Tabs>
 
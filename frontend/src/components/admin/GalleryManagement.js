@@ -8,6 +8,7 @@ import { Textarea } from '../ui/textarea';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from '../ui/dialog';
 import { Switch } from '../ui/switch';
 import { api } from '../../utils/api';
+import { nextOrder, reorder } from '../../utils/ordering';
 import { toast } from 'sonner';
 import LoadingSpinner from '../layout/LoadingSpinner';
 
@@ -18,6 +19,7 @@ const GalleryManagement = () => {
   const [isDialogOpen, setIsDialogOpen] = useState(false);
   const [editingItem, setEditingItem] = useState(null);
   const [selectedCategory, setSelectedCategory] = useState('all');
+  const [draggedId, setDraggedId] = useState(null);
   const [formData, setFormData] = useState({
     title: '',
     description: '',
@@ -59,7 +61,7 @@ const GalleryManagement = () => {
         await api.updateGalleryItem(editingItem.id, formData);
         toast.success('Gallery item updated successfully');
       } else {
-        await api.createGalleryItem({ ...formData, order: items.length });
+        await api.createGalleryItem({ ...formData, order: nextOrder(items) });
         toast.success('Gallery item created successfully');
       }
       setIsDialogOpen(false);
@@ -107,6 +109,27 @@ const GalleryManagement = () => {
     });
   };
 
+  const handleDrop = async (targetId) => {
+    // Positions in the full list, so a filtered view moves the item next to the one it was dropped on
+    const from = items.findIndex(item => item.id === draggedId);
+    const to = items.findIndex(item => item.id === targetId);
+    setDraggedId(null);
+    if (from < 0 || to < 0 || from === to) return;
+
+    const { items: reordered, position } = reorder(items, from, to);
+    setItems(reordered);
+
+    // Save the move to backend: only the dragged image gets a new order key
+    try {
+      const response = await api.moveGalleryItem(items[from].id, position);
+      setItems(reordered.map(item => item.id === response.data.id ? response.data : item));
+      toast.success('Gallery order updated successfully');
+    } catch (error) {
+      toast.error('Failed to update gallery order');
+      fetchData(); // Revert on error
+    }
+  };
+
   const handleImageUpload = (e) => {
     const file = e.target.files[0];
     if (file) {
@@ -129,7 +152,7 @@ const GalleryManagement = () => {
       <div className="flex flex-col sm:flex-row justify-between items-start sm:items-center gap-4">
         <div>
           <h2 className="text-2xl font-bold text-slate-800">Gallery</h2>
-          <p className="text-slate-500">Manage your image gallery</p>
+          <p className="text-slate-500">Manage your image gallery. Drag images to reorder them.</p>
         </div>
         <Dialog open={isDialogOpen} onOpenChange={(open) => { setIsDialogOpen(open); if (!open) resetForm(); }}>
           <DialogTrigger asChild>
@@ -290,11 +313,20 @@ const GalleryManagement = () => {
       ) : (
         <div className="grid grid-cols-2 md:grid-cols-3 lg:grid-cols-4 xl:grid-cols-5 gap-4">
           {filteredItems.map((item) => (
-            <Card key={item.id} className="overflow-hidden group relative">
+            <Card
+              key={item.id}
+              draggable
+              onDragStart={(e) => { e.dataTransfer.setData('text/plain', item.id); setDraggedId(item.id); }}
+              onDragEnd={() => setDraggedId(null)}
+              onDragOver={(e) => e.preventDefault()}
+              onDrop={(e) => { e.preventDefault(); handleDrop(item.id); }}
+              className={`overflow-hidden group relative cursor-grab active:cursor-grabbing ${draggedId === item.id ? 'opacity-50' : ''}`}
+            >
               <div className="aspect-square overflow-hidden bg-slate-100">
                 <img 
                   src={item.image_url} 
                   alt={item.title} 
+                  draggable={false}
                   className="w-full h-full object-cover group-hover:scale-105 transition-transform"
                 />
               </div>
@@ -1,18 +1,30 @@
 import React, { useState, useEffect } from 'react';
-import { Mail, Phone, Building, Calendar } from 'lucide-react';
+import { Mail, Phone, Building, Calendar, Download } from 'lucide-react';
 import { Card } from '../ui/card';
+import { Button } from '../ui/button';
 import { api } from '../../utils/api';
 import { toast } from 'sonner';
 import LoadingSpinner from '../layout/LoadingSpinner';
 
 const LeadsManagement = () => {
   const [leads, setLeads] = useState([]);
+  const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     fetchLeads();
+    fetchStats();
   }, []);
 
+  const fetchStats = async () => {
+    try {
+      const response = await api.getContactLeadStats({ top: 5 });
+      setStats(response.data);
+    } catch (error) {
+      console.error('Failed to fetch lead stats:', error);
+    }
+  };
+
   const fetchLeads = async () => {
     try {
       const response = await api.getContactLeads();
@@ -24,6 +36,22 @@ const LeadsManagement = () => {
     }
   };
 
+  const handleExport = async () => {
+    try {
+      const response = await api.exportContactLeads({ format: 'csv' });
+      const url = window.URL.createObjectURL(response.data);
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = `leads_${new Date().toISOString().slice(0, 10)}.csv`;
+      document.body.appendChild(link);
+      link.click();
+      document.body.removeChild(link);
+      window.URL.revokeObjectURL(url);
+    } catch (error) {
+      toast.error('Failed to export leads');
+    }
+  };
+
   const formatDate = (dateString) => {
     const date = new Date(dateString);
     return date.toLocaleDateString('en-US', { year: 'numeric', month: 'long', day: 'numeric', hour: '2-digit', minute: '2-digit' });
@@ -33,11 +61,54 @@ const LeadsManagement = () => {
 
   return (
     <div data-testid="leads-management">
-      <div className="mb-6">
-        <h2 className="text-2xl font-bold mb-2">Contact Leads</h2>
-        <p className="text-slate-600">Manage inquiries from your contact form</p>
+      <div className="mb-6 flex items-start justify-between gap-4">
+        <div>
+          <h2 className="text-2xl font-bold mb-2">Contact Leads</h2>
+          <p className="text-slate-600">Manage inquiries from your contact form</p>
+        </div>
+        <Button variant="outline" onClick={handleExport} data-testid="export-leads-button">
+          <Download size={16} className="mr-2" />
+          Export CSV
+        </Button>
       </div>
 
+      {stats && (
+        <div className="grid grid-cols-1 md:grid-cols-3 gap-4 mb-6" data-testid="lead-stats">
+          <Card className="p-6">
+            <h4 className="font-semibold mb-2">Last 90 days</h4>
+            <p className="text-3xl font-bold">{stats.total}</p>
+            <div className="flex items-end gap-0.5 h-12 mt-3">
+              {stats.by_week.map((week) => (
+                <div
+                  key={week.key}
+                  title={`${week.key}: ${week.count}`}
+                  className="flex-1 bg-cyan-500 rounded-sm"
+                  style={{ height: `${(week.count / Math.max(1, ...stats.by_week.map((w) => w.count))) * 100}%` }}
+                />
+              ))}
+            </div>
+          </Card>
+          <Card className="p-6">
+            <h4 className="font-semibold mb-2">Top domains</h4>
+            {stats.by_domain.map((row) => (
+              <div key={row.key} className="flex justify-between text-sm text-slate-600">
+                <span>{row.key}</span>
+                <span>{row.count}</span>
+              </div>
+            ))}
+          </Card>
+          <Card className="p-6">
+            <h4 className="font-semibold mb-2">Top source pages</h4>
+            {stats.by_source.map((row) => (
+              <div key={row.key} className="flex justify-between text-sm text-slate-600">
+                <span>{row.key}</span>
+                <span>{row.count}</span>
+              </div>
+            ))}
+          </Card>
+        </div>
+      )}
+
       {leads.length === 0 ? (
         <Card className="p-12 text-center">
           <p className="text-slate-600">No leads yet</p>
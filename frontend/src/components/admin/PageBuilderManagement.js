@@ -9,6 +9,7 @@ import { Textarea } from '../ui/textarea';
 import { Label } from '../ui/label';
 import { Dialog, DialogContent, DialogHeader, DialogTitle } from '../ui/dialog';
 import { api } from '../../utils/api';
+import { reorder } from '../../utils/ordering';
 import { toast } from 'sonner';
 import LoadingSpinner from '../layout/LoadingSpinner';
 
@@ -44,34 +45,17 @@ const PageBuilderManagement = () => {
   };
 
   const handleDragEnd = async (result) => {
-    if (!result.destination) return;
+    if (!result.destination || result.destination.index === result.source.index) return;
 
-    const items = Array.from(sections);
-    const [reorderedItem] = items.splice(result.source.index, 1);
-    items.splice(result.destination.index, 0, reorderedItem);
+    const { items, position } = reorder(sections, result.source.index, result.destination.index);
+    const reorderedItem = sections[result.source.index];
 
-    // Update order numbers
-    const updatedItems = items.map((item, index) => ({
-      ...item,
-      order: index + 1
-    }));
+    setSections(items);
 
-    setSections(updatedItems);
-
-    // Save new order to backend
+    // Save the move to backend: only the dragged section gets a new order key
     try {
-      await Promise.all(
-        updatedItems.map(item =>
-          api.updatePageSection(item.id, {
-            page_name: item.page_name,
-            section_name: item.section_name,
-            section_type: item.section_type,
-            content: item.content,
-            order: item.order,
-            visible: item.visible
-          })
-        )
-      );
+      const response = await api.movePageSection(reorderedItem.id, position);
+      setSections(items.map(item => item.id === reorderedItem.id ? response.data : item));
       toast.success('Section order updated successfully');
     } catch (error) {
       toast.error('Failed to update section order');
@@ -9,7 +9,7 @@ import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '.
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from '../ui/dialog';
 import { Switch } from '../ui/switch';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '../ui/tabs';
-import { api } from '../../utils/api';
+import { api, runAIJob } from '../../utils/api';
 import { toast } from 'sonner';
 import LoadingSpinner from '../layout/LoadingSpinner';
 
@@ -173,11 +173,15 @@ const ProductManagement = () => {
     }
     setGenerating(true);
     try {
-      const response = await api.generateContent(
-        `Write a premium, elegant product description for a cosmetic product named "${formData.name}". Make it compelling and professional.`,
-        'product_description'
+      const job = await runAIJob(
+        {
+          kind: 'content',
+          prompt: `Write a premium, elegant product description for a cosmetic product named "${formData.name}". Make it compelling and professional.`,
+          content_type: 'product_description'
+        },
+        (text) => setFormData((current) => ({ ...current, description: text }))
       );
-      setFormData({ ...formData, description: response.data.content });
+      setFormData((current) => ({ ...current, description: job.result.content }));
       toast.success('Description generated!');
     } catch (error) {
       toast.error('Failed to generate description');
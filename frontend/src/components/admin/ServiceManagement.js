@@ -8,6 +8,7 @@ import { Textarea } from '../ui/textarea';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from '../ui/dialog';
 import { Switch } from '../ui/switch';
 import { api } from '../../utils/api';
+import { nextOrder, reorder } from '../../utils/ordering';
 import { toast } from 'sonner';
 import LoadingSpinner from '../layout/LoadingSpinner';
 
@@ -22,6 +23,7 @@ const ServiceManagement = () => {
   const [isDialogOpen, setIsDialogOpen] = useState(false);
   const [editingService, setEditingService] = useState(null);
   const [featureInput, setFeatureInput] = useState('');
+  const [draggedId, setDraggedId] = useState(null);
   const [formData, setFormData] = useState({
     name: '',
     short_description: '',
@@ -57,7 +59,7 @@ const ServiceManagement = () => {
         await api.updateService(editingService.id, formData);
         toast.success('Service updated successfully');
       } else {
-        await api.createService({ ...formData, order: services.length });
+        await api.createService({ ...formData, order: nextOrder(services) });
         toast.success('Service created successfully');
       }
       setIsDialogOpen(false);
@@ -97,6 +99,26 @@ const ServiceManagement = () => {
     }
   };
 
+  const handleDrop = async (targetId) => {
+    const from = services.findIndex(service => service.id === draggedId);
+    const to = services.findIndex(service => service.id === targetId);
+    setDraggedId(null);
+    if (from < 0 || to < 0 || from === to) return;
+
+    const { items, position } = reorder(services, from, to);
+    setServices(items);
+
+    // Save the move to backend: only the dragged service gets a new order key
+    try {
+      const response = await api.moveService(services[from].id, position);
+      setServices(items.map(service => service.id === response.data.id ? response.data : service));
+      toast.success('Service order updated successfully');
+    } catch (error) {
+      toast.error('Failed to update service order');
+      fetchServices(); // Revert on error
+    }
+  };
+
   const resetForm = () => {
     setEditingService(null);
     setFormData({
@@ -164,7 +186,7 @@ const ServiceManagement = () => {
                   />
                 </div>
                 
-                <div>
+                <div className="col-span-2">
                   <Label htmlFor="icon">Icon</Label>
                   <select
                     id="icon"
@@ -178,16 +200,6 @@ const ServiceManagement = () => {
                   </select>
                 </div>
 
-                <div>
-                  <Label htmlFor="order">Display Order</Label>
-                  <Input
-                    id="order"
-                    type="number"
-                    value={formData.order}
-                    onChange={(e) => setFormData({ ...formData, order: parseInt(e.target.value) || 0 })}
-                  />
-                </div>
-
                 <div className="col-span-2">
                   <Label htmlFor="short_description">Short Description *</Label>
                   <Input
@@ -305,11 +317,19 @@ const ServiceManagement = () => {
         </Card>
       ) : (
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-          {services.map((service) => (
-            <Card key={service.id} className="overflow-hidden hover:shadow-lg transition-shadow">
+          {services.map((service, index) => (
+            <Card
+              key={service.id}
+              draggable
+              onDragStart={(e) => { e.dataTransfer.setData('text/plain', service.id); setDraggedId(service.id); }}
+              onDragEnd={() => setDraggedId(null)}
+              onDragOver={(e) => e.preventDefault()}
+              onDrop={(e) => { e.preventDefault(); handleDrop(service.id); }}
+              className={`overflow-hidden hover:shadow-lg transition-shadow ${draggedId === service.id ? 'opacity-50' : ''}`}
+            >
               {service.image_url && (
                 <div className="aspect-video bg-slate-100">
-                  <img src={service.image_url} alt={service.name} className="w-full h-full object-cover" />
+                  <img src={service.image_url} alt={service.name} draggable={false} className="w-full h-full object-cover" />
                 </div>
               )}
               <div className="p-6">
@@ -325,7 +345,10 @@ const ServiceManagement = () => {
                       )}
                     </div>
                   </div>
-                  <span className="text-xs text-slate-400">#{service.order + 1}</span>
+                  <div className="flex items-center gap-1 text-slate-400 cursor-grab active:cursor-grabbing" title="Drag to reorder">
+                    <span className="text-xs">#{index + 1}</span>
+                    <GripVertical size={16} />
+                  </div>
                 </div>
                 <p className="text-slate-600 text-sm mb-4 line-clamp-2">{service.short_description}</p>
                 
@@ -57,7 +57,10 @@ const AdminDashboard = () => {
     products: 0,
     articles: 0,
     clients: 0,
-    leads: 0
+    leads: 0,
+    leadsThisWeek: 0,
+    recentLeads: [],
+    recentProducts: []
   });
 
   useEffect(() => {
@@ -72,17 +75,15 @@ const AdminDashboard = () => {
 
   const fetchStats = async () => {
     try {
-      const [productsRes, articlesRes, clientsRes, leadsRes] = await Promise.all([
-        api.getProducts({}),
-        api.getArticles({}),
-        api.getClients(),
-        api.getContactLeads().catch(() => ({ data: [] }))
-      ]);
+      const { data } = await api.getAdminSummary();
       setStats({
-        products: productsRes.data?.length || 0,
-        articles: articlesRes.data?.length || 0,
-        clients: clientsRes.data?.length || 0,
-        leads: leadsRes.data?.length || 0
+        products: data.counts.products,
+        articles: data.counts.articles,
+        clients: data.counts.clients,
+        leads: data.counts.contact_leads,
+        leadsThisWeek: data.leads_last_7_days,
+        recentLeads: data.recent_leads,
+        recentProducts: data.recent_products
       });
     } catch (error) {
       console.error('Failed to fetch stats:', error);
@@ -169,11 +170,38 @@ const AdminDashboard = () => {
         <StatCard 
           title="Leads" 
           value={stats.leads} 
+          trend={stats.leadsThisWeek ? `${stats.leadsThisWeek} in the last 7 days` : null}
           icon={Mail} 
           color="bg-gradient-to-br from-orange-500 to-orange-600"
         />
       </div>
 
+      {/* Recent Activity */}
+      <div className="grid grid-cols-1 lg:grid-cols-2 gap-3 sm:gap-4 lg:gap-6">
+        <Card className="p-4 sm:p-6 bg-white border-none shadow-sm">
+          <h2 className="text-base sm:text-lg font-semibold text-slate-800 mb-3">Latest Leads</h2>
+          {stats.recentLeads.length === 0 ? (
+            <p className="text-sm text-slate-500">No leads yet</p>
+          ) : stats.recentLeads.map((lead) => (
+            <div key={lead.id} className="flex justify-between gap-2 py-2 border-b last:border-0 text-sm">
+              <span className="truncate">{lead.name}{lead.company ? ` · ${lead.company}` : ''}</span>
+              <span className="text-slate-500 flex-shrink-0">{new Date(lead.created_at).toLocaleDateString()}</span>
+            </div>
+          ))}
+        </Card>
+        <Card className="p-4 sm:p-6 bg-white border-none shadow-sm">
+          <h2 className="text-base sm:text-lg font-semibold text-slate-800 mb-3">Recently Updated Products</h2>
+          {stats.recentProducts.length === 0 ? (
+            <p className="text-sm text-slate-500">No products yet</p>
+          ) : stats.recentProducts.map((product) => (
+            <div key={product.id} className="flex justify-between gap-2 py-2 border-b last:border-0 text-sm">
+              <span className="truncate">{product.name}</span>
+              <span className="text-slate-500 flex-shrink-0">{new Date(product.updated_at).toLocaleDateString()}</span>
+            </div>
+          ))}
+        </Card>
+      </div>
+
       {/* Quick Actions */}
       <div>
         <h2 className="text-base sm:text-lg font-semibold text-slate-800 mb-3 sm:mb-4">Quick Actions</h2>
@@ -21,12 +21,9 @@ const ArticleDetailPage = () => {
       const response = await api.getArticle(id);
       setArticle(response.data);
       
-      // Fetch related articles from same category
-      const articlesRes = await api.getArticles();
-      const related = articlesRes.data
-        .filter(a => a.category === response.data.category && a.id !== response.data.id)
-        .slice(0, 3);
-      setRelatedArticles(related);
+      // Related articles are precomputed on the server
+      const relatedRes = await api.getRelatedArticles(id);
+      setRelatedArticles(relatedRes.data.slice(0, 3));
     } catch (error) {
       console.error('Failed to fetch article:', error);
     } finally {
@@ -93,11 +90,30 @@ const ArticleDetailPage = () => {
           {/* Title */}
           <h1 className="text-3xl sm:text-4xl lg:text-5xl font-bold mb-6" data-testid="article-title">{article.title}</h1>
 
+          {/* Table of Contents */}
+          {article.toc && article.toc.length > 1 && (
+            <nav className="mb-8 p-6 bg-slate-50 rounded-xl" data-testid="article-toc">
+              <p className="text-sm font-semibold text-slate-900 mb-3">Contents</p>
+              <ul className="space-y-2 text-sm">
+                {article.toc.map((entry) => (
+                  <li key={entry.id} className={entry.level === 3 ? 'ml-4' : ''}>
+                    <a href={`#${entry.id}`} className="text-primary hover:text-primary-dark">{entry.text}</a>
+                  </li>
+                ))}
+              </ul>
+            </nav>
+          )}
+
           {/* Content */}
           <div className="prose prose-lg max-w-none" data-testid="article-content">
-            <div className="text-slate-600 leading-relaxed whitespace-pre-wrap">
-              {article.content}
-            </div>
+            {article.content_html ? (
+              // Rendered and sanitized by the server when the article was saved
+              <div className="text-slate-600 leading-relaxed" dangerouslySetInnerHTML={{ __html: article.content_html }} />
+            ) : (
+              <div className="text-slate-600 leading-relaxed whitespace-pre-wrap">
+                {article.content}
+              </div>
+            )}
           </div>
 
           {/* Related Articles */}
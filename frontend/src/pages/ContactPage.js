@@ -9,6 +9,17 @@ import { api } from '../utils/api';
 import { usePageTitle } from '../hooks/usePageTitle';
 import { toast } from 'sonner';
 
+// Page the visitor came from on this site, for lead reporting
+const sourcePage = () => {
+  try {
+    const referrer = new URL(document.referrer);
+    if (referrer.origin === window.location.origin) return referrer.pathname;
+  } catch (error) {
+    // No referrer, or not a valid URL
+  }
+  return window.location.pathname;
+};
+
 const ContactPage = () => {
   const [sections, setSections] = useState([]);
   const [settings, setSettings] = useState(null);
@@ -52,11 +63,15 @@ const ContactPage = () => {
     setIsSubmitting(true);
     
     try {
-      await api.submitContact(formData);
+      await api.submitContact({ ...formData, source_page: sourcePage() });
       toast.success('Message sent successfully! We\'ll get back to you soon.');
       setFormData({ name: '', email: '', phone: '', company: '', message: '' });
     } catch (error) {
-      toast.error('Failed to send message. Please try again.');
+      if (error.response?.status === 429) {
+        toast.error('Too many messages sent. Please wait a moment and try again.');
+      } else {
+        toast.error('Failed to send message. Please try again.');
+      }
     } finally {
       setIsSubmitting(false);
     }
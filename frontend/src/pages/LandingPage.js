@@ -433,7 +433,7 @@ const LandingPage = () => {
                   </div>
                   <p className="text-sm text-primary font-medium mb-2">{article.category}</p>
                   <h3 className="text-lg font-bold mb-2 line-clamp-2">{article.title}</h3>
-                  <p className="text-slate-600 text-sm mb-4 line-clamp-2">{article.excerpt || article.content?.substring(0, 100)}</p>
+                  <p className="text-slate-600 text-sm mb-4 line-clamp-2">{article.excerpt}</p>
                   <Link to={`/articles/${article.id}`}>
                     <Button variant="outline" size="sm" className="border-primary text-primary hover:bg-primary-light">Read More <ArrowRight size={14} className="ml-1" /></Button>
                   </Link>
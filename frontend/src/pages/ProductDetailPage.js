@@ -23,14 +23,9 @@ const ProductDetailPage = () => {
       const response = await api.getProduct(id);
       setProduct(response.data);
       
-      // Fetch related products from same category
-      if (response.data.category_name) {
-        const productsRes = await api.getProducts();
-        const related = productsRes.data
-          .filter(p => p.category_name === response.data.category_name && p.id !== response.data.id)
-          .slice(0, 3);
-        setRelatedProducts(related);
-      }
+      // Related products are precomputed on the server
+      const relatedRes = await api.getRelatedProducts(id);
+      setRelatedProducts(relatedRes.data.slice(0, 3));
     } catch (error) {
       console.error('Failed to fetch product:', error);
     } finally {
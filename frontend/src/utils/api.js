@@ -16,7 +16,9 @@ export const api = {
 
   // Products
   getProducts: (params) => axios.get(`${API}/products`, { params }),
+  browseProducts: (params) => axios.get(`${API}/products/browse`, { params }),
   getProduct: (id) => axios.get(`${API}/products/${id}`),
+  getRelatedProducts: (id) => axios.get(`${API}/products/${id}/related`),
   createProduct: (data) => axios.post(`${API}/products`, data, { headers: getAuthHeaders() }),
   updateProduct: (id, data) => axios.put(`${API}/products/${id}`, data, { headers: getAuthHeaders() }),
   deleteProduct: (id) => axios.delete(`${API}/products/${id}`, { headers: getAuthHeaders() }),
@@ -59,6 +61,7 @@ export const api = {
   // Articles
   getArticles: (params) => axios.get(`${API}/articles`, { params }),
   getArticle: (id) => axios.get(`${API}/articles/${id}`),
+  getRelatedArticles: (id) => axios.get(`${API}/articles/${id}/related`),
   createArticle: (data) => axios.post(`${API}/articles`, data, { headers: getAuthHeaders() }),
   updateArticle: (id, data) => axios.put(`${API}/articles/${id}`, data, { headers: getAuthHeaders() }),
   deleteArticle: (id) => axios.delete(`${API}/articles/${id}`, { headers: getAuthHeaders() }),
@@ -79,14 +82,17 @@ export const api = {
   getService: (id) => axios.get(`${API}/services/${id}`),
   createService: (data) => axios.post(`${API}/services`, data, { headers: getAuthHeaders() }),
   updateService: (id, data) => axios.put(`${API}/services/${id}`, data, { headers: getAuthHeaders() }),
+  moveService: (id, position) => axios.post(`${API}/services/${id}/move`, position, { headers: getAuthHeaders() }),
   deleteService: (id) => axios.delete(`${API}/services/${id}`, { headers: getAuthHeaders() }),
 
   // Gallery
   getGallery: (params) => axios.get(`${API}/gallery`, { params }),
   getGalleryCategories: () => axios.get(`${API}/gallery/categories`),
+  browseGallery: (params) => axios.get(`${API}/gallery/browse`, { params }),
   getGalleryItem: (id) => axios.get(`${API}/gallery/${id}`),
   createGalleryItem: (data) => axios.post(`${API}/gallery`, data, { headers: getAuthHeaders() }),
   updateGalleryItem: (id, data) => axios.put(`${API}/gallery/${id}`, data, { headers: getAuthHeaders() }),
+  moveGalleryItem: (id, position) => axios.post(`${API}/gallery/${id}/move`, position, { headers: getAuthHeaders() }),
   deleteGalleryItem: (id) => axios.delete(`${API}/gallery/${id}`, { headers: getAuthHeaders() }),
 
   // Categories
@@ -94,21 +100,32 @@ export const api = {
   getCategory: (id) => axios.get(`${API}/categories/${id}`),
   createCategory: (data) => axios.post(`${API}/categories`, data, { headers: getAuthHeaders() }),
   updateCategory: (id, data) => axios.put(`${API}/categories/${id}`, data, { headers: getAuthHeaders() }),
+  moveCategory: (id, position) => axios.post(`${API}/categories/${id}/move`, position, { headers: getAuthHeaders() }),
   deleteCategory: (id) => axios.delete(`${API}/categories/${id}`, { headers: getAuthHeaders() }),
 
   // Contact
   submitContact: (data) => axios.post(`${API}/contact`, data),
   getContactLeads: () => axios.get(`${API}/contact/leads`, { headers: getAuthHeaders() }),
+  getContactLeadStats: (params = {}) => axios.get(`${API}/contact/leads/stats`, { params, headers: getAuthHeaders() }),
+  exportContactLeads: (params = {}) => axios.get(`${API}/contact/leads/export`, {
+    params,
+    headers: getAuthHeaders(),
+    responseType: 'blob'
+  }),
 
   // Page Sections
   getPageSections: (pageName) => axios.get(`${API}/pages/${pageName}/sections`),
   createPageSection: (data) => axios.post(`${API}/pages/sections`, data, { headers: getAuthHeaders() }),
   updatePageSection: (id, data) => axios.put(`${API}/pages/sections/${id}`, data, { headers: getAuthHeaders() }),
+  movePageSection: (id, position) => axios.post(`${API}/pages/sections/${id}/move`, position, { headers: getAuthHeaders() }),
   deletePageSection: (id) => axios.delete(`${API}/pages/sections/${id}`, { headers: getAuthHeaders() }),
 
   // AI
   generateContent: (prompt, contentType) => axios.post(`${API}/ai/generate-content`, { prompt, content_type: contentType }, { headers: getAuthHeaders() }),
   generateImage: (prompt) => axios.post(`${API}/ai/generate-image`, { prompt }, { headers: getAuthHeaders() }),
+  createAIJob: (data) => axios.post(`${API}/ai/jobs`, data, { headers: getAuthHeaders() }),
+  getAIJob: (id) => axios.get(`${API}/ai/jobs/${id}`, { headers: getAuthHeaders() }),
+  cancelAIJob: (id) => axios.delete(`${API}/ai/jobs/${id}`, { headers: getAuthHeaders() }),
 
   // Theme
   getTheme: () => axios.get(`${API}/theme`),
@@ -119,6 +136,7 @@ export const api = {
   updateSettings: (data) => axios.put(`${API}/settings`, data, { headers: getAuthHeaders() }),
 
   // Backup
+  getAdminSummary: () => axios.get(`${API}/admin/summary`, { headers: getAuthHeaders() }),
   getBackupStats: () => axios.get(`${API}/admin/backup/stats`, { headers: getAuthHeaders() }),
   downloadBackup: (format, includeMedia = false) => axios.get(`${API}/admin/backup`, { 
     params: { format, include_media: includeMedia },
@@ -126,3 +144,61 @@ export const api = {
     responseType: 'arraybuffer'
   }),
 };
+
+const parseEvents = (buffer, onEvent) => {
+  const events = buffer.split('\n\n');
+  const rest = events.pop();
+  events.forEach((raw) => {
+    let event = 'message';
+    let data = '';
+    raw.split('\n').forEach((line) => {
+      if (line.startsWith('event: ')) event = line.slice(7);
+      else if (line.startsWith('data: ')) data += line.slice(6);
+    });
+    if (data) onEvent(event, JSON.parse(data));
+  });
+  return rest;
+};
+
+// Runs an AI job in the background and resolves with the finished job.
+// Text jobs call onText with the content generated so far as it streams in.
+export const runAIJob = async (data, onText = () => {}) => {
+  const { data: job } = await api.createAIJob(data);
+  let text = '';
+  let finished = null;
+
+  try {
+    const response = await fetch(`${API}/ai/jobs/${job.id}/events`, { headers: getAuthHeaders() });
+    if (!response.ok || !response.body) throw new Error(`Event stream failed: ${response.status}`);
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (!finished) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer = parseEvents(buffer + decoder.decode(value, { stream: true }), (event, payload) => {
+        if (event === 'delta') {
+          text += payload.text;
+          onText(text);
+        } else if (event === 'done') {
+          finished = payload;
+        }
+      });
+    }
+  } catch (error) {
+    // Fall back to polling when streaming is unavailable (proxies, old browsers)
+  }
+
+  while (!finished) {
+    const { data: current } = await api.getAIJob(job.id);
+    if (current.partial && current.partial !== text) {
+      text = current.partial;
+      onText(text);
+    }
+    if (['succeeded', 'failed', 'cancelled'].includes(current.status)) finished = current;
+    else await new Promise((resolve) => setTimeout(resolve, 1000));
+  }
+
+  if (finished.status !== 'succeeded') throw new Error(finished.error || 'AI job failed');
+  return finished;
+};
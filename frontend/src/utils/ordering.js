@@ -0,0 +1,19 @@
+// Drag-and-drop ordering for lists sorted by their fractional `order` keys.
+// The /move endpoints take the dragged item's new neighbours and give it a key between theirs.
+
+// Moves the item at index `from` to index `to`; returns the new list and the neighbours to send
+export const reorder = (items, from, to) => {
+  const reordered = Array.from(items);
+  const [moved] = reordered.splice(from, 1);
+  reordered.splice(to, 0, moved);
+  return {
+    items: reordered,
+    position: {
+      after_id: to > 0 ? reordered[to - 1].id : null,
+      before_id: to < reordered.length - 1 ? reordered[to + 1].id : null
+    }
+  };
+};
+
+// Order key that places a new item after every existing one
+export const nextOrder = (items) => items.reduce((last, item) => Math.max(last, (item.order || 0) + 1), 0);